@@ -0,0 +1,193 @@
+"""Minimal in-process SFTP server (based on paramiko) serving a local directory.
+
+Accepts any login using a password and only supports the SFTP subsystem,
+so hooks using shell commands (e.g. `SftpHook(allow_exec=True)`) are not
+supported. Each client connection is handled by its own paramiko Transport.
+"""
+
+import os
+import posixpath
+import socket
+import threading
+
+import paramiko
+
+
+class SftpServer(object):
+    """SFTP server serving the given directory on a random local port.
+
+    :param str root: Local directory to serve as root ('/') of the server.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.port = None
+
+        self._host_key = paramiko.RSAKey.generate(2048)
+        self._socket = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._transports = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """Starts accepting connections in a background thread."""
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen(16)
+        self._socket.settimeout(0.1)
+        self.port = self._socket.getsockname()[1]
+
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stops the server and closes any open client connections."""
+
+        self._stopped.set()
+        self._thread.join()
+
+        for transport in self._transports:
+            transport.close()
+
+        self._socket.close()
+
+    def _serve(self):
+        while not self._stopped.is_set():
+            try:
+                client, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self._host_key)
+            transport.set_subsystem_handler(
+                "sftp", paramiko.SFTPServer, _LocalSftpInterface, self.root
+            )
+            transport.start_server(server=_PasswordServer())
+
+            self._transports.append(transport)
+
+
+class _PasswordServer(paramiko.ServerInterface):
+    """Server interface accepting any password and session channels."""
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+
+class _LocalSftpHandle(paramiko.SFTPHandle):
+    """Handle for a file opened by _LocalSftpInterface."""
+
+    def stat(self):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+        except OSError as err:
+            return paramiko.SFTPServer.convert_errno(err.errno)
+
+    def chattr(self, attr):
+        try:
+            paramiko.SFTPServer.set_file_attr(self.filename, attr)
+            return paramiko.SFTP_OK
+        except OSError as err:
+            return paramiko.SFTPServer.convert_errno(err.errno)
+
+
+class _LocalSftpInterface(paramiko.SFTPServerInterface):
+    """SFTP interface serving files from a local directory."""
+
+    def __init__(self, server, root, *args, **kwargs):
+        super(_LocalSftpInterface, self).__init__(server, *args, **kwargs)
+        self._root = root
+
+    def _local_path(self, path):
+        return os.path.join(self._root, self.canonicalize(path).lstrip("/"))
+
+    def canonicalize(self, path):
+        return posixpath.normpath(posixpath.join("/", path))
+
+    def list_folder(self, path):
+        local_path = self._local_path(path)
+
+        try:
+            entries = []
+            for name in os.listdir(local_path):
+                attrs = paramiko.SFTPAttributes.from_stat(
+                    os.lstat(os.path.join(local_path, name))
+                )
+                attrs.filename = name
+                entries.append(attrs)
+            return entries
+        except OSError as err:
+            return paramiko.SFTPServer.convert_errno(err.errno)
+
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(self._local_path(path)))
+        except OSError as err:
+            return paramiko.SFTPServer.convert_errno(err.errno)
+
+    def lstat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.lstat(self._local_path(path)))
+        except OSError as err:
+            return paramiko.SFTPServer.convert_errno(err.errno)
+
+    def open(self, path, flags, attr):
+        local_path = self._local_path(path)
+
+        try:
+            fd = os.open(local_path, flags | getattr(os, "O_BINARY", 0), 0o666)
+        except OSError as err:
+            return paramiko.SFTPServer.convert_errno(err.errno)
+
+        if flags & os.O_WRONLY:
+            mode = "ab" if flags & os.O_APPEND else "wb"
+        elif flags & os.O_RDWR:
+            mode = "a+b" if flags & os.O_APPEND else "r+b"
+        else:
+            mode = "rb"
+
+        handle = _LocalSftpHandle(flags)
+        handle.filename = local_path
+        handle.readfile = handle.writefile = os.fdopen(fd, mode)
+        return handle
+
+    def remove(self, path):
+        return self._call(os.remove, self._local_path(path))
+
+    def rename(self, oldpath, newpath):
+        return self._call(os.rename, self._local_path(oldpath), self._local_path(newpath))
+
+    def mkdir(self, path, attr):
+        return self._call(os.mkdir, self._local_path(path))
+
+    def rmdir(self, path):
+        return self._call(os.rmdir, self._local_path(path))
+
+    def chattr(self, path, attr):
+        return self._call(paramiko.SFTPServer.set_file_attr, self._local_path(path), attr)
+
+    @staticmethod
+    def _call(func, *args):
+        try:
+            func(*args)
+            return paramiko.SFTP_OK
+        except OSError as err:
+            return paramiko.SFTPServer.convert_errno(err.errno)
@@ -0,0 +1,287 @@
+"""Fixtures providing local stand-ins for the file systems supported by the hooks.
+
+Each backend fixture starts an in-process server (or mock) once per session:
+
+- local: a temporary directory, accessed using the LocalHook.
+- s3: a moto mock of S3, accessed using the S3Hook.
+- ftp: a pyftpdlib server serving a temporary directory, using the FtpHook.
+- sftp: a paramiko server serving a temporary directory, using the SftpHook.
+
+Synthetic trees are written directly to the backing store (rather than
+through the hooks), so that setting up large trees stays cheap.
+"""
+
+import functools
+import os
+import posixpath
+import shutil
+import tempfile
+import threading
+import uuid
+
+import pytest
+
+from airflow_fs.hooks import FtpHook, LocalHook, S3Hook, SftpHook
+from airflow_fs.testing import MockConnection
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+BACKENDS = ["local", "s3", "ftp", "sftp"]
+
+FILE_CONTENT = b"x" * 1024
+
+_LOGIN = "bench"
+_PASSWORD = "bench"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--tree-sizes",
+        default="10,100,1000",
+        help="Comma-separated numbers of files in the synthetic trees.",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "tree_size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("tree_sizes")
+        metafunc.parametrize("tree_size", [int(size) for size in sizes.split(",")])
+
+
+def synthetic_paths(n_files, flat=False):
+    """Returns the relative paths of the files in a synthetic tree.
+
+    Nested trees spread their files over two levels of (at most) ten
+    directories each. Files alternate between .csv and .txt extensions,
+    so that half of the files match a `*.csv` pattern.
+    """
+
+    paths = []
+    for i in range(n_files):
+        file_name = "file{}.{}".format(i, "csv" if i % 2 == 0 else "txt")
+        if flat:
+            paths.append(file_name)
+        else:
+            paths.append(
+                posixpath.join("dir{}".format(i % 10), "dir{}".format(i // 10 % 10), file_name)
+            )
+    return paths
+
+
+class Backend(object):
+    """File system stand-in, providing hooks and (cached) synthetic trees.
+
+    :param str name: Name of the backend.
+    :param hook_factory: Callable returning a new (disconnected) hook.
+    :param str root: Directory (in the hooks' paths) to create files in.
+    """
+
+    def __init__(self, name, hook_factory, root):
+        self.name = name
+        self.root = root
+        self._hook_factory = hook_factory
+        self._trees = {}
+
+    def hook(self):
+        """Returns a new hook for the backend."""
+        return self._hook_factory()
+
+    def tree(self, n_files, flat=False):
+        """Returns the path of a synthetic tree containing n_files files.
+
+        Trees are created once per session, so benchmarks using them should
+        not modify their contents.
+        """
+
+        key = (n_files, flat)
+
+        if key not in self._trees:
+            tree_root = self.new_dir()
+            for rel_path in synthetic_paths(n_files, flat=flat):
+                self.write_file(posixpath.join(tree_root, rel_path), FILE_CONTENT)
+            self._trees[key] = tree_root
+
+        return self._trees[key]
+
+    def new_dir(self):
+        """Creates a new, empty directory and returns its path."""
+        dir_path = posixpath.join(self.root, uuid.uuid4().hex)
+        self.make_dir(dir_path)
+        return dir_path
+
+    def make_dir(self, dir_path):
+        """Creates the given directory (including any parents)."""
+        raise NotImplementedError()
+
+    def write_file(self, file_path, content):
+        """Writes content to the given path, creating parent directories."""
+        raise NotImplementedError()
+
+
+class LocalDirBackend(Backend):
+    """Backend storing its files in a local directory, which is either
+    accessed directly or served (from its root) by a local server.
+
+    :param str local_root: Local directory containing the served files.
+    """
+
+    def __init__(self, name, hook_factory, root, local_root):
+        super(LocalDirBackend, self).__init__(name, hook_factory, root)
+        self._local_root = local_root
+
+    def _local_path(self, path):
+        return os.path.join(self._local_root, path.lstrip("/"))
+
+    def make_dir(self, dir_path):
+        local_path = self._local_path(dir_path)
+        if not os.path.exists(local_path):
+            os.makedirs(local_path)
+
+    def write_file(self, file_path, content):
+        self.make_dir(posixpath.dirname(file_path))
+        with open(self._local_path(file_path), "wb") as file_:
+            file_.write(content)
+
+
+class S3Backend(Backend):
+    """Backend storing its files in a (mocked) S3 bucket."""
+
+    def __init__(self, name, hook_factory, root, client):
+        super(S3Backend, self).__init__(name, hook_factory, root)
+        self._client = client
+
+    def make_dir(self, dir_path):
+        pass  # S3 has no directories.
+
+    def write_file(self, file_path, content):
+        bucket, key = file_path.split("/", 1)
+        self._client.put_object(Bucket=bucket, Key=key, Body=content)
+
+
+@pytest.fixture(scope="session")
+def _local_root():
+    dir_path = tempfile.mkdtemp(prefix="airflow-fs-bench-")
+    yield dir_path
+    shutil.rmtree(dir_path)
+
+
+def _served_dir(local_root, name):
+    dir_path = os.path.join(local_root, name)
+    os.mkdir(dir_path)
+    return dir_path
+
+
+def _patch_connection(hook_class, conn):
+    return mock.patch.object(hook_class, "get_connection", return_value=conn)
+
+
+@pytest.fixture(scope="session")
+def local_backend(_local_root):
+    """Local file system backend."""
+    root = _served_dir(_local_root, "local")
+    return LocalDirBackend("local", LocalHook, root, local_root="/")
+
+
+@pytest.fixture(scope="session")
+def s3_backend():
+    """S3 backend, using moto to mock S3."""
+
+    import boto3
+    from moto import mock_s3
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "foo")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bar")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_s3():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket="bench-bucket")
+        yield S3Backend("s3", S3Hook, "bench-bucket", client=client)
+
+
+@pytest.fixture(scope="session")
+def ftp_backend(_local_root):
+    """FTP backend, using an in-process pyftpdlib server."""
+
+    from pyftpdlib.authorizers import DummyAuthorizer
+    from pyftpdlib.handlers import FTPHandler
+    from pyftpdlib.servers import ThreadedFTPServer
+
+    served_dir = _served_dir(_local_root, "ftp")
+
+    authorizer = DummyAuthorizer()
+    authorizer.add_user(_LOGIN, _PASSWORD, served_dir, perm="elradfmwMT")
+
+    handler = type("BenchFTPHandler", (FTPHandler,), {"authorizer": authorizer})
+    server = ThreadedFTPServer(("127.0.0.1", 0), handler)
+
+    stopped = threading.Event()
+
+    def _serve():
+        while not stopped.is_set():
+            server.serve_forever(timeout=0.1, blocking=False, handle_exit=False)
+
+    thread = threading.Thread(target=_serve)
+    thread.daemon = True
+    thread.start()
+
+    conn = MockConnection(
+        host="127.0.0.1",
+        port=server.socket.getsockname()[1],
+        login=_LOGIN,
+        password=_PASSWORD,
+    )
+
+    try:
+        with _patch_connection(FtpHook, conn):
+            yield LocalDirBackend(
+                "ftp", lambda: FtpHook("ftp_bench"), "/", local_root=served_dir
+            )
+    finally:
+        stopped.set()
+        thread.join()
+        server.close_all()
+
+
+@pytest.fixture(scope="session")
+def sftp_backend(_local_root):
+    """SFTP backend, using an in-process paramiko server."""
+
+    import pysftp
+
+    from ._sftp_server import SftpServer
+
+    served_dir = _served_dir(_local_root, "sftp")
+
+    with SftpServer(served_dir) as server:
+        conn = MockConnection(
+            host="127.0.0.1",
+            login=_LOGIN,
+            password=_PASSWORD,
+            extra={"ignore_hostkey_verification": True},
+        )
+
+        # The SftpHook always connects to the default port, so connections
+        # are redirected to the (random) port of the server.
+        connect = functools.partial(pysftp.Connection, port=server.port)
+
+        with _patch_connection(SftpHook, conn), \
+                mock.patch.object(pysftp, "Connection", connect):
+            yield LocalDirBackend(
+                "sftp", lambda: SftpHook("sftp_bench"), "/", local_root=served_dir
+            )
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    """Parametrizes benchmarks over all backends."""
+    return request.getfixturevalue(request.param + "_backend")
+
+
+@pytest.fixture
+def local_dir(local_backend):
+    """New, empty local directory."""
+    return local_backend.new_dir()
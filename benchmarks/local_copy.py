@@ -0,0 +1,101 @@
+"""Benchmark comparing the methods used by the LocalHook to copy local files.
+
+Copies a generated file using each of the copy methods (reflink,
+copy_file_range, sendfile and a buffered copy) and reports the wall clock
+and CPU time spent by each method. Methods that are not supported for the
+given directory (e.g. reflinks on ext4) are reported as unsupported.
+
+Usage::
+
+    python benchmarks/local_copy.py --size-mb 2048 --dir /path/to/staging
+
+Note that the source file is likely to be in the page cache after it has
+been written, so results reflect copying from memory rather than from disk.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+from airflow_fs.hooks.fs_hook import NotSupportedError
+from airflow_fs.hooks.local_hook import _COPY_METHODS
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--dir", default=None, help="Directory to copy files in.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(dir=args.dir)
+
+    try:
+        src_path = os.path.join(tmp_dir, "src.bin")
+        _write_file(src_path, size=args.size_mb * _CHUNK_SIZE)
+
+        print("{:<16} {:>10} {:>10} {:>10}".format("method", "wall (s)", "cpu (s)", "MB/s"))
+
+        for method_name, method in _COPY_METHODS:
+            timings = []
+
+            for i in range(args.repeat):
+                dest_path = os.path.join(tmp_dir, "dest_{}_{}.bin".format(method_name, i))
+                try:
+                    timings.append(_time_copy(method, src_path, dest_path))
+                except (NotSupportedError, OSError) as exc:
+                    print("{:<16} unsupported ({})".format(method_name, exc))
+                    break
+                finally:
+                    if os.path.exists(dest_path):
+                        os.unlink(dest_path)
+            else:
+                wall, cpu = (min(values) for values in zip(*timings))
+                print(
+                    "{:<16} {:>10.3f} {:>10.3f} {:>10.1f}".format(
+                        method_name, wall, cpu, args.size_mb / wall
+                    )
+                )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def _write_file(file_path, size):
+    chunk = os.urandom(_CHUNK_SIZE)
+    with open(file_path, "wb") as file_:
+        for _ in range(size // _CHUNK_SIZE):
+            file_.write(chunk)
+
+
+def _time_copy(method, src_path, dest_path):
+    """Returns the wall clock and CPU time (user + system) of a single copy."""
+
+    with open(src_path, "rb", buffering=0) as src_file, \
+            open(dest_path, "wb", buffering=0) as dest_file:
+        size = os.fstat(src_file.fileno()).st_size
+
+        usage_start = resource.getrusage(resource.RUSAGE_SELF)
+        wall_start = time.time()
+
+        method(src_file, dest_file, size)
+        os.fsync(dest_file.fileno())
+
+        wall = time.time() - wall_start
+        usage_end = resource.getrusage(resource.RUSAGE_SELF)
+
+    cpu = (usage_end.ru_utime - usage_start.ru_utime) + (
+        usage_end.ru_stime - usage_start.ru_stime
+    )
+
+    return wall, cpu
+
+
+if __name__ == "__main__":
+    main()
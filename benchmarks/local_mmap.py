@@ -0,0 +1,164 @@
+"""Benchmark comparing buffered and memory-mapped reads of the LocalHook.
+
+Copies a generated file to a destination using `FsHook.copy_fileobj`, reading
+the source either through a regular (buffered) file or through a memory map
+(`LocalHook(mmap_reads=True)`), and reports the wall clock time, CPU time
+(user + system) and peak memory use (max RSS) of each method. Every copy runs
+in a fresh process, so that peak memory use is measured per copy.
+
+The destination is either a sink that reads (checksums) and then discards
+the written data (--sink null), which stands in for a remote writer sending
+the data over a socket and isolates the cost of reading, or a file in the
+staging directory (--sink file).
+
+Usage::
+
+    python benchmarks/local_mmap.py --size-mb 4096 --dir /path/to/staging
+
+Note that pages of the memory map that have been read count towards the RSS
+of the process (until they are released by the `MmapFile`), even though they
+belong to the page cache and can be reclaimed by the kernel at any time. The
+source file is also likely to be in
+the page cache after it has been written, so results reflect reading from
+memory rather than from disk.
+"""
+
+from __future__ import print_function
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+import zlib
+
+from airflow_fs.hooks import LocalHook
+from airflow_fs.transfer import copy_stream
+
+_CHUNK_SIZE = 1024 * 1024
+
+_READ_METHODS = [("buffered", False), ("mmap", True)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--dir", default=None, help="Directory to stage files in.")
+    parser.add_argument("--sink", choices=["null", "file"], default="null")
+    parser.add_argument("--buffer-size-mb", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(dir=args.dir)
+
+    try:
+        src_path = os.path.join(tmp_dir, "src.bin")
+        _write_file(src_path, size=args.size_mb * _CHUNK_SIZE)
+
+        print(
+            "{:<10} {:>10} {:>10} {:>10} {:>14}".format(
+                "method", "wall (s)", "cpu (s)", "MB/s", "max RSS (MB)"
+            )
+        )
+
+        for method_name, mmap_reads in _READ_METHODS:
+            results = []
+
+            for i in range(args.repeat):
+                dest_path = None
+                if args.sink == "file":
+                    dest_path = os.path.join(
+                        tmp_dir, "dest_{}_{}.bin".format(method_name, i)
+                    )
+
+                try:
+                    results.append(
+                        _run_isolated(
+                            src_path,
+                            dest_path,
+                            mmap_reads=mmap_reads,
+                            buffer_size=args.buffer_size_mb * _CHUNK_SIZE,
+                        )
+                    )
+                finally:
+                    if dest_path is not None and os.path.exists(dest_path):
+                        os.unlink(dest_path)
+
+            wall, cpu, max_rss = (min(values) for values in zip(*results))
+            print(
+                "{:<10} {:>10.3f} {:>10.3f} {:>10.1f} {:>14.1f}".format(
+                    method_name, wall, cpu, args.size_mb / wall, max_rss / 1024.0
+                )
+            )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def _write_file(file_path, size):
+    chunk = os.urandom(_CHUNK_SIZE)
+    with open(file_path, "wb") as file_:
+        for _ in range(size // _CHUNK_SIZE):
+            file_.write(chunk)
+
+
+def _run_isolated(src_path, dest_path, mmap_reads, buffer_size):
+    """Runs `_time_copy` in a separate process, returning its results."""
+
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_time_copy,
+        args=(results, src_path, dest_path, mmap_reads, buffer_size),
+    )
+    process.start()
+    result = results.get()
+    process.join()
+
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def _time_copy(results, src_path, dest_path, mmap_reads, buffer_size):
+    """Puts the wall clock time, CPU time and max RSS (in KB) of a single
+    copy on the results queue (or the exception raised by the copy)."""
+
+    try:
+        hook = LocalHook(mmap_reads=mmap_reads)
+
+        usage_start = resource.getrusage(resource.RUSAGE_SELF)
+        wall_start = time.time()
+
+        with hook.open(src_path, "rb") as src_file:
+            if dest_path is None:
+                copy_stream(src_file, _NullWriter(), buffer_size=buffer_size)
+            else:
+                hook.copy_fileobj(src_file, dest_path, buffer_size=buffer_size)
+
+        wall = time.time() - wall_start
+        usage_end = resource.getrusage(resource.RUSAGE_SELF)
+
+        cpu = (usage_end.ru_utime - usage_start.ru_utime) + (
+            usage_end.ru_stime - usage_start.ru_stime
+        )
+
+        results.put((wall, cpu, usage_end.ru_maxrss))
+    except Exception as exc:  # pylint: disable=broad-except
+        results.put(exc)
+
+
+class _NullWriter(object):
+    """Writer discarding all data after reading it once (as a socket would)."""
+
+    def __init__(self):
+        self.checksum = 1
+
+    def write(self, data):
+        """Checksums and discards the data, returning its size."""
+        self.checksum = zlib.adler32(data, self.checksum)
+        return len(data)
+
+
+if __name__ == "__main__":
+    main()
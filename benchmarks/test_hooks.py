@@ -0,0 +1,86 @@
+"""Benchmarks for the listing and copy methods of the hooks."""
+
+import os
+import posixpath
+
+import pytest
+
+from airflow_fs.hooks import LocalHook
+
+COPY_SIZES = [1024 * 1024, 16 * 1024 * 1024]
+
+
+@pytest.mark.benchmark(group="listdir")
+def test_listdir(benchmark, backend, tree_size):
+    """Lists a flat directory containing tree_size files."""
+
+    dir_path = backend.tree(tree_size, flat=True)
+
+    with backend.hook() as hook:
+        names = benchmark(hook.listdir, dir_path)
+
+    assert len(names) == tree_size
+    benchmark.extra_info["files"] = tree_size
+
+
+@pytest.mark.benchmark(group="walk")
+def test_walk(benchmark, backend, tree_size):
+    """Walks a nested tree containing tree_size files."""
+
+    root = backend.tree(tree_size)
+
+    with backend.hook() as hook:
+        entries = benchmark(lambda: list(hook.walk(root)))
+
+    assert sum(len(files) for _, _, files in entries) == tree_size
+    benchmark.extra_info["files"] = tree_size
+
+
+@pytest.mark.benchmark(group="glob")
+@pytest.mark.parametrize("flat", [True, False], ids=["flat", "nested"])
+def test_glob(benchmark, backend, tree_size, flat):
+    """Globs half of the files in a flat or nested tree."""
+
+    root = backend.tree(tree_size, flat=flat)
+    pattern = posixpath.join(root, "*.csv" if flat else "*/*/*.csv")
+
+    with backend.hook() as hook:
+        matches = benchmark(hook.glob, pattern)
+
+    assert len(matches) == (tree_size + 1) // 2
+    benchmark.extra_info["files"] = tree_size
+
+
+@pytest.mark.benchmark(group="copy")
+@pytest.mark.parametrize("size", COPY_SIZES)
+@pytest.mark.parametrize("direction", ["upload", "download"])
+def test_copy(benchmark, backend, local_backend, size, direction):
+    """Copies a single file of the given size from the local file system to
+    the backend (upload) or from the backend to the local file system
+    (download). Throughput is reported as extra info (bytes per second)."""
+
+    content = os.urandom(size)
+
+    local_dir, remote_dir = local_backend.new_dir(), backend.new_dir()
+    local_path = posixpath.join(local_dir, "file.bin")
+    remote_path = posixpath.join(remote_dir, "file.bin")
+
+    with backend.hook() as hook:
+        if direction == "upload":
+            local_backend.write_file(local_path, content)
+            src_path, dest_path = local_path, posixpath.join(remote_dir, "copy.bin")
+            src_hook, dest_hook = LocalHook(), hook
+        else:
+            backend.write_file(remote_path, content)
+            src_path, dest_path = remote_path, posixpath.join(local_dir, "copy.bin")
+            src_hook, dest_hook = hook, LocalHook()
+
+        benchmark.pedantic(
+            dest_hook.copy,
+            args=(src_path, dest_path),
+            kwargs={"src_hook": src_hook},
+            rounds=5,
+        )
+
+    benchmark.extra_info["bytes"] = size
+    benchmark.extra_info["bytes_per_second"] = size / benchmark.stats.stats.mean
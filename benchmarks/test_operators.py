@@ -0,0 +1,79 @@
+"""Benchmarks for the file system operators.
+
+Operators copy from (or delete in) synthetic trees of tree_size small files,
+so that these benchmarks mostly measure per-file overhead (listing, connection
+handling and round trips) rather than raw throughput.
+"""
+
+import posixpath
+
+import pytest
+
+from airflow_fs.hooks import LocalHook
+from airflow_fs.operators import CopyFileOperator, DeleteFileOperator, SyncOperator
+
+from .conftest import FILE_CONTENT, synthetic_paths
+
+
+@pytest.mark.benchmark(group="copy-operator")
+@pytest.mark.parametrize("max_workers", [None, 4], ids=["serial", "parallel"])
+def test_copy_operator(benchmark, backend, local_backend, tree_size, max_workers):
+    """Uploads the .csv files of a flat local tree to the backend."""
+
+    src_path = posixpath.join(local_backend.tree(tree_size, flat=True), "*.csv")
+
+    def _setup():
+        task = CopyFileOperator(
+            src_path=src_path,
+            dest_path=backend.new_dir(),
+            src_hook=LocalHook(),
+            dest_hook=backend.hook(),
+            max_workers=max_workers,
+            task_id="copy",
+        )
+        return (task,), {}
+
+    benchmark.pedantic(_execute, setup=_setup, rounds=3)
+    benchmark.extra_info["files"] = (tree_size + 1) // 2
+
+
+@pytest.mark.benchmark(group="sync-operator")
+def test_sync_operator_unchanged(benchmark, backend, local_backend, tree_size):
+    """Syncs a nested local tree to an up-to-date copy on the backend, which
+    measures the cost of listing and comparing both trees."""
+
+    task = SyncOperator(
+        src_path=local_backend.tree(tree_size),
+        dest_path=backend.new_dir(),
+        src_hook=LocalHook(),
+        dest_hook=backend.hook(),
+        task_id="sync",
+    )
+    _execute(task)
+
+    result = benchmark.pedantic(_execute, args=(task,), rounds=3)
+
+    assert result["copied"] == 0
+    benchmark.extra_info["files"] = tree_size
+
+
+@pytest.mark.benchmark(group="delete-operator")
+def test_delete_operator(benchmark, backend, tree_size):
+    """Deletes all files in a flat directory on the backend."""
+
+    def _setup():
+        dir_path = backend.new_dir()
+        for rel_path in synthetic_paths(tree_size, flat=True):
+            backend.write_file(posixpath.join(dir_path, rel_path), FILE_CONTENT)
+
+        task = DeleteFileOperator(
+            path=posixpath.join(dir_path, "*"), hook=backend.hook(), task_id="delete"
+        )
+        return (task,), {}
+
+    benchmark.pedantic(_execute, setup=_setup, rounds=3)
+    benchmark.extra_info["files"] = tree_size
+
+
+def _execute(task):
+    return task.execute(context={})
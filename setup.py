@@ -11,7 +11,7 @@ with open("README.rst") as readme_file:
 with open("HISTORY.rst") as history_file:
     history = history_file.read()
 
-requirements = ["apache-airflow", "future"]
+requirements = ["apache-airflow", "future", "futures; python_version<'3'"]
 
 setup_requirements = ["pytest-runner"]
 
@@ -24,20 +24,29 @@ dev_requirements = [
     "watchdog",
     "black; python_version>'3'",
     "pytest-helpers-namespace",
+    "pytest-benchmark",
+    "pyftpdlib",
+    "paramiko",
     "bump2version"
 ]
 
 extra_requirements = {
+    "arrow": ["pyarrow>=2.0; python_version>='3'"],
+    "checksum": ["crc32c", "xxhash"],
+    "compression": ["zstandard", "backports.lzma; python_version<'3'"],
     "ftp": ["ftputil"],
-    # Pyarrow issue on 2.7: https://issues.apache.org/jira/browse/ARROW-4413
-    "hdfs": ["pyarrow<0.12; python_version<'3'", "pyarrow; python_version>='3'"],
-    "s3": ["s3fs"],
+    # The pyarrow.fs API used by the HdfsHook requires pyarrow 2.0+ (Python 3).
+    "hdfs": ["pyarrow>=2.0; python_version>='3'"],
+    "s3": ["s3fs", "boto3"],
     "sftp": ["pysftp"],
     "dev": dev_requirements + test_requirements,
 }
 
 extra_requirements["all"] = (
-    extra_requirements["ftp"]
+    extra_requirements["arrow"]
+    + extra_requirements["checksum"]
+    + extra_requirements["compression"]
+    + extra_requirements["ftp"]
     + extra_requirements["hdfs"]
     + extra_requirements["s3"]
     + extra_requirements["sftp"]
@@ -51,11 +60,7 @@ setuptools.setup(
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
         "Natural Language :: English",
-        "Programming Language :: Python :: 2",
-        "Programming Language :: Python :: 2.7",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5",
         "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
     ],
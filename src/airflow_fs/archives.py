@@ -0,0 +1,236 @@
+"""Streaming reading and writing of tar and zip archives on any file system.
+
+Archives are written to and read from file objects opened by a hook, one
+member at a time, so that archives never need to be staged on local disk
+and memory use does not depend on the size of the archive.
+"""
+
+from collections import namedtuple
+import logging
+import posixpath
+import re
+import shutil
+import stat
+import sys
+import tarfile
+import time
+import zipfile
+
+from airflow_fs.hooks.fs_hook import NotSupportedError
+from airflow_fs.transfer import is_seekable
+
+#: Supported archive formats, keyed on their file name suffixes.
+ARCHIVE_FORMATS = {
+    ".tar": "tar",
+    ".tar.gz": "tar.gz",
+    ".tgz": "tar.gz",
+    ".tar.bz2": "tar.bz2",
+    ".tar.xz": "tar.xz",
+    ".zip": "zip",
+}
+
+# Timestamp shortly after the earliest date that can be stored in zip archives
+# (1980-01-01), with a margin for the local time zone.
+_ZIP_EPOCH = 315532800 + 86400
+
+_LOG = logging.getLogger(__name__)
+
+
+class ArchiveMember(namedtuple("ArchiveMember", ["name", "size", "mtime", "open"])):
+    """File to write into an archive.
+
+    :param str name: Path of the file within the archive.
+    :param int size: Size of the file (in bytes).
+    :param float mtime: Modification time of the file (POSIX timestamp),
+        or None to use the current time.
+    :param open: Function without arguments returning a (readable) file
+        object with the contents of the file.
+    """
+
+
+class ArchiveEntry(namedtuple("ArchiveEntry", ["name", "is_dir", "file_obj"])):
+    """File or directory read from an archive.
+
+    :param str name: Normalized (relative) path of the entry.
+    :param bool is_dir: Whether the entry is a directory.
+    :param file_obj: File object with the contents of the entry (None for
+        directories), which can only be read until the next entry is read.
+    """
+
+
+def detect_format(path):
+    """Returns the archive format (tar, tar.gz, tar.bz2, tar.xz or zip)
+    for the given path, based on its suffix.
+
+    :raises ValueError: If the suffix is not a known archive suffix.
+    """
+
+    for suffix, archive_format in sorted(
+            ARCHIVE_FORMATS.items(), key=lambda item: -len(item[0])):
+        if path.lower().endswith(suffix):
+            return archive_format
+
+    raise ValueError(
+        "Can't determine archive format of {}, expected one of the suffixes "
+        "{}".format(path, ", ".join(sorted(ARCHIVE_FORMATS))))
+
+
+def write_archive(file_obj, members, archive_format):
+    """Writes the given members into an archive, in order.
+
+    Tar archives are written as a stream. Zip archives are written using
+    data descriptors, which requires Python 3.6 or newer.
+
+    :param file_obj: File object to write the archive to.
+    :param members: Iterable of ArchiveMembers to write.
+    :param str archive_format: Format of the archive (see `detect_format`).
+
+    :returns: The number of members written.
+    """
+
+    # Hide any seek/tell support of the destination, as the archive modules
+    # otherwise try to seek back (which remote file objects may not support).
+    file_obj = _StreamWriter(file_obj)
+
+    if archive_format == "zip":
+        return _write_zip(file_obj, members)
+    return _write_tar(file_obj, members, archive_format)
+
+
+def _write_tar(file_obj, members, archive_format):
+    mode = "w|" + _tar_compression(archive_format)
+    count = 0
+
+    with tarfile.open(fileobj=file_obj, mode=mode, format=tarfile.PAX_FORMAT) as archive:
+        for member in members:
+            info = tarfile.TarInfo(member.name)
+            info.size = member.size
+            info.mtime = member.mtime if member.mtime is not None else time.time()
+            info.mode = 0o644
+
+            with member.open() as member_file:
+                archive.addfile(info, member_file)
+            count += 1
+
+    return count
+
+
+def _write_zip(file_obj, members):
+    if sys.version_info < (3, 6):
+        raise NotSupportedError("Writing zip archives requires Python 3.6 or newer")
+
+    count = 0
+
+    with zipfile.ZipFile(file_obj, "w", allowZip64=True) as archive:
+        for member in members:
+            mtime = member.mtime if member.mtime is not None else time.time()
+
+            info = zipfile.ZipInfo(
+                member.name, date_time=time.localtime(max(mtime, _ZIP_EPOCH))[:6]
+            )
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            # Known sizes allow the zip module to decide if ZIP64 is needed.
+            info.file_size = member.size
+
+            with member.open() as member_file, archive.open(info, "w") as entry:
+                shutil.copyfileobj(member_file, entry)
+            count += 1
+
+    return count
+
+
+def iter_archive(file_obj, archive_format):
+    """Yields the regular files and directories in an archive as
+    ArchiveEntries, in the order in which they are stored.
+
+    Tar archives are read as a stream. Zip archives store their index at the
+    end of the file and therefore require a seekable file object. Links and
+    special files are skipped.
+
+    :param file_obj: File object to read the archive from.
+    :param str archive_format: Format of the archive (see `detect_format`).
+
+    :raises ValueError: If an entry would be extracted outside of the target
+        directory (absolute paths or paths containing '..').
+    """
+
+    if archive_format == "zip":
+        return _iter_zip(file_obj)
+    return _iter_tar(file_obj, archive_format)
+
+
+def _iter_tar(file_obj, archive_format):
+    mode = "r|" + _tar_compression(archive_format)
+
+    with tarfile.open(fileobj=file_obj, mode=mode) as archive:
+        for info in archive:
+            if not (info.isfile() or info.isdir()):
+                _LOG.warning("Skipping %s, which is not a regular file", info.name)
+                continue
+
+            name = safe_member_path(info.name)
+            if name is None:
+                continue
+
+            if info.isdir():
+                yield ArchiveEntry(name, is_dir=True, file_obj=None)
+            else:
+                yield ArchiveEntry(name, is_dir=False, file_obj=archive.extractfile(info))
+
+
+def _iter_zip(file_obj):
+    if not is_seekable(file_obj):
+        raise NotSupportedError("Reading zip archives requires a seekable file object")
+
+    with zipfile.ZipFile(file_obj) as archive:
+        for info in archive.infolist():
+            if stat.S_ISLNK(info.external_attr >> 16):
+                _LOG.warning("Skipping %s, which is not a regular file", info.filename)
+                continue
+
+            name = safe_member_path(info.filename)
+            if name is None:
+                continue
+
+            if info.filename.endswith("/"):
+                yield ArchiveEntry(name, is_dir=True, file_obj=None)
+            else:
+                with archive.open(info) as entry:
+                    yield ArchiveEntry(name, is_dir=False, file_obj=entry)
+
+
+def safe_member_path(name):
+    """Returns the normalized relative path of an archive member, or None if
+    the member refers to the archive root itself.
+
+    :raises ValueError: If the member would be extracted outside of the
+        target directory (absolute paths, drive letters or '..' components).
+    """
+
+    path = posixpath.normpath(name.replace("\\", "/"))
+
+    if (path.startswith("/") or re.match(r"^[A-Za-z]:", path)
+            or path == ".." or path.startswith("../")):
+        raise ValueError("Unsafe path in archive: {!r}".format(name))
+
+    return None if path == "." else path
+
+
+def _tar_compression(archive_format):
+    return archive_format[len("tar."):] if archive_format.startswith("tar.") else ""
+
+
+class _StreamWriter(object):
+    """Write-only view of a file object."""
+
+    def __init__(self, file_obj):
+        self._file_obj = file_obj
+
+    def write(self, data):
+        """Writes data to the file object."""
+        return self._file_obj.write(data)
+
+    def flush(self):
+        """Flushes the file object."""
+        self._file_obj.flush()
@@ -1,10 +1,21 @@
 """Module containing various file system hooks."""
 
 from .fs_hook import FsHook
+from .arrow_hook import ArrowFsHook
+from .cached_hook import CachedHook
 from .ftp_hook import FtpHook
 from .hdfs_hook import HdfsHook
 from .local_hook import LocalHook
 from .s3_hook import S3Hook
 from .sftp_hook import SftpHook
 
-__all__ = ["FsHook", "FtpHook", "HdfsHook", "S3Hook", "SftpHook", "LocalHook"]
+__all__ = [
+    "FsHook",
+    "ArrowFsHook",
+    "CachedHook",
+    "FtpHook",
+    "HdfsHook",
+    "S3Hook",
+    "SftpHook",
+    "LocalHook",
+]
@@ -0,0 +1,238 @@
+"""File system hook for any file system supported by PyArrow (pyarrow.fs)."""
+
+from builtins import super
+import posixpath
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    # Python 2.
+    from urlparse import urlparse
+
+try:
+    from pyarrow import fs as pafs
+except ImportError:
+    pafs = None
+
+from . import FsHook
+from .fs_hook import DirEntry, NotSupportedError
+
+
+class ArrowFsHook(FsHook):
+    """Hook for interacting with files on a PyArrow file system (an instance
+    of `pyarrow.fs.FileSystem`, such as the local file system, HDFS, S3 or GCS).
+
+    Directory trees are listed using a single (recursive) `get_file_info` call
+    in `walk`, `scantree` and `glob`, rather than listing each directory
+    separately. Files are opened as streams using `open_input_stream` and
+    `open_output_stream`, without applying any compression.
+
+    :param filesystem: File system to use, either as a `pyarrow.fs.FileSystem`
+        or as a URI (e.g. 'hdfs://namenode:8020/') that the file system is
+        created from using `pyarrow.fs.FileSystem.from_uri`.
+    :param int buffer_size: Size (in bytes) of the buffers used by opened
+        streams. Streams are unbuffered if not given.
+    :param pool: ConnectionPool to take file systems from (see `FsHook`).
+    """
+
+    #: Paths are matched against a (single) recursive listing by glob.
+    supports_prefix_listing = True
+
+    def __init__(self, filesystem=None, buffer_size=None, pool=None):
+        super().__init__(pool=pool)
+        self._filesystem = filesystem
+        self._buffer_size = buffer_size
+        self._conn = None
+
+    def _serialize_kwargs(self):
+        if not isinstance(self._filesystem, str):
+            raise NotSupportedError(
+                "{} can only be serialized if its file system is given as "
+                "a URI".format(type(self).__name__))
+
+        kwargs = {"filesystem": self._filesystem}
+        if self._buffer_size is not None:
+            kwargs["buffer_size"] = self._buffer_size
+        return kwargs
+
+    def get_conn(self):
+        if pafs is None:
+            raise ImportError(
+                "pyarrow must be installed to use the {}".format(type(self).__name__))
+
+        if self._conn is None:
+            self._conn = self._checkout_conn()
+
+        return self._conn
+
+    def _connect(self):
+        if self._filesystem is None:
+            raise ValueError("No file system given for {}".format(type(self).__name__))
+
+        if isinstance(self._filesystem, str):
+            filesystem, _ = pafs.FileSystem.from_uri(self._filesystem)
+            return filesystem
+
+        return self._filesystem
+
+    def _pool_key(self, kind=None):
+        filesystem = self._filesystem
+        if not isinstance(filesystem, str):
+            filesystem = id(filesystem)
+        return type(self), getattr(self, "_conn_id", None), filesystem, kind
+
+    def disconnect(self):
+        if self._conn is not None:
+            self._checkin_conn(self._conn)
+        self._conn = None
+
+    def open(self, file_path, mode="rb"):
+        conn = self.get_conn()
+
+        if mode == "rb":
+            return conn.open_input_stream(
+                file_path, compression=None, buffer_size=self._buffer_size
+            )
+
+        if mode == "wb":
+            return conn.open_output_stream(
+                file_path, compression=None, buffer_size=self._buffer_size
+            )
+
+        if mode == "ab":
+            return conn.open_append_stream(
+                file_path, compression=None, buffer_size=self._buffer_size
+            )
+
+        raise ValueError(
+            "Unsupported mode {!r}, expected one of 'rb', 'wb' or 'ab'".format(mode)
+        )
+
+    def exists(self, file_path):
+        return self._get_info(file_path).type != pafs.FileType.NotFound
+
+    def isdir(self, path):
+        return self._get_info(path).type == pafs.FileType.Directory
+
+    def listdir(self, dir_path):
+        return [info.base_name for info in self._list(dir_path)]
+
+    def scandir(self, dir_path):
+        return [
+            self._to_entry(info, name=info.base_name) for info in self._list(dir_path)
+        ]
+
+    def mkdir(self, dir_path, mode=0o755, exist_ok=True):
+        # pylint: disable=unused-argument
+        if self.exists(dir_path):
+            if not exist_ok:
+                self._raise_dir_exists(dir_path)
+        else:
+            self.get_conn().create_dir(dir_path, recursive=False)
+
+    def rm(self, file_path):
+        self.get_conn().delete_file(file_path)
+
+    def rmtree(self, dir_path):
+        self.get_conn().delete_dir(dir_path)
+
+    # Overridden default implementations.
+
+    def makedirs(self, dir_path, mode=0o755, exist_ok=True):
+        # pylint: disable=unused-argument
+        if self.exists(dir_path):
+            if not exist_ok:
+                self._raise_dir_exists(dir_path)
+        else:
+            self.get_conn().create_dir(dir_path, recursive=True)
+
+    def size(self, file_path):
+        return self._get_info(file_path).size
+
+    def open_at(self, file_path, offset):
+        file_obj = self.get_conn().open_input_file(file_path)
+        if offset:
+            file_obj.seek(offset)
+        return file_obj
+
+    def walk(self, root):
+        # Reconstructs the tree from a single recursive listing, rather than
+        # listing each directory separately.
+        root = _remove_trailing_slash(root)
+
+        try:
+            infos = self._list(root, recursive=True, allow_not_found=False)
+        except (IOError, OSError):
+            # Missing root directory (FileNotFoundError), similar to os.walk.
+            return
+
+        entries = [
+            (_relative_path(info.path, root), info.type == pafs.FileType.Directory)
+            for info in infos
+        ]
+
+        for entry in self._walk_listing(root, entries):
+            yield entry
+
+    def scantree(self, root):
+        # Lists the whole tree using a single recursive listing.
+        root = _remove_trailing_slash(root)
+
+        for info in self._list(root, recursive=True):
+            if info.type != pafs.FileType.Directory:
+                yield self._to_entry(info, name=_relative_path(info.path, root))
+
+    def iter_prefix(self, prefix, delimiter=None):
+        if delimiter not in (None, "/"):
+            raise NotSupportedError(
+                "{} only supports '/' as delimiter".format(type(self).__name__))
+
+        # Lists the directory containing the prefix, recursively (using a
+        # single call) unless the listing stops at the first delimiter.
+        infos = self._list(posixpath.dirname(prefix), recursive=delimiter is None)
+
+        for info in infos:
+            path = _strip_scheme(info.path)
+            if path.startswith(prefix):
+                yield path + "/" if info.type == pafs.FileType.Directory else path
+
+    def copy_within(self, src_path, dest_path):
+        self.get_conn().copy_file(src_path, dest_path)
+
+    def _is_same_fs(self, other):
+        # pylint: disable=protected-access
+        return type(self) is type(other) and self._pool_key() == other._pool_key()
+
+    # Helper methods.
+
+    def _get_info(self, path):
+        return self.get_conn().get_file_info(path)
+
+    def _list(self, dir_path, recursive=False, allow_not_found=True):
+        selector = pafs.FileSelector(
+            dir_path, allow_not_found=allow_not_found, recursive=recursive
+        )
+        return self.get_conn().get_file_info(selector)
+
+    @staticmethod
+    def _to_entry(info, name):
+        is_dir = info.type == pafs.FileType.Directory
+        return DirEntry(
+            name=name,
+            type="directory" if is_dir else "file",
+            size=None if is_dir else info.size,
+            mtime=info.mtime_ns / 1e9 if info.mtime_ns is not None else None,
+        )
+
+
+def _strip_scheme(path):
+    """Strips the scheme and host of paths listed as URIs."""
+    return urlparse(path).path if "://" in path else path
+
+
+def _relative_path(path, root):
+    return _strip_scheme(path)[len(root):].lstrip("/")
+
+
+def _remove_trailing_slash(path):
+    return path.rstrip("/") or "/"
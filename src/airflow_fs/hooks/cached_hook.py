@@ -0,0 +1,321 @@
+"""Hook wrapper that caches file system metadata."""
+
+from builtins import super
+from collections import OrderedDict
+import copy
+import posixpath
+import threading
+import time
+
+from . import FsHook
+
+
+class CachedHook(FsHook):
+    """Wraps another hook, caching the results of its metadata calls.
+
+    Results of `exists`, `isdir`, `listdir`, `scandir` and `size` are cached
+    for `ttl` seconds, keeping at most `max_size` results (evicting the least
+    recently used results first). Methods that modify the file system
+    (`open` for writing, `open_resume`, `rm`, `rmtree`, `rm_many`, `mkdir`,
+    `makedirs` and the copy methods) invalidate cached results for the affected
+    paths (files opened for writing also do so when they are closed). Note that
+    changes made outside of the hook are only picked up once cached results
+    expire.
+
+    Clones of the hook (see `FsHook.clone`) share the same cache.
+
+    :param FsHook hook: Hook to wrap.
+    :param float ttl: Time (in seconds) for which results are cached.
+    :param int max_size: Maximum number of cached results.
+    """
+
+    def __init__(self, hook, ttl=60, max_size=10000):
+        super().__init__()
+        self._hook = hook
+        self._cache = _MetadataCache(ttl=ttl, max_size=max_size)
+
+    @property
+    def hits(self):
+        """Number of calls answered from the cache."""
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        """Number of calls passed on to the wrapped hook."""
+        return self._cache.misses
+
+    def clear_cache(self):
+        """Removes all cached results."""
+        self._cache.clear()
+
+    def get_conn(self):
+        return self._hook.get_conn()
+
+    def disconnect(self):
+        self._hook.disconnect()
+
+    def clone(self):
+        hook = copy.copy(self)
+        hook._hook = self._hook.clone()  # pylint: disable=protected-access
+        hook._reinstrument()  # pylint: disable=protected-access
+        return hook
+
+    def serialize(self):
+        # The cache itself is process-local, so only the wrapped hook is
+        # re-created in other processes.
+        return self._hook.serialize()
+
+    # Cached methods.
+
+    def exists(self, file_path):
+        return self._cache.get(("exists", file_path), self._hook.exists, file_path)
+
+    def isdir(self, path):
+        return self._cache.get(("isdir", path), self._hook.isdir, path)
+
+    def listdir(self, dir_path):
+        return list(
+            self._cache.get(("listdir", dir_path), self._hook.listdir, dir_path)
+        )
+
+    def scandir(self, dir_path):
+        return list(
+            self._cache.get(("scandir", dir_path), self._hook.scandir, dir_path)
+        )
+
+    def size(self, file_path):
+        return self._cache.get(("size", file_path), self._hook.size, file_path)
+
+    # Invalidating methods.
+
+    def open(self, file_path, mode="rb"):
+        file_obj = self._hook.open(file_path, mode=mode)
+
+        if any(char in mode for char in "wax+"):
+            # Results cached while writing are invalidated once the file is closed.
+            self._cache.invalidate(file_path)
+            file_obj = _InvalidatingFile(file_obj, self._cache, file_path)
+
+        return file_obj
+
+    def mkdir(self, dir_path, mode=0o755, exist_ok=True):
+        try:
+            self._hook.mkdir(dir_path, mode=mode, exist_ok=exist_ok)
+        finally:
+            self._cache.invalidate(dir_path)
+
+    def makedirs(self, dir_path, mode=0o755, exist_ok=True):
+        try:
+            self._hook.makedirs(dir_path, mode=mode, exist_ok=exist_ok)
+        finally:
+            self._cache.invalidate(dir_path)
+
+    def rm(self, file_path):
+        try:
+            self._hook.rm(file_path)
+        finally:
+            self._cache.invalidate(file_path)
+
+    def rmtree(self, dir_path):
+        try:
+            self._hook.rmtree(dir_path)
+        finally:
+            self._cache.invalidate(dir_path, recursive=True)
+
+    def rm_many(self, paths, recursive=False, max_workers=None):
+        # Leaves the default number of workers to the wrapped hook.
+        kwargs = {} if max_workers is None else {"max_workers": max_workers}
+
+        paths = list(paths)
+        try:
+            self._hook.rm_many(paths, recursive=recursive, **kwargs)
+        finally:
+            for path in paths:
+                self._cache.invalidate(path, recursive=recursive)
+
+    def copy(self, src_path, dest_path, src_hook=None, read_workers=None,
+             range_size=None, resume=False, checksum=None, buffer_size=None,
+             pipeline_depth=None, transcoder=None):
+        if isinstance(src_hook, CachedHook):
+            src_hook = src_hook._hook  # pylint: disable=protected-access
+
+        try:
+            return self._hook.copy(
+                src_path,
+                dest_path,
+                src_hook=src_hook,
+                read_workers=read_workers,
+                range_size=range_size,
+                resume=resume,
+                checksum=checksum,
+                buffer_size=buffer_size,
+                pipeline_depth=pipeline_depth,
+                transcoder=transcoder,
+            )
+        finally:
+            self._cache.invalidate(dest_path)
+
+    def open_at(self, file_path, offset):
+        return self._hook.open_at(file_path, offset)
+
+    def native_checksum(self, file_path, algorithm):
+        return self._hook.native_checksum(file_path, algorithm)
+
+    def resume_offset(self, file_path):
+        return self._hook.resume_offset(file_path)
+
+    def open_resume(self, file_path, offset):
+        file_obj = self._hook.open_resume(file_path, offset)
+        self._cache.invalidate(file_path)
+        return _InvalidatingFile(file_obj, self._cache, file_path)
+
+    def verify_resume(self, file_path, offset, read_src):
+        return self._hook.verify_resume(file_path, offset, read_src)
+
+    def copy_fileobj(self, file_obj, dest_path, checksum=None, buffer_size=None,
+                     pipeline_depth=None):
+        try:
+            return self._hook.copy_fileobj(
+                file_obj,
+                dest_path,
+                checksum=checksum,
+                buffer_size=buffer_size,
+                pipeline_depth=pipeline_depth,
+            )
+        finally:
+            self._cache.invalidate(dest_path)
+
+    def copy_within(self, src_path, dest_path):
+        try:
+            self._hook.copy_within(src_path, dest_path)
+        finally:
+            self._cache.invalidate(dest_path)
+
+    # Uncached methods, delegated to the wrapped hook to keep any
+    # hook-specific (more efficient) implementations.
+
+    def walk(self, root):
+        return self._hook.walk(root)
+
+    def scantree(self, root):
+        return self._hook.scantree(root)
+
+    @property
+    def supports_prefix_listing(self):
+        return self._hook.supports_prefix_listing
+
+    def iter_prefix(self, prefix, delimiter=None):
+        return self._hook.iter_prefix(prefix, delimiter=delimiter)
+
+    def _is_same_fs(self, other):
+        if isinstance(other, CachedHook):
+            other = other._hook  # pylint: disable=protected-access
+        return self._hook._is_same_fs(other)  # pylint: disable=protected-access
+
+
+class _InvalidatingFile(object):
+    """File proxy invalidating cached results for the file once it is closed."""
+
+    def __init__(self, file_obj, cache, file_path):
+        self._file = file_obj
+        self._cache = cache
+        self._file_path = file_path
+
+    def close(self):
+        try:
+            self._file.close()
+        finally:
+            self._cache.invalidate(self._file_path)
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            return self._file.__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._cache.invalidate(self._file_path)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+class _MetadataCache(object):
+    """Thread-safe LRU cache with expiring entries, keyed on (method, path)."""
+
+    methods = ("exists", "isdir", "listdir", "scandir", "size")
+
+    def __init__(self, ttl, max_size):
+        self._ttl = ttl
+        self._max_size = max_size
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Incremented on each invalidation, to avoid storing results of calls
+        # that were started before the invalidation.
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, func, *args):
+        """Returns the cached result for key, calling func(*args) on a miss."""
+
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+            if entry is not None and entry[0] > time.time():
+                self._entries[key] = entry
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            generation = self._generation
+
+        value = func(*args)
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.time() + self._ttl, value)
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+
+        return value
+
+    def invalidate(self, path, recursive=False):
+        """Invalidates results for the path and its parent directories.
+
+        If recursive is True, results for all paths below the given
+        path are also invalidated.
+        """
+
+        path = path.rstrip("/") or path
+
+        paths = set()
+        parent = path
+        while parent not in paths:
+            paths.update((parent, parent + "/"))
+            parent = posixpath.dirname(parent)
+
+        with self._lock:
+            self._generation += 1
+
+            for path_ in paths:
+                for method in self.methods:
+                    self._entries.pop((method, path_), None)
+
+            if recursive:
+                prefix = path + "/"
+                for key in list(self._entries):
+                    if key[1].startswith(prefix):
+                        del self._entries[key]
+
+    def clear(self):
+        """Removes all entries from the cache."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
@@ -1,23 +1,41 @@
 """Base class defining the file system hook interface."""
 
 from builtins import super
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import copy
 import errno
 import posixpath
-import shutil
+import threading
 
 from airflow.hooks.base_hook import BaseHook
 
+from airflow_fs import transfer
 from airflow_fs.ports import glob
 
+from .pool import default_pool
+from .stats import HookStats, instrument, uninstrument
+
 
 class FsHook(BaseHook):
     """Base FsHook defining the FsHook interface and providing some basic
        functionality built on this interface.
+
+    :param pool: ConnectionPool to take connections from, allowing connections
+        to be reused after the hook disconnects. Pass True to use the
+        process-wide pool (`airflow_fs.hooks.pool.default_pool`).
     """
 
-    def __init__(self):
+    _stats = None
+
+    def __init__(self, pool=None):
         super().__init__(source=None)
 
+        if pool is True:
+            pool = default_pool
+
+        self._pool = pool or None
+
     def __enter__(self):
         return self
 
@@ -27,6 +45,123 @@ class FsHook(BaseHook):
     def disconnect(self):
         """Closes fs connection (if applicable)."""
 
+    def clone(self):
+        """Returns a disconnected copy of the hook.
+
+        The copy shares the configuration of the hook, but opens its own
+        connection when it is first used. This makes it safe to use the copy
+        in another thread, as most of the underlying clients are not thread-safe.
+        """
+        hook = copy.copy(self)
+        if "_conn" in vars(hook):
+            # Only for hooks with a connection (see `get_conn`).
+            # pylint: disable=protected-access,attribute-defined-outside-init
+            hook._conn = None
+        hook._reinstrument()  # pylint: disable=protected-access
+        return hook
+
+    @property
+    def stats(self):
+        """HookStats recorded for the hook, or None if stats are not enabled
+        (see `enable_stats`)."""
+        return self._stats
+
+    def enable_stats(self, statsd=False):
+        """Starts recording call counts, latencies and bytes read/written
+        (for files returned by `open`) for the hook, available as `hook.stats`.
+
+        Methods are only instrumented once stats are enabled, so hooks without
+        stats have no overhead. Clones of the hook share its stats.
+
+        :param bool statsd: Whether to also send the stats to the StatsD
+            client of Airflow (see `HookStats`).
+        """
+        if self._stats is None:
+            self._stats = HookStats(type(self).__name__, statsd=statsd)
+            instrument(self, self._stats)
+        return self._stats
+
+    def disable_stats(self):
+        """Stops recording stats for the hook."""
+        uninstrument(self)
+        self._stats = None
+
+    def _reinstrument(self):
+        """Binds the instrumentation of a copied hook to the copy itself, as
+        the copied (instance) methods still call the original hook."""
+        if self._stats is not None:
+            instrument(self, self._stats)
+
+    def serialize(self):
+        """Returns the classpath and keyword arguments needed to re-create the
+        hook in another process (e.g. in a trigger of a deferred sensor).
+
+        Connection pools are process-local, hooks using a pool are therefore
+        re-created using the process-wide pool of the other process.
+        """
+        kwargs = self._serialize_kwargs()
+        if self._pool is not None:
+            kwargs["pool"] = True
+
+        cls = type(self)
+        return cls.__module__ + "." + cls.__name__, kwargs
+
+    def _serialize_kwargs(self):
+        """Returns the keyword arguments passed to the hook on creation."""
+        if hasattr(self, "_conn_id"):
+            return {"conn_id": self._conn_id}
+        return {}
+
+    # Connection pooling. Hooks with connections implement `_connect` (and
+    # optionally `_close_conn` and `_is_alive`) and use `_checkout_conn` and
+    # `_checkin_conn` to get/release connections, which then come from the
+    # hooks pool if the hook was created with one.
+
+    def _connect(self):
+        """Creates a new connection to the file system."""
+        raise NotSupportedError(
+            "{} does not create connections".format(type(self).__name__))
+
+    @staticmethod
+    def _close_conn(conn):
+        """Closes the given connection."""
+
+    @staticmethod
+    def _is_alive(conn):  # pylint: disable=unused-argument
+        """Checks if an (idle) connection is still usable."""
+        return True
+
+    def _pool_key(self, kind=None):
+        return type(self), getattr(self, "_conn_id", None), kind
+
+    def _checkout_conn(self, connect=None, kind=None):
+        """Creates a new connection or checks one out of the pool.
+
+        :param connect: Function used to create the connection (defaults
+            to `_connect`).
+        :param kind: Optional name distinguishing multiple types of
+            connections used by a hook.
+        """
+        connect = connect or self._connect
+
+        if self._pool is None:
+            return connect()
+
+        return self._pool.checkout(
+            self._pool_key(kind),
+            connect,
+            close=self._close_conn,
+            is_alive=self._is_alive,
+        )
+
+    def _checkin_conn(self, conn, kind=None):
+        """Closes the given connection or returns it to the pool."""
+
+        if self._pool is None:
+            self._close_conn(conn)
+        else:
+            self._pool.checkin(self._pool_key(kind), conn, close=self._close_conn)
+
     # Interface methods (should be implemented by sub-classes).
 
     # pylint: disable=missing-docstring
@@ -64,6 +199,30 @@ class FsHook(BaseHook):
         """Lists names of entries in the given path."""
         raise NotImplementedError()
 
+    def scandir(self, dir_path):
+        """Lists entries in the given path, together with their metadata.
+
+        Similar to `os.scandir`, but returns a list of `DirEntry` tuples
+        describing the name, type, size and modification time of each entry.
+        Sub-classes should override this method to fetch the metadata using
+        a single listing. The default implementation uses `listdir` and an
+        `isdir` call per entry, without size or modification time.
+
+        :param str dir_path: Path to the directory.
+
+        :rtype: list[DirEntry]
+        """
+        return [
+            DirEntry(
+                name=name,
+                type="directory" if self.isdir(posixpath.join(dir_path, name))
+                else "file",
+                size=None,
+                mtime=None,
+            )
+            for name in self.listdir(dir_path)
+        ]
+
     def mkdir(self, dir_path, mode=0o755, exist_ok=True):
         """Creates the directory, without creating intermediate directories."""
         raise NotImplementedError()
@@ -87,6 +246,50 @@ class FsHook(BaseHook):
         raise IOError(errno.EEXIST,
                       'Directory exists: {!r}'.format(dir_path))
 
+    @staticmethod
+    def _walk_listing(root, entries):
+        """Builds a (top-down) walk over a recursive listing of a directory.
+
+        Can be used to implement `walk` for file systems that can list a full
+        directory tree at once. Parent directories of listed entries are
+        included in the walk, even if they are not listed themselves.
+
+        :param str root: Path of the listed directory.
+        :param entries: Iterable of (relative path, is_dir) tuples for the
+            entries below the root directory.
+        """
+
+        tree = {"": ([], [])}
+
+        def _add_dir(rel_dir):
+            if rel_dir not in tree:
+                parent, name = posixpath.split(rel_dir)
+                _add_dir(parent)
+                tree[rel_dir] = ([], [])
+                tree[parent][0].append(name)
+
+        for rel_path, is_dir in entries:
+            rel_path = rel_path.strip("/")
+            if not rel_path:
+                continue
+
+            if is_dir:
+                _add_dir(rel_path)
+            else:
+                parent, name = posixpath.split(rel_path)
+                _add_dir(parent)
+                tree[parent][1].append(name)
+
+        def _walk(rel_dir):
+            sub_dirs, files = tree[rel_dir]
+            yield posixpath.join(root, rel_dir) if rel_dir else root, sub_dirs, files
+
+            for sub_dir in sub_dirs:
+                for entry in _walk(posixpath.join(rel_dir, sub_dir)):
+                    yield entry
+
+        return _walk("")
+
     # General utility methods built on the above interface methods.
 
     # These methods can be overridden in sub-classes if more efficient
@@ -123,16 +326,113 @@ class FsHook(BaseHook):
             if not exist_ok or not self.isdir(dir_path):
                 raise
 
+    def size(self, file_path):
+        """Returns the size of the given file (in bytes).
+
+        :param str file_path: Path to the file.
+        :rtype: int
+        """
+        with self.open(file_path, "rb") as file_obj:
+            file_obj.seek(0, 2)
+            return file_obj.tell()
+
+    def rm_many(self, paths, recursive=False, max_workers=4):
+        """Deletes multiple files (or directory trees if recursive is True).
+
+        The default implementation deletes paths concurrently using a pool of
+        `max_workers` threads, each of which uses its own clone (and
+        connection) of the hook. For hooks with a connection
+        pool, the number of threads is limited to the free capacity of the
+        pool and connections are checked back in after each path, so that
+        the threads never wait for connections held by each other (or by
+        this hook). Hooks that support batched deletes should override this
+        method.
+
+        :param paths: Iterable of paths to delete.
+        :param bool recursive: Whether to delete the paths as directory trees
+            (using `rmtree`) rather than as files (using `rm`).
+        :param int max_workers: Maximum number of paths to delete concurrently.
+            Paths are deleted sequentially if None or 1.
+
+        :raises IOError: If any of the paths could not be deleted. All paths
+            are attempted before the error is raised.
+        """
+
+        method = "rmtree" if recursive else "rm"
+        failures = []
+
+        if max_workers is not None and self._pool is not None:
+            capacity = self._pool.available(self._pool_key())
+            if getattr(self, "_conn", None) is None:
+                # Leaves a connection for this hook (e.g. for listing paths).
+                capacity -= 1
+            max_workers = min(max_workers, capacity)
+
+        if max_workers is None or max_workers <= 1:
+            for path in paths:
+                try:
+                    getattr(self, method)(path)
+                except Exception as exc:  # pylint: disable=broad-except
+                    failures.append((path, exc))
+        else:
+            thread_state = threading.local()
+            thread_hooks = []
+            lock = threading.Lock()
+
+            def _delete(path):
+                if not hasattr(thread_state, "hook"):
+                    thread_state.hook = self.clone()
+                    with lock:
+                        thread_hooks.append(thread_state.hook)
+                try:
+                    getattr(thread_state.hook, method)(path)
+                finally:
+                    if self._pool is not None:
+                        # Checks the connection back in, clones reconnect
+                        # (from the pool) when they are used again.
+                        thread_state.hook.disconnect()
+
+            pending = {}
+
+            def _collect(futures):
+                for future in futures:
+                    path = pending.pop(future)
+                    if future.exception() is not None:
+                        failures.append((path, future.exception()))
+
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for path in paths:
+                        # Bound the number of queued paths, so that large
+                        # iterables of paths are consumed lazily.
+                        if len(pending) >= 2 * max_workers:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            _collect(done)
+                        pending[executor.submit(_delete, path)] = path
+
+                    done, _ = wait(pending)
+                    _collect(done)
+            finally:
+                for hook in thread_hooks:
+                    hook.disconnect()
+
+        if failures:
+            raise IOError(
+                "Failed to delete {} path(s): {}".format(
+                    len(failures),
+                    ", ".join("{} ({})".format(path, exc) for path, exc in failures),
+                )
+            )
+
     def walk(self, root):
         """Directory tree generator, similar to os.walk."""
 
         sub_dirs, files = [], []
-        for item in self.listdir(root):
-            full_path = posixpath.join(root, item)
-            if self.isdir(full_path):
-                sub_dirs.append(item)
+        for entry in self.scandir(root):
+            if entry.is_dir():
+                sub_dirs.append(entry.name)
             else:
-                files.append(item)
+                files.append(entry.name)
 
         yield root, sub_dirs, files
 
@@ -140,32 +440,325 @@ class FsHook(BaseHook):
             for entry in self.walk(posixpath.join(root, sub_dir)):
                 yield entry
 
+    def scantree(self, root):
+        """Yields `DirEntry` tuples for all files below the given directory
+        (recursively), named by their path relative to the directory.
+
+        The default implementation calls `scandir` for each directory. Hooks
+        that can list a whole tree at once should override this method.
+
+        :param str root: Path to the directory.
+        """
+
+        for entry in self.scandir(root):
+            if entry.is_dir():
+                for sub_entry in self.scantree(posixpath.join(root, entry.name)):
+                    yield sub_entry._replace(
+                        name=posixpath.join(entry.name, sub_entry.name)
+                    )
+            else:
+                yield entry
+
     def glob(self, pattern, recursive=False):
         """Return a list of paths matching a pathname pattern."""
         return glob.glob(pattern, recursive=recursive, hook=self)
 
+    def iglob(self, pattern, recursive=False):
+        """Return an iterator which yields the paths matching a pathname
+        pattern, without listing more than needed for each yielded path.
+        """
+        return glob.iglob(pattern, recursive=recursive, hook=self)
+
+    #: Whether the hook can list paths by prefix (see `iter_prefix`), in which
+    #: case glob patterns are matched against a single prefix listing.
+    supports_prefix_listing = False
+
+    def iter_prefix(self, prefix, delimiter=None):
+        """Yields paths starting with the given (string) prefix.
+
+        Only supported by hooks with `supports_prefix_listing` set to True,
+        typically object stores that natively list keys by prefix.
+
+        :param str prefix: Prefix of the paths to list. Note that this does
+            not have to end at a directory boundary.
+        :param str delimiter: If given, paths are only listed up to the first
+            delimiter after the prefix. Paths of (implicit) directories
+            are yielded with a trailing delimiter.
+        """
+        raise NotSupportedError(
+            "{} does not support prefix listings".format(type(self).__name__)
+        )
+
     # Methods for copying files between hooks.
 
-    def copy(self, src_path, dest_path, src_hook=None):
+    def copy(self, src_path, dest_path, src_hook=None, read_workers=None,
+             range_size=None, resume=False, checksum=None, buffer_size=None,
+             pipeline_depth=None, transcoder=None):
         """Copies file(s) into the hooks file system.
 
         By default, source files are assumed to be on the same file system as the
         destination (the hooks file system). To copy between different file systems
         or file systems in different locations, a source file hook can be provided
         using the `src_hook` argument.
+
+        If the source is on the same file system (and connection) as the hook, the
+        file is copied using `copy_within`, which avoids streaming the data through
+        the Airflow worker for hooks that support server-side copies.
+
+        :param str src_path: Path of the file to copy.
+        :param str dest_path: Path to copy the file to.
+        :param FsHook src_hook: Hook to read the source file with.
+        :param int read_workers: If given, the source file is read as byte ranges
+            using this number of concurrent readers (see
+            `airflow_fs.transfer.ranged_copy`). This requires file objects of the
+            source hook to support `seek` and mainly helps for large files on
+            high-latency file systems.
+        :param int range_size: Size of the byte ranges (in bytes) used when
+            `read_workers` is given.
+        :param bool resume: Whether to resume a previously interrupted copy,
+            continuing after the data already written to the destination (see
+            `airflow_fs.transfer.resume_copy`). Files are copied from the start
+            if the hook does not support resuming writes. If given,
+            `read_workers` is ignored.
+        :param str checksum: Checksum algorithm (md5, sha256, crc32c or xxhash)
+            to compute a checksum of the file with while it is copied (see
+            `copy_fileobj`). As the data needs to pass through the client,
+            server-side copies and `read_workers` are not used if given.
+        :param int buffer_size: Size (in bytes) of the chunks in which data is
+            copied (see `copy_fileobj`).
+        :param int pipeline_depth: If given, reads from the source overlap with
+            writes to the destination, using this number of buffers (see
+            `copy_fileobj`). Not used for server-side copies or if
+            `read_workers` is given.
+        :param Transcoder transcoder: Transcoding stage (see
+            `airflow_fs.transcoding.Transcoder`) to compress, decompress or
+            recompress the data with while it is copied. The data is always
+            streamed through the client if given, so `read_workers` and
+            `resume` are not used. Note that `dest_path` is used as given
+            (see `Transcoder.rename` for adjusting its suffix).
+
+        :returns: The checksum (as hex digest) if `checksum` is given. When
+            transcoding, the checksum is computed over the transcoded data.
         """
 
-        # TODO: Allow short circuiting when copying within the same filesystem
-        #   with the same connection details?
+        if transcoder is not None:
+            with (src_hook or self).open(src_path, "rb") as src_file:
+                return self.copy_fileobj(
+                    transcoder.wrap(src_file),
+                    dest_path,
+                    checksum=checksum,
+                    buffer_size=buffer_size,
+                    pipeline_depth=pipeline_depth,
+                )
+
+        if checksum is None and (src_hook is None or self._is_same_fs(src_hook)):
+            try:
+                self.copy_within(src_path, dest_path)
+                return None
+            except NotSupportedError:
+                pass
 
-        with src_hook.open(src_path, "rb") as src_file, \
-                self.open(dest_path, "wb") as dest_file:
-            shutil.copyfileobj(src_file, dest_file)
+        src_hook = src_hook or self
+
+        if resume:
+            try:
+                digest = transfer.resume_copy(
+                    src_hook,
+                    src_path,
+                    self,
+                    dest_path,
+                    checksum=checksum,
+                    buffer_size=buffer_size,
+                    pipeline_depth=pipeline_depth,
+                )
+            except NotSupportedError:
+                self.log.info(
+                    "%s does not support resuming copies, copying %s from the start",
+                    type(self).__name__, src_path)
+            else:
+                if checksum is not None:
+                    self._verify_checksum(dest_path, checksum, digest)
+                return digest
+
+        if read_workers is not None and checksum is None:
+            transfer.ranged_copy(
+                src_hook,
+                src_path,
+                dest_hook=self,
+                dest_path=dest_path,
+                range_size=range_size,
+                max_workers=read_workers,
+            )
+            return None
+
+        with src_hook.open(src_path, "rb") as src_file:
+            return self.copy_fileobj(
+                src_file,
+                dest_path,
+                checksum=checksum,
+                buffer_size=buffer_size,
+                pipeline_depth=pipeline_depth,
+            )
+
+    def copy_fileobj(self, file_obj, dest_path, checksum=None, buffer_size=None,
+                     pipeline_depth=None):
+        """Copies a file object into the hooks file system.
+
+        :param file_obj: File object to copy.
+        :param str dest_path: Path to copy the file to.
+        :param str checksum: Checksum algorithm (md5, sha256, crc32c or xxhash)
+            to compute a checksum of the data with while it is copied. If the
+            file system provides a checksum of the written file using the same
+            algorithm (see `native_checksum`), both checksums are compared.
+        :param int buffer_size: Size (in bytes) of the chunks in which data is
+            copied.
+        :param int pipeline_depth: If given, the file object is read in a
+            separate thread while data is written, using this number of
+            buffers of `buffer_size` bytes (see
+            `airflow_fs.transfer.pipelined_copy`). This mainly helps when
+            both the source and destination are remote.
+
+        :returns: The checksum (as hex digest) if `checksum` is given.
+
+        :raises IOError: If the checksum does not match the native checksum.
+        """
+
+        if checksum is not None:
+            file_obj = transfer.HashingReader(file_obj, checksum)
 
-    def copy_fileobj(self, file_obj, dest_path):
-        """Copies a file object into the hooks file system."""
         with self.open(dest_path, "wb") as dst_file:
-            shutil.copyfileobj(file_obj, dst_file)
+            transfer.copy_stream(
+                file_obj,
+                dst_file,
+                buffer_size=buffer_size,
+                pipeline_depth=pipeline_depth,
+            )
+
+        if checksum is None:
+            return None
+
+        digest = file_obj.hexdigest()
+        self._verify_checksum(dest_path, checksum, digest)
+        return digest
+
+    def native_checksum(self, file_path, algorithm):
+        """Returns the checksum of a file as provided by the file system (as
+        hex digest), or None if the file system does not provide a checksum
+        using the given algorithm for the file.
+
+        :param str file_path: Path of the file.
+        :param str algorithm: Checksum algorithm (see `copy_fileobj`).
+        """
+        # pylint: disable=unused-argument
+        return None
+
+    def _verify_checksum(self, file_path, algorithm, digest):
+        # Hooks that provide native checksums override native_checksum.
+        native = self.native_checksum(file_path, algorithm)  # pylint: disable=assignment-from-none
+
+        if native is not None and native != digest:
+            raise IOError(
+                "{} checksum of {} ({}) does not match checksum of the copied "
+                "data ({})".format(algorithm, file_path, native, digest))
+
+    def open_at(self, file_path, offset):
+        """Opens a file for reading, starting at the given byte offset.
+
+        :param str file_path: Path of the file to open.
+        :param int offset: Offset (in bytes) to start reading at.
+        """
+        file_obj = self.open(file_path, "rb")
+        if offset:
+            file_obj.seek(offset)
+        return file_obj
+
+    def resume_offset(self, file_path):
+        """Returns the number of bytes of a partially written file that can
+        be kept when resuming the write (0 if the file does not exist).
+
+        :param str file_path: Path of the file.
+
+        :raises NotSupportedError: If the hook can't resume writes.
+        """
+        raise NotSupportedError(
+            "{} does not support resuming writes".format(type(self).__name__))
+
+    def open_resume(self, file_path, offset):
+        """Opens a partially written file for resuming the write at the given
+        offset (as returned by `resume_offset`). Data after the offset is
+        discarded and an offset of 0 starts a new file.
+
+        :param str file_path: Path of the file to open.
+        :param int offset: Offset (in bytes) to continue writing at.
+
+        :raises NotSupportedError: If the hook can't resume writes.
+        """
+        raise NotSupportedError(
+            "{} does not support resuming writes".format(type(self).__name__))
+
+    def verify_resume(self, file_path, offset, read_src):
+        """Checks if the data of a partially written file matches the data of
+        its source, before resuming the write at the given offset.
+
+        By default, the last `airflow_fs.transfer.RESUME_CHECK_SIZE` bytes
+        before the offset are compared.
+
+        :param str file_path: Path of the partially written file.
+        :param int offset: Offset the write would be resumed at.
+        :param read_src: Function taking a (start, length) byte range and
+            returning the corresponding data of the source file.
+        """
+        start = max(offset - transfer.RESUME_CHECK_SIZE, 0)
+
+        with self.open_at(file_path, start) as file_obj:
+            data = transfer.read_exactly(file_obj, offset - start)
+
+        return data == read_src(start, offset - start)
+
+    def copy_within(self, src_path, dest_path):
+        """Copies a file within the hooks file system, without transferring
+        the file contents through the client.
+
+        Hooks that support server-side copies should override this method.
+
+        :param str src_path: Path of the file to copy.
+        :param str dest_path: Path to copy the file to.
+
+        :raises NotSupportedError: If the file system does not support
+            server-side copies.
+        """
+        raise NotSupportedError(
+            "{} does not support server-side copies".format(type(self).__name__)
+        )
+
+    def _is_same_fs(self, other):
+        """Checks if another hook points to the same file system (and connection)."""
+        return type(self) is type(other) and (
+            getattr(self, "_conn_id", None) == getattr(other, "_conn_id", None)
+        )
+
+
+class DirEntry(namedtuple("DirEntry", ["name", "type", "size", "mtime", "etag"])):
+    """Entry of a directory listing, as returned by `FsHook.scandir`.
+
+    :param str name: Name of the entry (relative to the listed directory).
+    :param str type: Type of the entry, either 'file' or 'directory'.
+    :param int size: Size of the entry in bytes (None if unknown).
+    :param float mtime: Modification time of the entry as a POSIX
+        timestamp (None if unknown).
+    :param str etag: Entity tag (e.g. checksum) of the entry's contents, as
+        provided by the file system (None if unknown).
+    """
+
+    __slots__ = ()
+
+    # pylint: disable=redefined-builtin,too-many-arguments
+    def __new__(cls, name, type, size, mtime, etag=None):
+        return super(DirEntry, cls).__new__(cls, name, type, size, mtime, etag)
+
+    def is_dir(self):
+        """Returns True if the entry is a directory."""
+        return self.type == "directory"
 
 
 class NotSupportedError(NotImplementedError):
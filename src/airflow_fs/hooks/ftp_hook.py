@@ -1,7 +1,11 @@
 """File system hook for the FTP file system."""
 
 from builtins import super
+import contextlib
 import ftplib
+import posixpath
+import stat
+import threading
 
 try:
     import ftputil
@@ -10,70 +14,208 @@ except ImportError:
     ftputil, ftp_session = None, None
 
 from . import FsHook
+from .fs_hook import DirEntry
+from .pool import ConnectionPool
 
 
 class FtpHook(FsHook):
-    """Hook for interacting with files over FTP."""
+    """Hook for interacting with files over FTP.
 
-    def __init__(self, conn_id):
-        super().__init__()
+    FTP allows only one transfer per session (control connection), so by
+    default all calls share a single session. If `max_sessions` is given,
+    each thread using the hook gets its own session instead, allowing
+    threads to list and transfer files concurrently. Files opened by a
+    thread keep its session until they are closed.
+
+    Note that each session has its own cache of directory listings, so
+    changes made by one thread may not be visible to other threads until
+    their cached listings expire.
+
+    :param str conn_id: Connection ID to use.
+    :param pool: ConnectionPool to take connections from (see `FsHook`).
+        Not used for the sessions of threads if `max_sessions` is given.
+    :param int max_sessions: Maximum number of sessions to open when the
+        hook is used from multiple threads. Threads wait for a session to
+        become available if all sessions are in use.
+    """
+
+    def __init__(self, conn_id, pool=None, max_sessions=None):
+        super().__init__(pool=pool)
         self._conn_id = conn_id
         self._conn = None
 
+        self._max_sessions = max_sessions
+        self._sessions = None
+        self._local = None
+        self._reset_sessions()
+
     def get_conn(self):
         if ftputil is None:
             raise ImportError("ftputil must be installed to use the FtpHook")
 
         if self._conn is None:
-            config = self.get_connection(self._conn_id)
+            self._conn = self._checkout_conn()
+
+        return self._conn
 
-            secure = config.extra_dejson.get('tls', False)
-            base_class = ftplib.FTP_TLS if secure else ftplib.FTP
+    def _connect(self):
+        config = self.get_connection(self._conn_id)
 
-            session_factory = ftp_session.session_factory(
-                base_class=base_class,
-                port=config.port or 21,
-                encrypt_data_channel=secure)
+        secure = config.extra_dejson.get('tls', False)
+        base_class = ftplib.FTP_TLS if secure else ftplib.FTP
 
-            self._conn = ftputil.FTPHost(
-                config.host,
-                config.login,
-                config.password,
-                session_factory=session_factory)
+        session_factory = ftp_session.session_factory(
+            base_class=base_class,
+            port=config.port or 21,
+            encrypt_data_channel=secure)
 
-        return self._conn
+        return ftputil.FTPHost(
+            config.host,
+            config.login,
+            config.password,
+            session_factory=session_factory)
+
+    @staticmethod
+    def _close_conn(conn):
+        conn.close()
+
+    @staticmethod
+    def _is_alive(conn):
+        try:
+            conn.keep_alive()
+            return True
+        except Exception:  # pylint: disable=broad-except
+            return False
 
     def disconnect(self):
         if self._conn is not None:
-            self._conn.close()
+            self._checkin_conn(self._conn)
             self._conn = None
 
+        if self._sessions is not None:
+            # Sessions still in use (e.g. by open files) are closed once they
+            # are released, later calls use new sessions.
+            sessions = self._sessions
+            self._reset_sessions()
+            sessions.close()
+
+    def clone(self):
+        hook = super().clone()
+        hook._reset_sessions()  # pylint: disable=protected-access
+        return hook
+
+    def _reset_sessions(self):
+        """Starts with a new (empty) set of sessions for threads."""
+        self._local = threading.local()
+        if self._max_sessions is not None:
+            self._sessions = ConnectionPool(max_size=self._max_sessions)
+
+    def _serialize_kwargs(self):
+        return {"conn_id": self._conn_id, "max_sessions": self._max_sessions}
+
+    @contextlib.contextmanager
+    def _session(self):
+        """Context manager providing the session (FTPHost) to use for the
+        current thread. Nested uses within a thread share the same session.
+        """
+        host, state = self._acquire_session()
+        try:
+            yield host
+        finally:
+            self._release_session(state)
+
+    def _acquire_session(self):
+        """Returns the session of the current thread (checking out a new
+        session if the thread has none) and its state, which should be
+        passed to `_release_session` once the session is no longer used.
+        """
+
+        if self._sessions is None:
+            return self.get_conn(), None
+
+        if ftputil is None:
+            raise ImportError("ftputil must be installed to use the FtpHook")
+
+        state = getattr(self._local, "session", None)
+        if state is None or not state.acquire():
+            sessions = self._sessions
+            host = sessions.checkout(
+                self._pool_key(),
+                self._connect,
+                close=self._close_conn,
+                is_alive=self._is_alive,
+            )
+            state = self._local.session = _SessionState(host, sessions)
+
+        return state.host, state
+
+    def _release_session(self, state):
+        if state is not None and state.release():
+            # Returns the session to the pool it came from, which closes it
+            # if the hook was disconnected in the meantime.
+            state.sessions.checkin(self._pool_key(), state.host, close=self._close_conn)
+
     def open(self, file_path, mode='rb'):
-        return self.get_conn().open(file_path, mode=mode)
+        return self._open(file_path, mode=mode)
+
+    def open_at(self, file_path, offset):
+        # FTP files can't seek, so start the transfer at the offset (REST).
+        return self._open(file_path, mode="rb", rest=offset or None)
+
+    def _open(self, file_path, **kwargs):
+        host, state = self._acquire_session()
+        try:
+            file_obj = host.open(file_path, **kwargs)
+        except Exception:
+            self._release_session(state)
+            raise
+        return _SessionFile(file_obj, lambda: self._release_session(state))
 
     def isdir(self, path):
-        return self.get_conn().path.isdir(path)
+        with self._session() as client:
+            return client.path.isdir(path)
 
     def exists(self, file_path):
-        return self.get_conn().path.exists(file_path)
+        with self._session() as client:
+            return client.path.exists(file_path)
 
     def mkdir(self, dir_path, mode=0o755, exist_ok=True):
         if self.exists(dir_path):
             if not exist_ok:
                 self._raise_dir_exists(dir_path)
         else:
-            client = self.get_conn()
-            client.mkdir(dir_path)
-            client.chmod(dir_path, mode=mode)
+            with self._session() as client:
+                client.mkdir(dir_path)
+                client.chmod(dir_path, mode=mode)
 
     def listdir(self, dir_path):
-        return self.get_conn().listdir(dir_path)
+        with self._session() as client:
+            return client.listdir(dir_path)
+
+    def scandir(self, dir_path):
+        # ftputil caches the results of the directory listing used by stat,
+        # so stat calls for entries in the same directory don't hit the server.
+        with self._session() as client:
+            entries = []
+            for name in client.listdir(dir_path):
+                stat_result = client.stat(posixpath.join(dir_path, name))
+                entries.append(
+                    DirEntry(
+                        name=name,
+                        type="directory" if stat.S_ISDIR(stat_result.st_mode) else "file",
+                        size=stat_result.st_size,
+                        mtime=stat_result.st_mtime,
+                    )
+                )
+            return entries
 
     def rm(self, file_path):
-        self.get_conn().remove(file_path)
+        with self._session() as client:
+            client.remove(file_path)
 
     def rmtree(self, dir_path):
-        self.get_conn().rmtree(dir_path, ignore_errors=False)
+        with self._session() as client:
+            client.rmtree(dir_path, ignore_errors=False)
 
     # Overridden default implementations.
 
@@ -82,10 +224,73 @@ class FtpHook(FsHook):
             if not exist_ok:
                 self._raise_dir_exists(dir_path)
         else:
-            client = self.get_conn()
-            client.makedirs(dir_path)
-            client.chmod(dir_path, mode=mode)
+            with self._session() as client:
+                client.makedirs(dir_path)
+                client.chmod(dir_path, mode=mode)
+
+    def size(self, file_path):
+        with self._session() as client:
+            return client.path.getsize(file_path)
 
     def walk(self, root):
-        for tup in self.get_conn().walk(root):
-            yield tup
+        with self._session() as client:
+            for tup in client.walk(root):
+                yield tup
+
+
+class _SessionState(object):
+    """Tracks the number of users of a session held by a thread. Files may be
+    closed from other threads, so the count is protected by a lock.
+    """
+
+    def __init__(self, host, sessions):
+        self.host = host
+        self.sessions = sessions
+        self._users = 1
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Adds a user, returning False if the session was already released."""
+        with self._lock:
+            if self._users == 0:
+                return False
+            self._users += 1
+            return True
+
+    def release(self):
+        """Removes a user, returning True if the session is no longer used."""
+        with self._lock:
+            self._users -= 1
+            return self._users == 0
+
+
+class _SessionFile(object):
+    """Wraps a file opened using a session, releasing the session once
+    the file is closed.
+    """
+
+    def __init__(self, file_obj, release):
+        self._file_obj = file_obj
+        self._release = release
+
+    def close(self):
+        """Closes the file and releases its session."""
+
+        if self._release is not None:
+            try:
+                self._file_obj.close()
+            finally:
+                release, self._release = self._release, None
+                release()
+
+    def __getattr__(self, name):
+        return getattr(self._file_obj, name)
+
+    def __iter__(self):
+        return iter(self._file_obj)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -2,99 +2,68 @@
 
 from builtins import super
 
-try:
-    from pyarrow import hdfs
-except ImportError:
-    hdfs = None
-
-from . import FsHook
-
-
-class HdfsHook(FsHook):
-    """Hook for interacting with files over HDFS."""
-
-    def __init__(self, conn_id=None):
-        super().__init__()
+from .arrow_hook import ArrowFsHook, pafs
+
+
+class HdfsHook(ArrowFsHook):
+    """Hook for interacting with files over HDFS, using the HadoopFileSystem
+    of PyArrow (which requires libhdfs, see the PyArrow documentation).
+
+    Note that PyArrow does not support setting permissions, the `mode` of
+    `mkdir` and `makedirs` is therefore ignored (directories are created
+    with the default permissions of the cluster). The 'driver' extra of
+    connections used by earlier versions is also ignored, as libhdfs is
+    always used. A warning is logged in both cases.
+
+    :param str conn_id: Connection ID to use. If not given, the default
+        HDFS configuration is used. The extra field of the connection may
+        contain a 'kerb_ticket' (path to the Kerberos ticket cache) and
+        'extra_conf' (dict of additional Hadoop configuration values).
+    :param int buffer_size: Size (in bytes) of the buffers used by opened
+        streams (see `ArrowFsHook`).
+    :param pool: ConnectionPool to take connections from (see `FsHook`).
+    """
+
+    def __init__(self, conn_id=None, buffer_size=None, pool=None):
+        super().__init__(buffer_size=buffer_size, pool=pool)
         self._conn_id = conn_id
-        self._conn = None
-
-    def get_conn(self):
-        if hdfs is None:
-            raise ImportError("hdfs3 must be installed to use the HdfsHook")
-
-        if self._conn is None:
-            if self._conn_id is None:
-                self._conn = hdfs.connect()
-            else:
-                config = self.get_connection(self._conn_id)
-                config_extra = config.extra_dejson
-
-                # Build connection.
-                self._conn = hdfs.connect(
-                    host=config.host or "default",
-                    port=config.port or 0,
-                    user=config.login,
-                    driver=config_extra.get("driver", "libhdfs"),
-                    extra_conf=config_extra.get("extra_conf", None),
-                )
-
-        return self._conn
-
-    def disconnect(self):
-        self._conn = None
 
-    def open(self, file_path, mode="rb"):
-        return self.get_conn().open(file_path, mode=mode)
+    def _serialize_kwargs(self):
+        kwargs = {"conn_id": self._conn_id}
+        if self._buffer_size is not None:
+            kwargs["buffer_size"] = self._buffer_size
+        return kwargs
 
-    def exists(self, file_path):
-        return self.get_conn().exists(file_path)
+    def _connect(self):
+        if self._conn_id is None:
+            return pafs.HadoopFileSystem("default", port=0)
 
-    def isdir(self, path):
-        info = self.get_conn().info(path)
-        return info["kind"] == "directory"
+        config = self.get_connection(self._conn_id)
+        config_extra = config.extra_dejson
 
-    def listdir(self, dir_path):
-        return [
-            self._strip_prefix(path_, parent=dir_path)
-            for path_ in self.get_conn().ls(dir_path)
-        ]
+        if "driver" in config_extra:
+            self.log.warning(
+                "Ignoring the 'driver' extra of connection %s, the HdfsHook "
+                "always uses libhdfs", self._conn_id)
 
-    def mkdir(self, dir_path, mode=0e755, exist_ok=True):
-        self.makedirs(dir_path, mode=mode, exist_ok=exist_ok)
+        return pafs.HadoopFileSystem(
+            config.host or "default",
+            port=config.port or 0,
+            user=config.login,
+            kerb_ticket=config_extra.get("kerb_ticket", None),
+            extra_conf=config_extra.get("extra_conf", None),
+        )
 
-    @staticmethod
-    def _strip_prefix(path_, parent="/"):
-        """Strips 'file:' prefix and (optional) parent dir from file path."""
-
-        stripped = path_.split(":")[-1]
-
-        if not parent.endswith("/"):
-            parent = parent + "/"
-
-        if stripped.startswith(parent):
-            stripped = stripped[len(parent) :]
-
-        return stripped
-
-    def rm(self, file_path):
-        self.get_conn().delete(file_path, recursive=False)
-
-    def rmtree(self, dir_path):
-        self.get_conn().delete(dir_path, recursive=True)
-
-    # Overridden default implementations.
+    def mkdir(self, dir_path, mode=0o755, exist_ok=True):
+        self._warn_mode(mode)
+        super().mkdir(dir_path, mode=mode, exist_ok=exist_ok)
 
     def makedirs(self, dir_path, mode=0o755, exist_ok=True):
-        conn = self.get_conn()
-
-        if conn.exists(dir_path):
-            if not exist_ok:
-                self._raise_dir_exists(dir_path)
-        else:
-            # mkdir is recursive by default.
-            conn.mkdir(dir_path)
-            conn.chmod(dir_path, mode=mode)
-
-    def walk(self, root):
-        for tup in self.get_conn().walk(root):
-            yield tup
+        self._warn_mode(mode)
+        super().makedirs(dir_path, mode=mode, exist_ok=exist_ok)
+
+    def _warn_mode(self, mode):
+        if mode != 0o755:
+            self.log.warning(
+                "Ignoring mode %s, the HdfsHook creates directories with the "
+                "default permissions of the cluster", oct(mode))
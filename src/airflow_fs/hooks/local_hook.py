@@ -1,23 +1,97 @@
 """File system hook for the local file system."""
 
 from builtins import open, str
+import errno
+import io
+import mmap
 import os
 import shutil
+from stat import S_ISREG
+import sys
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 from . import FsHook
+from .fs_hook import DirEntry, NotSupportedError
+
+# ioctl request for cloning a file (FICLONE), as defined in linux/fs.h.
+_FICLONE = 0x40049409
+
+# Buffer size used for the fallback (userspace) copy.
+_BUFFER_SIZE = 1024 * 1024
+
+# Number of bytes read from a memory map after which the pages that were read
+# are released again (see MmapFile), which keeps them from adding up in the
+# resident memory of the process.
+_MMAP_RELEASE_SIZE = 64 * 1024 * 1024
+
+# Errors indicating that a copy method is not supported for the given files
+# (e.g. when copying across file systems), in which case we fall back to the
+# next method.
+_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EBADF,
+    errno.EOPNOTSUPP,
+    getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+}
 
 
 class LocalHook(FsHook):
-    """Hook for interacting with local files on the local file system."""
+    """Hook for interacting with local files on the local file system.
+
+    :param bool mmap_reads: Whether files opened for reading in binary mode
+        ('rb') are memory-mapped (see `open_mmap`). This mainly benefits
+        copies of large files to other file systems, as data is then written
+        to the destination straight from the memory map. Empty files and
+        special files (such as FIFOs) are opened as regular files.
+    :param pool: ConnectionPool to take connections from (see `FsHook`).
+        Accepted for consistency with the other hooks, as local files
+        don't use connections.
+    """
 
     sep = os.sep
 
+    def __init__(self, mmap_reads=False, pool=None):
+        super(LocalHook, self).__init__(pool=pool)
+        self._mmap_reads = mmap_reads
+
+    def _serialize_kwargs(self):
+        return {"mmap_reads": self._mmap_reads} if self._mmap_reads else {}
+
     def get_conn(self):
         return None
 
     def open(self, file_path, mode="rb"):
+        if self._mmap_reads and mode == "rb" and _is_mappable(str(file_path)):
+            try:
+                return self.open_mmap(file_path)
+            except NotSupportedError:
+                pass
         return open(str(file_path), mode=mode)
 
+    def open_mmap(self, file_path):
+        """Opens a file for reading using a memory map.
+
+        Besides the usual read methods, the returned `MmapFile` provides a
+        `read_view` method returning slices of the memory map, which copies
+        (see `FsHook.copy_fileobj`) pass to the destination without copying
+        the data into intermediate buffers.
+
+        :param str file_path: Path of the file to open.
+
+        :rtype: MmapFile
+        :raises NotSupportedError: If the file is empty or not a regular file
+            (e.g. a FIFO), or on Python 2, which can't create memoryviews of
+            memory maps. `open` falls back to a regular file in these cases.
+        """
+        return MmapFile(str(file_path))
+
     def exists(self, file_path):
         return os.path.exists(str(file_path))
 
@@ -34,6 +108,28 @@ class LocalHook(FsHook):
     def listdir(self, dir_path):
         return os.listdir(dir_path)
 
+    def scandir(self, dir_path):
+        if not hasattr(os, "scandir"):
+            # Python < 3.5.
+            return super(LocalHook, self).scandir(dir_path)
+
+        entries = []
+        for entry in os.scandir(str(dir_path)):
+            try:
+                status = entry.stat()
+            except OSError:
+                # Broken symlink, which is listed using its own metadata.
+                status = entry.stat(follow_symlinks=False)
+            entries.append(
+                DirEntry(
+                    name=entry.name,
+                    type="directory" if entry.is_dir() else "file",
+                    size=status.st_size,
+                    mtime=status.st_mtime,
+                )
+            )
+        return entries
+
     def rm(self, file_path):
         os.unlink(str(file_path))
 
@@ -42,6 +138,54 @@ class LocalHook(FsHook):
 
     # Overridden default implementations.
 
+    def copy_within(self, src_path, dest_path):
+        src_path, dest_path = str(src_path), str(dest_path)
+
+        if os.path.exists(dest_path) and os.path.samefile(src_path, dest_path):
+            raise IOError(
+                errno.EINVAL,
+                "{!r} and {!r} are the same file".format(src_path, dest_path),
+            )
+
+        with open(src_path, "rb", buffering=0) as src_file, \
+                open(dest_path, "wb", buffering=0) as dest_file:
+            size = os.fstat(src_file.fileno()).st_size
+
+            for method_name, method in _COPY_METHODS:
+                try:
+                    method(src_file, dest_file, size)
+                except NotSupportedError:
+                    continue
+                except OSError as exc:
+                    if exc.errno not in _FALLBACK_ERRNOS:
+                        raise
+                    # Discard any partially copied data before falling back.
+                    dest_file.seek(0)
+                    dest_file.truncate()
+                    continue
+
+                self.log.debug(
+                    "Copied %s to %s using %s", src_path, dest_path, method_name
+                )
+                break
+
+    def size(self, file_path):
+        return os.path.getsize(str(file_path))
+
+    def resume_offset(self, file_path):
+        if not os.path.exists(str(file_path)):
+            return 0
+        return os.path.getsize(str(file_path))
+
+    def open_resume(self, file_path, offset):
+        if offset == 0:
+            return open(str(file_path), "wb")
+
+        file_obj = open(str(file_path), "r+b")
+        file_obj.truncate(offset)
+        file_obj.seek(offset)
+        return file_obj
+
     def makedirs(self, dir_path, mode=0o755, exist_ok=True):
         if os.path.exists(dir_path):
             if not exist_ok:
@@ -52,3 +196,201 @@ class LocalHook(FsHook):
     def walk(self, root):
         for tup in os.walk(root):
             yield tup
+
+
+class MmapFile(io.RawIOBase):
+    """Read-only binary file backed by a memory map of a local file.
+
+    Besides regular reads, `read_view` returns memoryview slices of the map,
+    which are only valid while the file is open. On Python 3.8+, the kernel
+    is advised that the map is read sequentially (so that it reads ahead) and
+    pages that have been read are released periodically (these are read
+    from the file again if they are accessed later on).
+
+    :param str file_path: Path of the file to map.
+    """
+
+    def __init__(self, file_path):
+        if sys.version_info[0] < 3:
+            raise NotSupportedError("Memory-mapped reads require Python 3")
+
+        super(MmapFile, self).__init__()
+
+        self.name = file_path
+        self._file = open(file_path, "rb", buffering=0)
+        self._position = 0
+        self._released = 0
+
+        try:
+            # Special files (e.g. FIFOs or files in /proc) can't be mapped or
+            # report a size of 0, as do empty files (which can't be mapped).
+            status = os.fstat(self._file.fileno())
+            if not S_ISREG(status.st_mode) or not status.st_size:
+                raise NotSupportedError(
+                    "Only non-empty regular files can be memory-mapped: "
+                    "{}".format(file_path))
+
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(self._mmap, "madvise"):
+                self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+            self._view = memoryview(self._mmap)
+        except Exception:
+            self._file.close()
+            # Marks the file as closed, so that it isn't closed again (by
+            # our close method) when it is garbage collected.
+            super(MmapFile, self).close()
+            raise
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def read_view(self, size=-1):
+        """Reads (at most) size bytes, returned as a memoryview of the map."""
+
+        self._check_closed()
+        self._release_read_pages()
+
+        end = len(self._view)
+        if size is not None and size >= 0:
+            end = min(self._position + size, end)
+
+        view = self._view[self._position:end]
+        self._position = max(self._position, end)
+        return view
+
+    def read(self, size=-1):
+        return self.read_view(size).tobytes()
+
+    def readall(self):
+        return self.read()
+
+    def readinto(self, buffer_):
+        view = self.read_view(memoryview(buffer_).nbytes)
+        buffer_[:len(view)] = view
+        return len(view)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._check_closed()
+
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        elif whence != io.SEEK_SET:
+            raise ValueError("Invalid whence ({})".format(whence))
+
+        if offset < 0:
+            raise ValueError("Negative seek position {}".format(offset))
+
+        self._position = offset
+        return offset
+
+    def tell(self):
+        self._check_closed()
+        return self._position
+
+    def close(self):
+        if self.closed:
+            return
+
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views returned by read_view are still referenced, the map
+            # is closed once these are garbage collected.
+            pass
+        self._file.close()
+
+        super(MmapFile, self).close()
+
+    def _release_read_pages(self):
+        if (not hasattr(self._mmap, "madvise")
+                or not hasattr(mmap, "MADV_DONTNEED")
+                or self._position - self._released < _MMAP_RELEASE_SIZE):
+            return
+
+        end = self._position - self._position % mmap.PAGESIZE
+        self._mmap.madvise(mmap.MADV_DONTNEED, self._released, end - self._released)
+        self._released = end
+
+    def _check_closed(self):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+
+def _is_mappable(file_path):
+    """Checks if a file is a non-empty regular file, which can be mapped.
+
+    Checked before opening the file, as opening special files (e.g. FIFOs)
+    can have side effects.
+    """
+    try:
+        status = os.stat(file_path)
+    except OSError:
+        return False
+    return S_ISREG(status.st_mode) and status.st_size > 0
+
+
+# Methods for copying local files, in the order in which they are tried. Each
+# method takes an (unbuffered) source and destination file, together with the
+# size of the source file.
+
+
+def _copy_reflink(src_file, dest_file, size):
+    """Clones the file using a reflink (copy-on-write file systems only)."""
+    # pylint: disable=unused-argument
+    if fcntl is None or not sys.platform.startswith("linux"):
+        raise NotSupportedError("Reflinks are only supported on Linux")
+    fcntl.ioctl(dest_file.fileno(), _FICLONE, src_file.fileno())
+
+
+def _copy_file_range(src_file, dest_file, size):
+    """Copies the file in-kernel using copy_file_range."""
+
+    if not hasattr(os, "copy_file_range"):
+        raise NotSupportedError("copy_file_range requires Python 3.8+ on Linux")
+
+    offset = 0
+    while offset < size:
+        copied = os.copy_file_range(
+            src_file.fileno(), dest_file.fileno(), size - offset, offset, offset
+        )
+        if copied == 0:
+            break
+        offset += copied
+
+
+def _copy_sendfile(src_file, dest_file, size):
+    """Copies the file in-kernel using sendfile."""
+
+    if not hasattr(os, "sendfile") or not sys.platform.startswith("linux"):
+        raise NotSupportedError("sendfile between files is only supported on Linux")
+
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dest_file.fileno(), src_file.fileno(), offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+
+
+def _copy_buffered(src_file, dest_file, size):
+    """Copies the file through a userspace buffer."""
+    # pylint: disable=unused-argument
+    src_file.seek(0)
+    shutil.copyfileobj(src_file, dest_file, _BUFFER_SIZE)
+
+
+_COPY_METHODS = [
+    ("reflink", _copy_reflink),
+    ("copy_file_range", _copy_file_range),
+    ("sendfile", _copy_sendfile),
+    ("buffered", _copy_buffered),
+]
@@ -0,0 +1,179 @@
+"""Pool for sharing file system connections between hooks in a process."""
+
+import logging
+import threading
+import time
+
+_LOG = logging.getLogger(__name__)
+
+
+class ConnectionPool(object):
+    """Thread-safe pool of connections, keyed by hook class and connection ID.
+
+    Hooks check connections out of the pool when they connect and check them
+    back in when they disconnect, so that connections (and their SSH/TLS
+    handshakes) are reused by tasks and sensor pokes running in the same
+    process. Connections are health-checked when they are checked out and
+    idle connections (of any key) are closed after `max_idle` seconds.
+
+    :param int max_size: Maximum number of connections (both idle and checked
+        out) per key. Checkouts beyond this number block until a connection
+        is checked back in.
+    :param float max_idle: Time (in seconds) after which idle connections
+        are closed.
+    :param float timeout: Maximum time (in seconds) to wait for a connection
+        if the pool is exhausted, after which a PoolTimeoutError is raised.
+        Waits indefinitely if None.
+    """
+
+    def __init__(self, max_size=4, max_idle=300, timeout=60):
+        self._max_size = max_size
+        self._max_idle = max_idle
+        self._timeout = timeout
+
+        self._idle = {}  # key -> [(conn, close_func, last_used)]
+        self._sizes = {}  # key -> number of connections (idle + checked out)
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def checkout(self, key, connect, close=None, is_alive=None):
+        """Checks out a connection for the given key.
+
+        :param key: Key identifying the connection (e.g. hook class and conn_id).
+        :param connect: Function creating a new connection.
+        :param close: Function closing a connection, used when connections
+            are evicted or fail their health check.
+        :param is_alive: Function checking if an idle connection is still usable.
+        """
+
+        deadline = None if self._timeout is None else time.time() + self._timeout
+        conn = None
+        waiting = False
+
+        self._evict_idle()
+
+        with self._cond:
+            while True:
+                if self._idle.get(key):
+                    conn, _, _ = self._idle[key].pop()
+                    break
+
+                if self._sizes.get(key, 0) < self._max_size:
+                    self._sizes[key] = self._sizes.get(key, 0) + 1
+                    break
+
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise PoolTimeoutError(
+                        "Timed out after {}s waiting for a connection for {!r}, "
+                        "as all {} connections are checked out. Increase the "
+                        "max_size of the pool or make sure hooks disconnect "
+                        "when they are done.".format(self._timeout, key, self._max_size)
+                    )
+
+                if not waiting:
+                    _LOG.info(
+                        "All %d connections for %r are checked out, waiting "
+                        "for a connection to be checked in", self._max_size, key)
+                    waiting = True
+
+                self._cond.wait(remaining)
+
+        if conn is not None:
+            if is_alive is None or _safe_call(is_alive, conn, default=False):
+                return conn
+            _safe_call(close, conn)
+
+        try:
+            return connect()
+        except Exception:
+            self._release(key)
+            raise
+
+    def checkin(self, key, conn, close=None, discard=False):
+        """Returns a checked out connection to the pool.
+
+        :param key: Key the connection was checked out for.
+        :param conn: The connection.
+        :param close: Function for closing the connection once evicted.
+        :param bool discard: Close the connection instead of keeping it
+            (connections are always closed if the pool is closed).
+        """
+
+        with self._cond:
+            keep = not (discard or self._closed)
+            if keep:
+                self._idle.setdefault(key, []).append((conn, close, time.time()))
+                self._cond.notify()
+
+        if not keep:
+            _safe_call(close, conn)
+            self._release(key)
+
+    def available(self, key):
+        """Returns the number of connections that can be checked out for the
+        given key without waiting (idle connections and free slots)."""
+
+        with self._cond:
+            return (
+                self._max_size - self._sizes.get(key, 0) + len(self._idle.get(key, []))
+            )
+
+    def clear(self):
+        """Closes all idle connections in the pool."""
+        self._evict_idle(max_idle=-1)
+
+    def close(self):
+        """Closes all idle connections and closes connections that are still
+        checked out once they are checked in, rather than keeping them."""
+
+        with self._cond:
+            self._closed = True
+        self.clear()
+
+    def _evict_idle(self, max_idle=None):
+        """Closes idle connections (of all keys) that were not used for
+        max_idle seconds."""
+
+        max_idle = self._max_idle if max_idle is None else max_idle
+        threshold = time.time() - max_idle
+        evicted = []
+
+        with self._cond:
+            for key, idle in self._idle.items():
+                expired = [entry for entry in idle if entry[2] < threshold]
+                if expired:
+                    self._idle[key] = [entry for entry in idle if entry[2] >= threshold]
+                    self._sizes[key] -= len(expired)
+                    evicted.extend(expired)
+
+            if evicted:
+                self._cond.notify_all()
+
+        for conn, close, _ in evicted:
+            _safe_call(close, conn)
+
+    def _release(self, key):
+        with self._cond:
+            self._sizes[key] -= 1
+            self._cond.notify()
+
+
+class PoolTimeoutError(Exception):
+    """Exception raised when no connection becomes available in time."""
+
+
+def _safe_call(func, conn, default=None):
+    """Calls func on the connection, ignoring any errors."""
+
+    if func is None:
+        return True
+
+    try:
+        return func(conn)
+    except Exception:  # pylint: disable=broad-except
+        return default
+
+
+#: Process-wide connection pool, used by hooks created with `pool=True`.
+default_pool = ConnectionPool()
@@ -1,50 +1,160 @@
 """File system hook for the S3 file system."""
 
 from builtins import super
+import calendar
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import hashlib
 import posixpath
+import re
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+except ImportError:
+    boto3, TransferConfig = None, None
 
 try:
     import s3fs
 except ImportError:
     s3fs = None
 
+from airflow_fs import transfer
+
 from . import FsHook
+from .fs_hook import DirEntry
+
+# Minimum size (in bytes) of all but the last part of a multipart upload.
+_MIN_PART_SIZE = 5 * 1024 * 1024
+
+# Maximum number of keys per DeleteObjects request.
+_MAX_DELETE_KEYS = 1000
+
+_MD5_PATTERN = re.compile("^[0-9a-f]{32}$")
 
 
 class S3Hook(FsHook):
-    """Hook for interacting with files in S3."""
+    """Hook for interacting with files in S3.
+
+    :param str conn_id: Connection ID to use. If not given, credentials are
+        taken from the environment.
+    :param int part_size: Size (in bytes) of the parts used for multipart
+        uploads in `copy` and `copy_fileobj`. Setting `part_size` or
+        `max_concurrency` enables uploading parts concurrently, using
+        at most `part_size * max_concurrency` bytes of memory for buffered
+        parts. Failed uploads are aborted. Defaults to 8 MiB.
+    :param int max_concurrency: Maximum number of parts to upload concurrently.
+        Defaults to 10.
+    :param pool: ConnectionPool to take connections from (see `FsHook`).
 
-    def __init__(self, conn_id=None):
-        super().__init__()
+    Resumable copies (see `FsHook.copy`) are written as multipart uploads
+    which are left incomplete if the copy fails, so that a retry can resume
+    them. Consider a bucket lifecycle rule for aborting incomplete multipart
+    uploads that are never resumed.
+    """
+
+    default_part_size = 8 * 1024 * 1024
+    default_max_concurrency = 10
+
+    def __init__(self, conn_id=None, part_size=None, max_concurrency=None,
+                 pool=None):
+        super().__init__(pool=pool)
         self._conn_id = conn_id
+        self._part_size = part_size
+        self._max_concurrency = max_concurrency
         self._conn = None
+        self._client = None
+        self._config = None
 
     def get_conn(self):
         if s3fs is None:
             raise ImportError("s3fs must be installed to use the S3Hook")
 
         if self._conn is None:
-            if self._conn_id is None:
-                self._conn = s3fs.S3FileSystem()
-            else:
+            self._conn = self._checkout_conn()
+
+        return self._conn
+
+    def _connect(self):
+        if self._conn_id is None:
+            return s3fs.S3FileSystem()
+
+        config = self._get_config()
+        return s3fs.S3FileSystem(
+            key=config["key"],
+            secret=config["secret"],
+            s3_additional_kwargs=config["extra_kwargs"],
+        )
+
+    def _get_client(self):
+        """Returns a boto3 S3 client, used for (managed) transfers."""
+
+        if boto3 is None:
+            raise ImportError("boto3 must be installed to use the S3Hook")
+
+        if self._client is None:
+            self._client = self._checkout_conn(self._connect_client, kind="client")
+
+        return self._client
+
+    def _connect_client(self):
+        config = self._get_config()
+        return boto3.client(
+            "s3",
+            aws_access_key_id=config["key"],
+            aws_secret_access_key=config["secret"],
+        )
+
+    def _get_config(self):
+        """Returns the credentials and extra S3 arguments for the connection."""
+
+        if self._config is None:
+            self._config = {"key": None, "secret": None, "extra_kwargs": {}}
+
+            if self._conn_id is not None:
                 config = self.get_connection(self._conn_id)
 
-                extra_kwargs = {}
+                self._config["key"] = config.login
+                self._config["secret"] = config.password
+
                 if "encryption" in config.extra_dejson:
-                    extra_kwargs["ServerSideEncryption"] = config.extra_dejson[
-                        "encryption"
-                    ]
-
-                self._conn = s3fs.S3FileSystem(
-                    key=config.login,
-                    secret=config.password,
-                    s3_additional_kwargs=extra_kwargs,
-                )
+                    self._config["extra_kwargs"]["ServerSideEncryption"] = (
+                        config.extra_dejson["encryption"]
+                    )
 
-        return self._conn
+        return self._config
+
+    def _get_transfer_config(self):
+        """Returns the TransferConfig for managed transfers."""
+
+        part_size = self._part_size or self.default_part_size
+        max_concurrency = self._max_concurrency or self.default_max_concurrency
+
+        return TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=max_concurrency,
+        )
 
     def disconnect(self):
+        if self._conn is not None:
+            self._checkin_conn(self._conn)
+        if self._client is not None:
+            self._checkin_conn(self._client, kind="client")
+
         self._conn = None
+        self._client = None
+
+    def _serialize_kwargs(self):
+        return {
+            "conn_id": self._conn_id,
+            "part_size": self._part_size,
+            "max_concurrency": self._max_concurrency,
+        }
+
+    def clone(self):
+        hook = super().clone()
+        hook._client = None  # pylint: disable=protected-access
+        return hook
 
     def open(self, file_path, mode="rb"):
         return self.get_conn().open(file_path, mode=mode)
@@ -53,17 +163,17 @@ class S3Hook(FsHook):
         return self.get_conn().exists(file_path)
 
     def isdir(self, path):
-        if "/" not in path:
+        bucket, key = _split_path(_remove_trailing_slash(path))
+
+        if not key:
             # Path looks like a bucket name.
             return True
 
-        parent_dir = posixpath.dirname(path)
-
-        for child in self.get_conn().ls(parent_dir, detail=True):
-            if child["Key"] == path and child["StorageClass"] == "DIRECTORY":
-                return True
-
-        return False
+        # Probe for any key below the path, rather than listing the parent.
+        response = self._get_client().list_objects_v2(
+            Bucket=bucket, Prefix=key + "/", MaxKeys=1
+        )
+        return bool(response.get("Contents"))
 
     def mkdir(self, dir_path, mode=0o755, exist_ok=True):
         self.makedirs(dir_path, mode=mode, exist_ok=exist_ok)
@@ -72,6 +182,19 @@ class S3Hook(FsHook):
         return [posixpath.relpath(fp, start=dir_path)
                 for fp in self.get_conn().ls(dir_path, details=False)]
 
+    def scandir(self, dir_path):
+        dir_path = _remove_trailing_slash(dir_path)
+        return [
+            DirEntry(
+                name=posixpath.relpath(info.get("name") or info["Key"], start=dir_path),
+                type="directory" if _info_isdir(info) else "file",
+                size=info.get("size", info.get("Size")),
+                mtime=_to_timestamp(info.get("LastModified")),
+                etag=_strip_etag(info.get("ETag")),
+            )
+            for info in self.get_conn().ls(dir_path, detail=True)
+        ]
+
     def rm(self, file_path):
         self.get_conn().rm(file_path, recursive=False)
 
@@ -80,6 +203,239 @@ class S3Hook(FsHook):
 
     # Overridden default implementations.
 
+    def rm_many(self, paths, recursive=False, max_workers=4):
+        # Deletes keys using DeleteObjects requests of up to 1000 keys, of which
+        # (at most) max_workers are sent concurrently. Note that, unlike `rm`,
+        # this does not fail for keys that don't exist.
+
+        client = self._get_client()
+
+        failures, dir_paths = [], set()
+        batches, pending = {}, set()
+
+        def _delete_batch(bucket, keys):
+            response = client.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+            )
+            return [
+                (bucket + "/" + error["Key"], error.get("Message"))
+                for error in response.get("Errors", [])
+            ]
+
+        def _collect(futures):
+            for future in futures:
+                pending.discard(future)
+                failures.extend(future.result())
+
+        with ThreadPoolExecutor(max_workers=max_workers or 1) as executor:
+            for bucket, key in self._iter_keys(paths, recursive=recursive):
+                dir_paths.add(posixpath.dirname(bucket + "/" + key))
+
+                batch = batches.setdefault(bucket, [])
+                batch.append(key)
+
+                if len(batch) == _MAX_DELETE_KEYS:
+                    if len(pending) >= (max_workers or 1):
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        _collect(done)
+                    pending.add(executor.submit(_delete_batch, bucket, batches.pop(bucket)))
+
+            for bucket, keys in batches.items():
+                pending.add(executor.submit(_delete_batch, bucket, keys))
+
+            done, _ = wait(pending)
+            _collect(done)
+
+        conn = self.get_conn()
+        for dir_path in dir_paths:
+            conn.invalidate_cache(dir_path)
+
+        if failures:
+            raise IOError(
+                "Failed to delete {} path(s): {}".format(
+                    len(failures),
+                    ", ".join("{} ({})".format(path, msg) for path, msg in failures),
+                )
+            )
+
+    def _iter_keys(self, paths, recursive=False):
+        """Yields (bucket, key) tuples for the given paths, or for all keys below
+        the given paths if recursive is True."""
+
+        for path in paths:
+            bucket, key = _split_path(_remove_trailing_slash(path))
+
+            if recursive:
+                prefix = key + "/" if key else ""
+                for obj in self._list_objects(bucket, prefix):
+                    yield bucket, obj["Key"]
+
+            if key:
+                yield bucket, key
+
+    def copy_within(self, src_path, dest_path):
+        # Managed copy, which uses CopyObject for small objects and parallel
+        # (multipart) UploadPartCopy requests for large objects.
+        src_bucket, src_key = _split_path(src_path)
+        dest_bucket, dest_key = _split_path(dest_path)
+
+        self._get_client().copy(
+            {"Bucket": src_bucket, "Key": src_key},
+            dest_bucket,
+            dest_key,
+            ExtraArgs=self._get_config()["extra_kwargs"] or None,
+            Config=self._get_transfer_config(),
+        )
+
+        self.get_conn().invalidate_cache(posixpath.dirname(dest_path))
+
+    def copy_fileobj(self, file_obj, dest_path, checksum=None, buffer_size=None,
+                     pipeline_depth=None):
+        if self._part_size is None and self._max_concurrency is None:
+            return super().copy_fileobj(
+                file_obj,
+                dest_path,
+                checksum=checksum,
+                buffer_size=buffer_size,
+                pipeline_depth=pipeline_depth,
+            )
+
+        if checksum is not None:
+            file_obj = transfer.HashingReader(file_obj, checksum)
+
+        # Managed (multipart) upload, which uploads parts concurrently and
+        # aborts the multipart upload if any of the parts fail. As parts are
+        # read while earlier parts are uploaded, no pipelining is needed.
+        bucket, key = _split_path(dest_path)
+
+        self._get_client().upload_fileobj(
+            file_obj,
+            bucket,
+            key,
+            ExtraArgs=self._get_config()["extra_kwargs"] or None,
+            Config=self._get_transfer_config(),
+        )
+
+        self.get_conn().invalidate_cache(posixpath.dirname(dest_path))
+
+        if checksum is None:
+            return None
+
+        digest = file_obj.hexdigest()
+        self._verify_checksum(dest_path, checksum, digest)
+        return digest
+
+    def native_checksum(self, file_path, algorithm):
+        # ETags of objects uploaded in a single part (without SSE-KMS
+        # encryption) are the MD5 digests of the objects.
+        if algorithm != "md5":
+            return None
+
+        bucket, key = _split_path(file_path)
+        response = self._get_client().head_object(Bucket=bucket, Key=key)
+
+        if (response.get("ServerSideEncryption") == "aws:kms"
+                or "SSECustomerAlgorithm" in response):
+            return None
+
+        etag = _strip_etag(response.get("ETag"))
+        return etag if etag and _MD5_PATTERN.match(etag) else None
+
+    def resume_offset(self, file_path):
+        # Partial copies are incomplete multipart uploads, of which the
+        # uploaded parts are kept when resuming.
+        upload = self._find_upload(file_path)
+        if upload is None:
+            return 0
+        return sum(part["Size"] for part in upload[1])
+
+    def open_resume(self, file_path, offset):
+        bucket, key = _split_path(file_path)
+
+        # Existing uploads are reused even when starting from the start, as
+        # its parts are replaced by parts with the same part numbers.
+        upload = self._find_upload(file_path)
+
+        if upload is None:
+            response = self._get_client().create_multipart_upload(
+                Bucket=bucket, Key=key, **self._get_config()["extra_kwargs"]
+            )
+            upload_id, parts = response["UploadId"], []
+        else:
+            upload_id, parts = upload[0], _parts_until(upload[1], offset)
+
+        return _ResumableUpload(
+            self,
+            bucket,
+            key,
+            upload_id,
+            parts,
+            part_size=max(self._part_size or self.default_part_size, _MIN_PART_SIZE),
+        )
+
+    def verify_resume(self, file_path, offset, read_src):
+        # Compares the MD5 digest of the last uploaded part to its ETag,
+        # as uploaded parts can't be read back.
+        upload = self._find_upload(file_path)
+        parts = _parts_until(upload[1], offset) if upload is not None else []
+
+        if not parts:
+            return False
+
+        etag = _strip_etag(parts[-1]["ETag"])
+        if not _MD5_PATTERN.match(etag):
+            # ETags of (e.g.) SSE-KMS encrypted parts are not MD5 digests,
+            # in which case we rely on the size check after the copy.
+            return True
+
+        size = parts[-1]["Size"]
+        return hashlib.md5(read_src(offset - size, size)).hexdigest() == etag
+
+    def _find_upload(self, file_path):
+        """Returns the upload ID and reusable parts of the most recent incomplete
+        multipart upload to the given path, or None if there is no such upload.
+
+        Parts are reusable if they are numbered consecutively (starting from
+        1) and are large enough to be followed by other parts.
+        """
+
+        bucket, key = _split_path(file_path)
+        client = self._get_client()
+
+        uploads = [
+            upload
+            for page in client.get_paginator("list_multipart_uploads").paginate(
+                Bucket=bucket, Prefix=key
+            )
+            for upload in page.get("Uploads", [])
+            if upload["Key"] == key
+        ]
+
+        if not uploads:
+            return None
+
+        upload_id = max(uploads, key=lambda upload: upload["Initiated"])["UploadId"]
+
+        parts = sorted(
+            (
+                part
+                for page in client.get_paginator("list_parts").paginate(
+                    Bucket=bucket, Key=key, UploadId=upload_id
+                )
+                for part in page.get("Parts", [])
+            ),
+            key=lambda part: part["PartNumber"],
+        )
+
+        reusable = []
+        for number, part in enumerate(parts, 1):
+            if part["PartNumber"] != number or part["Size"] < _MIN_PART_SIZE:
+                break
+            reusable.append(part)
+
+        return upload_id, reusable
+
     def makedirs(self, dir_path, mode=0o755, exist_ok=True):
         if self.exists(dir_path):
             if not exist_ok:
@@ -87,11 +443,175 @@ class S3Hook(FsHook):
         else:
             self.get_conn().mkdir(dir_path)
 
+    def size(self, file_path):
+        return self.get_conn().size(file_path)
+
     def walk(self, root):
+        # Reconstructs the tree from a single (paginated) recursive listing,
+        # rather than listing each directory separately.
         root = _remove_trailing_slash(root)
-        for entry in super().walk(root):
+        bucket, key = _split_path(root)
+
+        prefix = key + "/" if key else ""
+        entries = [
+            (obj["Key"][len(prefix):], obj["Key"].endswith("/"))
+            for obj in self._list_objects(bucket, prefix)
+        ]
+
+        if key and not entries:
+            return
+
+        for entry in self._walk_listing(root, entries):
             yield entry
 
+    def scantree(self, root):
+        # Lists the whole tree using a single (paginated) recursive listing.
+        bucket, key = _split_path(_remove_trailing_slash(root))
+        prefix = key + "/" if key else ""
+
+        for obj in self._list_objects(bucket, prefix):
+            if not obj["Key"].endswith("/"):
+                yield DirEntry(
+                    name=obj["Key"][len(prefix):],
+                    type="file",
+                    size=obj["Size"],
+                    mtime=_to_timestamp(obj["LastModified"]),
+                    etag=_strip_etag(obj["ETag"]),
+                )
+
+    supports_prefix_listing = True
+
+    def iter_prefix(self, prefix, delimiter=None):
+        bucket, key_prefix = _split_path(prefix)
+        for obj in self._list_objects(bucket, key_prefix, delimiter=delimiter):
+            yield bucket + "/" + obj["Key"]
+
+    def _list_objects(self, bucket, prefix, delimiter=None):
+        """Yields all objects in the bucket with keys starting with prefix.
+
+        Objects are returned as the dicts in the `Contents` of the (paginated)
+        ListObjectsV2 responses. If a delimiter is given, common prefixes are
+        also returned as dicts, with the prefix as `Key`.
+        """
+
+        kwargs = {"Bucket": bucket, "Prefix": prefix}
+        if delimiter is not None:
+            kwargs["Delimiter"] = delimiter
+
+        paginator = self._get_client().get_paginator("list_objects_v2")
+
+        for page in paginator.paginate(**kwargs):
+            for obj in page.get("Contents", []):
+                yield obj
+            for common_prefix in page.get("CommonPrefixes", []):
+                yield {"Key": common_prefix["Prefix"]}
+
+
+class _ResumableUpload(object):
+    """File-like object writing to a multipart upload, in parts of part_size
+    bytes. The upload is completed when the file is closed, but is left
+    incomplete (so that it can be resumed) if an error occurs while writing.
+    """
+
+    def __init__(self, hook, bucket, key, upload_id, parts, part_size):
+        self._hook = hook
+        self._bucket = bucket
+        self._key = key
+        self._upload_id = upload_id
+        self._parts = [
+            {"PartNumber": part["PartNumber"], "ETag": part["ETag"]} for part in parts
+        ]
+        self._part_size = part_size
+        self._buffer = bytearray()
+
+    def write(self, data):
+        """Writes data, uploading any full parts."""
+
+        self._buffer.extend(data)
+
+        while len(self._buffer) >= self._part_size:
+            self._upload_part(bytes(self._buffer[:self._part_size]))
+            del self._buffer[:self._part_size]
+
+    def close(self):
+        """Uploads the remaining data and completes the upload."""
+
+        if self._buffer or not self._parts:
+            self._upload_part(bytes(self._buffer))
+            self._buffer = bytearray()
+
+        # pylint: disable=protected-access
+        self._hook._get_client().complete_multipart_upload(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts},
+        )
+
+        self._hook.get_conn().invalidate_cache(
+            posixpath.dirname(self._bucket + "/" + self._key)
+        )
+
+    def _upload_part(self, data):
+        number = len(self._parts) + 1
+        # pylint: disable=protected-access
+        response = self._hook._get_client().upload_part(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=number,
+            Body=data,
+        )
+        self._parts.append({"PartNumber": number, "ETag": response["ETag"]})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+
+
+def _parts_until(parts, offset):
+    """Returns the parts that together make up the first offset bytes."""
+
+    kept, end = [], 0
+    for part in parts:
+        if end + part["Size"] > offset:
+            break
+        kept.append(part)
+        end += part["Size"]
+
+    if end != offset:
+        raise ValueError("Offset {} is not at the end of a part".format(offset))
+
+    return kept
+
+
+def _split_path(path):
+    """Splits an S3 path into its bucket and key."""
+    if path.startswith("s3://"):
+        path = path[len("s3://"):]
+    bucket, _, key = path.partition("/")
+    return bucket, key
+
+
+def _info_isdir(info):
+    """Checks if an s3fs info dict describes a directory (common prefix)."""
+    return info.get("type") == "directory" or info.get("StorageClass") == "DIRECTORY"
+
+
+def _to_timestamp(datetime_):
+    """Converts a (UTC) datetime to a POSIX timestamp."""
+    if datetime_ is None:
+        return None
+    return calendar.timegm(datetime_.utctimetuple()) + datetime_.microsecond / 1e6
+
+
+def _strip_etag(etag):
+    """Removes the quotes around an ETag."""
+    return etag.strip('"') if etag else None
+
 
 def _remove_trailing_slash(path):
     if path.endswith("/"):
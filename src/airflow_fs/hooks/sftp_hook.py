@@ -1,6 +1,15 @@
 """File system hook for the SFTP (SSH) file system."""
 
 from builtins import super
+import posixpath
+import stat
+import sys
+
+try:
+    from shlex import quote
+except ImportError:
+    # Python 2.
+    from pipes import quote  # pylint: disable=deprecated-module
 
 try:
     import pysftp
@@ -8,57 +17,86 @@ except ImportError:
     pysftp = None
 
 from . import FsHook
+from .fs_hook import DirEntry, NotSupportedError
 
+# Error handler for decoding file names listed by find, which aren't
+# necessarily valid UTF-8 (surrogateescape is only available on Python 3).
+_DECODE_ERRORS = "surrogateescape" if sys.version_info >= (3,) else "replace"
 
-class SftpHook(FsHook):
-    """Hook for interacting with files over SFTP."""
 
-    # TODO: Use walktree for a more efficient walk implementation?
-
-    def __init__(self, conn_id):
-        super().__init__()
+class SftpHook(FsHook):
+    """Hook for interacting with files over SFTP.
+
+    :param str conn_id: Connection ID to use.
+    :param bool allow_exec: Whether the hook is allowed to execute shell
+        commands on the remote host (over SSH), which is used to perform
+        some operations (such as copies and walks) server-side. Walking
+        directories this way requires GNU find on the remote host.
+    :param pool: ConnectionPool to take connections from (see `FsHook`).
+    """
+
+    def __init__(self, conn_id, allow_exec=False, pool=None):
+        super().__init__(pool=pool)
         self._conn_id = conn_id
         self._conn = None
+        self._allow_exec = allow_exec
 
     def get_conn(self):
         if pysftp is None:
             raise ImportError("pysftp must be installed to use the SftpHook")
 
         if self._conn is None:
-            params = self.get_connection(self._conn_id)
-            private_key = params.extra_dejson.get('private_key', None)
-
-            cnopts = pysftp.CnOpts()
-            if params.extra_dejson.get('ignore_hostkey_verification', False):
-                cnopts.hostkeys = None
-
-            if not private_key:
-                self._conn = pysftp.Connection(
-                    params.host,
-                    username=params.login,
-                    password=params.password,
-                    cnopts=cnopts)
-            elif private_key and params.password:
-                self._conn = pysftp.Connection(
-                    params.host,
-                    username=params.login,
-                    private_key=private_key,
-                    private_key_pass=params.password,
-                    cnopts=cnopts)
-            else:
-                self._conn = pysftp.Connection(
-                    params.host,
-                    username=params.login,
-                    private_key=private_key,
-                    cnopts=cnopts)
+            self._conn = self._checkout_conn()
 
         return self._conn
 
+    def _connect(self):
+        params = self.get_connection(self._conn_id)
+        private_key = params.extra_dejson.get('private_key', None)
+
+        cnopts = pysftp.CnOpts()
+        if params.extra_dejson.get('ignore_hostkey_verification', False):
+            cnopts.hostkeys = None
+
+        if not private_key:
+            return pysftp.Connection(
+                params.host,
+                username=params.login,
+                password=params.password,
+                cnopts=cnopts)
+        elif private_key and params.password:
+            return pysftp.Connection(
+                params.host,
+                username=params.login,
+                private_key=private_key,
+                private_key_pass=params.password,
+                cnopts=cnopts)
+        else:
+            return pysftp.Connection(
+                params.host,
+                username=params.login,
+                private_key=private_key,
+                cnopts=cnopts)
+
+    @staticmethod
+    def _close_conn(conn):
+        conn.close()
+
+    @staticmethod
+    def _is_alive(conn):
+        try:
+            return conn.sftp_client.get_channel().get_transport().is_active()
+        except Exception:  # pylint: disable=broad-except
+            return False
+
     def disconnect(self):
         if self._conn is not None:
-            self._conn.close()
+            self._checkin_conn(self._conn)
         self._conn = None
 
+    def _serialize_kwargs(self):
+        return {"conn_id": self._conn_id, "allow_exec": self._allow_exec}
+
     def open(self, file_path, mode='rb'):
         return self.get_conn().open(file_path, mode=mode)
 
@@ -78,6 +116,32 @@ class SftpHook(FsHook):
     def listdir(self, dir_path):
         return self.get_conn().listdir(dir_path)
 
+    def scandir(self, dir_path):
+        conn = self.get_conn()
+        entries = []
+
+        for attrs in conn.listdir_attr(dir_path):
+            name = attrs.filename
+
+            if stat.S_ISLNK(attrs.st_mode):
+                # Attributes are listed without following symlinks, so
+                # resolve the target (keeping broken links as files).
+                try:
+                    attrs = conn.stat(posixpath.join(dir_path, name))
+                except (IOError, OSError):
+                    pass
+
+            entries.append(
+                DirEntry(
+                    name=name,
+                    type="directory" if stat.S_ISDIR(attrs.st_mode) else "file",
+                    size=attrs.st_size,
+                    mtime=attrs.st_mtime,
+                )
+            )
+
+        return entries
+
     def rm(self, file_path):
         self.get_conn().remove(file_path)
 
@@ -90,6 +154,17 @@ class SftpHook(FsHook):
 
     # Overridden default implementations.
 
+    def copy_within(self, src_path, dest_path):
+        if not self._allow_exec:
+            raise NotSupportedError("Server-side copies require allow_exec=True")
+
+        result = self.get_conn().execute(
+            'cp -- {} {}'.format(quote(src_path), quote(dest_path)))
+
+        if result:
+            message = b'\n'.join(result)
+            raise OSError(message.decode())
+
     def makedirs(self, dir_path, mode=0o755, exist_ok=True):
         if self.exists(dir_path):
             if not exist_ok:
@@ -97,6 +172,66 @@ class SftpHook(FsHook):
         else:
             self.get_conn().makedirs(dir_path, mode=self._int_mode(mode))
 
+    def size(self, file_path):
+        return self.get_conn().stat(file_path).st_size
+
+    def resume_offset(self, file_path):
+        if not self.exists(file_path):
+            return 0
+        return self.size(file_path)
+
+    def open_resume(self, file_path, offset):
+        if offset == 0:
+            return self.open(file_path, "wb")
+
+        file_obj = self.open(file_path, "r+b")
+        file_obj.truncate(offset)
+        file_obj.seek(offset)
+        return file_obj
+
+    def walk(self, root):
+        if not self._allow_exec:
+            # Uses scandir, which lists each directory (including entry
+            # types) with a single listdir_attr call.
+            for entry in super().walk(root):
+                yield entry
+            return
+
+        # Lists the whole tree using a single remote find command (following
+        # symlinks, like the default walk), followed by its exit status (as
+        # execute only returns stderr if there is no output on stdout).
+        # Nothing is listed for a missing root directory, similar to os.walk.
+        result = self.get_conn().execute(
+            "if [ -d {root} ]; then find -L {root} -mindepth 1 -printf '%y %P\\0'; "
+            "echo $?; fi".format(root=quote(root)))
+        output = b"".join(result)
+
+        if not output:
+            return
+
+        listing, _, status = output.rpartition(b"\0")
+
+        status = status.strip()
+        if not status.isdigit():
+            # The command itself failed (e.g. missing find), in which case
+            # we receive the error message from stderr.
+            raise OSError(output.decode())
+
+        status = int(status)
+        if status != 0:
+            # Find still lists the readable part of the tree on errors
+            # (e.g. for unreadable subdirectories), which would be incomplete.
+            raise OSError(
+                "Failed to list {} (find exited with status {})".format(root, status))
+
+        entries = []
+        for record in listing.split(b"\0") if listing else []:
+            type_, rel_path = record.decode("utf-8", _DECODE_ERRORS).split(" ", 1)
+            entries.append((rel_path, type_ == "d"))
+
+        for entry in self._walk_listing(root, entries):
+            yield entry
+
     @staticmethod
     def _int_mode(mode):
         """Convert octal mode to its literal int representation."""
@@ -0,0 +1,377 @@
+"""Instrumentation recording the I/O performed by file system hooks."""
+
+import contextlib
+import functools
+import threading
+import time
+import types
+
+# Upper bounds (in seconds) of the latency histogram buckets. Calls slower
+# than the last bound are counted in an additional overflow bucket.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# Hook methods that are instrumented (if the hook has them).
+INSTRUMENTED_METHODS = (
+    "open",
+    "open_at",
+    "open_resume",
+    "exists",
+    "isdir",
+    "size",
+    "listdir",
+    "scandir",
+    "walk",
+    "scantree",
+    "glob",
+    "iglob",
+    "iter_prefix",
+    "mkdir",
+    "makedirs",
+    "rm",
+    "rmtree",
+    "rm_many",
+    "copy",
+    "copy_fileobj",
+    "copy_within",
+    "native_checksum",
+    "resume_offset",
+)
+
+# Instrumented methods returning file objects, which count bytes moved.
+_FILE_METHODS = ("open", "open_at", "open_resume")
+
+_timer = getattr(time, "perf_counter", time.time)
+
+
+class HookStats(object):
+    """Thread-safe record of the calls made to a hook and the bytes moved
+    through the files it opened.
+
+    Calls are recorded per method, including calls made internally by other
+    methods of the hook (e.g. `glob` calling `scandir`). For methods returning
+    iterators (such as `walk`), only the time spent producing items is
+    recorded, once iteration finishes.
+
+    :param str name: Name of the hook, used in summaries and as part of the
+        StatsD metric names (airflow_fs.<name>.<method>).
+    :param bool statsd: Whether to also send the recorded metrics to the
+        StatsD client of Airflow (if StatsD is enabled in Airflow).
+    """
+
+    def __init__(self, name, statsd=False):
+        self.name = name
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+        self._methods = {}
+        self._lock = threading.Lock()
+        self._statsd = _get_statsd() if statsd else None
+
+    @property
+    def methods(self):
+        """Dict mapping method names to (copies of) their MethodStats."""
+        with self._lock:
+            return {name: stats.copy() for name, stats in self._methods.items()}
+
+    def record(self, method, duration, error=False):
+        """Records a single call of the given method.
+
+        :param str method: Name of the method.
+        :param float duration: Duration of the call (in seconds).
+        :param bool error: Whether the call raised an exception.
+        """
+
+        with self._lock:
+            if method not in self._methods:
+                self._methods[method] = MethodStats()
+            self._methods[method].add(duration, error=error)
+
+        if self._statsd is not None:
+            metric = "airflow_fs.{}.{}".format(self.name, method)
+            self._statsd.timing(metric, duration * 1000.0)
+            if error:
+                self._statsd.incr(metric + ".errors")
+
+    def add_bytes(self, read=0, written=0):
+        """Records bytes read from/written to files opened by the hook."""
+
+        with self._lock:
+            self.bytes_read += read
+            self.bytes_written += written
+
+        if self._statsd is not None:
+            if read:
+                self._statsd.incr("airflow_fs.{}.bytes_read".format(self.name), read)
+            if written:
+                self._statsd.incr(
+                    "airflow_fs.{}.bytes_written".format(self.name), written
+                )
+
+    def reset(self):
+        """Discards all recorded calls and byte counts."""
+
+        with self._lock:
+            self._methods = {}
+            self.bytes_read = 0
+            self.bytes_written = 0
+
+    def summary(self):
+        """Returns a (multi-line) human readable summary of the recorded stats."""
+
+        lines = [
+            "{} I/O stats: {} read, {} written".format(
+                self.name, _format_bytes(self.bytes_read), _format_bytes(self.bytes_written)
+            )
+        ]
+
+        for name, stats in sorted(self.methods.items()):
+            lines.append(
+                "  {}: {} call(s), {} error(s), total {:.3f}s, mean {:.3f}s, "
+                "p95 <= {}, max {:.3f}s".format(
+                    name,
+                    stats.count,
+                    stats.errors,
+                    stats.total_time,
+                    stats.mean,
+                    _format_bound(stats.percentile(0.95)),
+                    stats.max_time,
+                )
+            )
+
+        return "\n".join(lines)
+
+
+class MethodStats(object):
+    """Call count, error count and latency histogram of a single method.
+
+    `histogram[i]` is the number of calls that took at most
+    `LATENCY_BUCKETS[i]` seconds (and more than the previous bound). The
+    last item counts calls slower than the largest bound.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, duration, error=False):
+        """Records a single call."""
+
+        self.count += 1
+        self.errors += int(error)
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.histogram[_bucket_index(duration)] += 1
+
+    @property
+    def mean(self):
+        """Mean duration of the calls (in seconds)."""
+        return self.total_time / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        """Returns the upper bound of the histogram bucket containing the
+        given fraction (e.g. 0.95) of the calls, or None if this is the
+        overflow bucket.
+        """
+
+        threshold = fraction * self.count
+        cumulative = 0
+
+        for bound, count in zip(LATENCY_BUCKETS, self.histogram):
+            cumulative += count
+            if count and cumulative >= threshold:
+                return bound
+
+        return None
+
+    def copy(self):
+        """Returns a copy of the stats."""
+        stats = MethodStats()
+        stats.__dict__.update(self.__dict__)
+        stats.histogram = list(self.histogram)
+        return stats
+
+
+def instrument(hook, stats):
+    """Wraps the methods of the given hook (on the instance), recording
+    their calls in stats. Any previous instrumentation is replaced.
+    """
+
+    uninstrument(hook)
+
+    for name in INSTRUMENTED_METHODS:
+        method = getattr(hook, name, None)
+        if method is not None:
+            setattr(hook, name, _wrap(method, name, stats))
+
+
+def uninstrument(hook):
+    """Removes the instrumentation added by `instrument`."""
+
+    for name, value in list(vars(hook).items()):
+        if isinstance(getattr(value, "_hook_stats", None), HookStats):
+            delattr(hook, name)
+
+
+@contextlib.contextmanager
+def logging_stats(log, *hooks, **kwargs):
+    """Context manager logging a summary of the stats of the given hooks
+    (if enabled) when the block exits, also if it raises an exception.
+
+    :param bool reset: Whether to reset the stats after logging them, so that
+        each block only logs its own calls (e.g. for repeated sensor pokes).
+        Defaults to False.
+    """
+
+    reset = kwargs.pop("reset", False)
+    if kwargs:
+        raise TypeError("Unexpected keyword arguments: {}".format(", ".join(kwargs)))
+
+    try:
+        yield
+    finally:
+        for hook in hooks:
+            stats = getattr(hook, "stats", None)
+            if stats is not None:
+                log.info(stats.summary())
+                if reset:
+                    stats.reset()
+
+
+def _wrap(method, name, stats):
+    wraps_file = name in _FILE_METHODS
+
+    @functools.wraps(method)
+    def _wrapper(*args, **kwargs):
+        start = _timer()
+        try:
+            result = method(*args, **kwargs)
+        except Exception:
+            stats.record(name, _timer() - start, error=True)
+            raise
+
+        if isinstance(result, types.GeneratorType):
+            return _timed_iter(result, name, stats, elapsed=_timer() - start)
+
+        stats.record(name, _timer() - start)
+
+        if wraps_file:
+            return _CountingFile(result, stats)
+        return result
+
+    _wrapper._hook_stats = stats  # pylint: disable=protected-access
+    return _wrapper
+
+
+def _timed_iter(iterator, name, stats, elapsed=0.0):
+    """Yields the items of iterator, recording the time spent in the iterator
+    (excluding time spent by the consumer) once iteration finishes."""
+
+    error = False
+
+    try:
+        while True:
+            start = _timer()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                elapsed += _timer() - start
+                break
+            except Exception:
+                elapsed += _timer() - start
+                error = True
+                raise
+
+            elapsed += _timer() - start
+            yield item
+    finally:
+        stats.record(name, elapsed, error=error)
+
+
+class _CountingFile(object):
+    """File proxy counting the bytes read from and written to the file."""
+
+    def __init__(self, file_obj, stats):
+        self._file = file_obj
+        self._stats = stats
+
+    def read(self, *args, **kwargs):
+        data = self._file.read(*args, **kwargs)
+        self._stats.add_bytes(read=len(data))
+        return data
+
+    def readline(self, *args, **kwargs):
+        line = self._file.readline(*args, **kwargs)
+        self._stats.add_bytes(read=len(line))
+        return line
+
+    def write(self, data):
+        result = self._file.write(data)
+        self._stats.add_bytes(written=len(data))
+        return result
+
+    def __iter__(self):
+        for line in self._file:
+            self._stats.add_bytes(read=len(line))
+            yield line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._file.__exit__(exc_type, exc_val, exc_tb)
+
+    def __getattr__(self, name):
+        # Only exposed if the file supports them, as callers check for these
+        # methods to pick a (more efficient) way of reading the file.
+        if name == "readinto" and hasattr(self._file, "readinto"):
+            return self._readinto
+        if name == "read_view" and hasattr(self._file, "read_view"):
+            # Memory-mapped files (see LocalHook.open_mmap).
+            return self._read_view
+        return getattr(self._file, name)
+
+    def _readinto(self, buffer_):
+        num_bytes = self._file.readinto(buffer_)
+        if num_bytes:
+            self._stats.add_bytes(read=num_bytes)
+        return num_bytes
+
+    def _read_view(self, *args, **kwargs):
+        view = self._file.read_view(*args, **kwargs)
+        self._stats.add_bytes(read=len(view))
+        return view
+
+
+def _bucket_index(duration):
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if duration <= bound:
+            return i
+    return len(LATENCY_BUCKETS)
+
+
+def _format_bound(bound):
+    if bound is None:
+        return "inf"
+    return "{:g}s".format(bound)
+
+
+def _format_bytes(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            break
+        num_bytes /= 1024.0
+    return "{:.1f} {}".format(num_bytes, unit) if unit != "B" else "{} B".format(num_bytes)
+
+
+def _get_statsd():
+    """Returns the StatsD client of Airflow (a no-op client if disabled)."""
+
+    try:
+        from airflow.stats import Stats
+    except ImportError:
+        # Airflow < 2.0.
+        from airflow.settings import Stats
+    return Stats
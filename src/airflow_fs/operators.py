@@ -1,11 +1,18 @@
 """File system operators, built on the file system hook interface."""
 
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import functools
 import posixpath
+import threading
 
+from airflow.exceptions import AirflowException
 from airflow.models import BaseOperator
 from airflow.utils import apply_defaults
 
+from airflow_fs import archives
 from airflow_fs.hooks.local_hook import LocalHook
+from airflow_fs.hooks.stats import logging_stats
 from airflow_fs.ports import glob
 
 # pylint: disable=unused-argument,missing-docstring
@@ -20,12 +27,45 @@ class CopyFileOperator(BaseOperator):
     :param str dest_path: File path top copy files to.
     :param FsHook src_hook: File system hook to copy files from.
     :param FsHook dest_hook: File system hook to copy files to.
+    :param int max_workers: Maximum number of files to copy concurrently. If given,
+        files are copied using a pool of worker threads, each of which uses its own
+        connections to the source and destination file systems. By default, files
+        are copied one at a time.
+    :param bool resume: Whether to resume partial copies left by previous
+        (failed) attempts, rather than copying files from the start. See
+        `FsHook.copy` for details.
+    :param str checksum: Checksum algorithm (md5, sha256, crc32c or xxhash) to
+        compute while copying files, which is verified against checksums
+        provided by the destination file system (see `FsHook.copy`).
+    :param int buffer_size: Size (in bytes) of the chunks in which files are
+        copied.
+    :param int pipeline_depth: If given, reads from the source overlap with
+        writes to the destination, using this number of buffers per file
+        (see `FsHook.copy_fileobj`).
+    :param Transcoder transcoder: Transcoding stage for compressing,
+        decompressing or recompressing files while they are copied (see
+        `airflow_fs.transcoding.Transcoder`). If a glob pattern is given, the
+        suffixes of the destination file names are adjusted accordingly
+        (e.g. 'data.csv' becomes 'data.csv.zst' when compressing with zstd).
     """
 
     template_fields = ("_src_path", "_dest_path")
 
     @apply_defaults
-    def __init__(self, src_path, dest_path, src_hook=None, dest_hook=None, **kwargs):
+    def __init__(
+        self,
+        src_path,
+        dest_path,
+        src_hook=None,
+        dest_hook=None,
+        max_workers=None,
+        resume=False,
+        checksum=None,
+        buffer_size=None,
+        pipeline_depth=None,
+        transcoder=None,
+        **kwargs
+    ):
         super(CopyFileOperator, self).__init__(**kwargs)
 
         self._src_path = src_path
@@ -34,46 +74,484 @@ class CopyFileOperator(BaseOperator):
         self._src_hook = src_hook or LocalHook()
         self._dest_hook = dest_hook or LocalHook()
 
+        self._max_workers = max_workers
+        self._resume = resume
+        self._checksum = checksum
+        self._buffer_size = buffer_size
+        self._pipeline_depth = pipeline_depth
+        self._transcoder = transcoder
+
     def execute(self, context):
-        with self._src_hook as src_hook, self._dest_hook as dest_hook:
-            for src_path, dest_path in self._glob_copy_paths(
-                self._src_path, self._dest_path, src_hook=src_hook
-            ):
-                dest_hook.copy(src_path, dest_path, src_hook=src_hook)
+        with logging_stats(self.log, self._src_hook, self._dest_hook), \
+                self._src_hook as src_hook, self._dest_hook as dest_hook:
+            copy_paths = self._glob_copy_paths(
+                self._src_path,
+                self._dest_path,
+                src_hook=src_hook,
+                transcoder=self._transcoder,
+            )
+
+            copy_kwargs = {
+                "resume": self._resume,
+                "checksum": self._checksum,
+                "buffer_size": self._buffer_size,
+                "pipeline_depth": self._pipeline_depth,
+                "transcoder": self._transcoder,
+            }
+
+            if self._max_workers is None:
+                for src_path, dest_path in copy_paths:
+                    dest_hook.copy(
+                        src_path, dest_path, src_hook=src_hook, **copy_kwargs
+                    )
+            else:
+                _copy_parallel(
+                    copy_paths,
+                    src_hook=src_hook,
+                    dest_hook=dest_hook,
+                    max_workers=self._max_workers,
+                    log=self.log,
+                    copy_kwargs=copy_kwargs,
+                )
 
     @staticmethod
-    def _glob_copy_paths(src_path, dest_path, src_hook):
+    def _glob_copy_paths(src_path, dest_path, src_hook, transcoder=None):
         if glob.has_magic(src_path):
             for src_file_path in src_hook.glob(src_path):
                 base_name = posixpath.basename(src_file_path)
+                if transcoder is not None:
+                    base_name = transcoder.rename(base_name)
                 dest_file_path = posixpath.join(dest_path, base_name)
                 yield src_file_path, dest_file_path
         else:
             yield src_path, dest_path
 
 
+def _copy_parallel(copy_paths, src_hook, dest_hook, max_workers, log,
+                   copy_kwargs=None):
+    """Copies the given (src_path, dest_path) pairs using a pool of threads.
+
+    Each worker thread copies files using its own clones of the given hooks, as
+    connections are generally not safe to share between threads. At most
+    `max_workers` transfers are in flight at any time and paths are only taken
+    from `copy_paths` as workers become available, so that large glob results
+    are not queued up in memory. Once a transfer fails, no new transfers are
+    started, but transfers that are already in flight are finished. Failures
+    are reported together once these have finished. Any `copy_kwargs` are
+    passed to `FsHook.copy`.
+    """
+
+    copy_kwargs = copy_kwargs or {}
+
+    thread_state = threading.local()
+    thread_hooks = []
+    lock = threading.Lock()
+
+    pending, failures = {}, []
+
+    def _copy(src_path, dest_path):
+        if not hasattr(thread_state, "hooks"):
+            thread_state.hooks = (src_hook.clone(), dest_hook.clone())
+            with lock:
+                thread_hooks.extend(thread_state.hooks)
+
+        thread_src_hook, thread_dest_hook = thread_state.hooks
+        thread_dest_hook.copy(
+            src_path, dest_path, src_hook=thread_src_hook, **copy_kwargs
+        )
+
+    def _collect(futures):
+        for future in futures:
+            src_path = pending.pop(future)
+            exc = future.exception()
+            if exc is not None:
+                log.error("Failed to copy %s: %s", src_path, exc, exc_info=exc)
+                failures.append(src_path)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for src_path, dest_path in copy_paths:
+                if len(pending) >= max_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+                else:
+                    _collect([future for future in pending if future.done()])
+
+                if failures:
+                    break
+
+                log.info("Copying file %s to %s", src_path, dest_path)
+                pending[executor.submit(_copy, src_path, dest_path)] = src_path
+
+            done, _ = wait(pending)
+            _collect(done)
+    finally:
+        for hook in thread_hooks:
+            hook.disconnect()
+
+    if failures:
+        raise AirflowException(
+            "Failed to copy {} file(s): {}".format(len(failures), ", ".join(failures))
+        )
+
+
+class SyncOperator(BaseOperator):
+    """Operator for synchronizing a directory tree between file systems.
+
+    Both trees are listed once (see `FsHook.scantree`), after which only files
+    that are new or changed are copied. Files are considered unchanged if
+    their ETags match (for files from file systems of the same type) or if
+    they have the same size and the destination file is not older than the
+    source file. Files for which this can't be determined are copied.
+
+    :param str src_path: Path of the directory to copy files from.
+    :param str dest_path: Path of the directory to copy files to.
+    :param FsHook src_hook: File system hook to copy files from.
+    :param FsHook dest_hook: File system hook to copy files to.
+    :param bool delete: Whether to delete files in the destination directory
+        that do not exist in the source directory.
+    :param int max_workers: Maximum number of files to copy (and delete)
+        concurrently (see `CopyFileOperator` and `FsHook.rm_many`).
+    """
+
+    template_fields = ("_src_path", "_dest_path")
+
+    @apply_defaults
+    def __init__(
+        self,
+        src_path,
+        dest_path,
+        src_hook=None,
+        dest_hook=None,
+        delete=False,
+        max_workers=None,
+        **kwargs
+    ):
+        super(SyncOperator, self).__init__(**kwargs)
+
+        self._src_path = src_path
+        self._dest_path = dest_path
+
+        self._src_hook = src_hook or LocalHook()
+        self._dest_hook = dest_hook or LocalHook()
+
+        self._delete = delete
+        self._max_workers = max_workers
+
+    def execute(self, context):
+        with logging_stats(self.log, self._src_hook, self._dest_hook), \
+                self._src_hook as src_hook, self._dest_hook as dest_hook:
+            src_entries = {
+                entry.name: entry for entry in src_hook.scantree(self._src_path)
+            }
+
+            if dest_hook.exists(self._dest_path):
+                dest_entries = {
+                    entry.name: entry
+                    for entry in dest_hook.scantree(self._dest_path)
+                }
+            else:
+                dest_entries = {}
+
+            compare_etags = type(src_hook) is type(dest_hook)
+
+            copy_names, skipped = [], 0
+            for name, src_entry in sorted(src_entries.items()):
+                dest_entry = dest_entries.get(name)
+
+                if dest_entry is not None and _is_unchanged(
+                        src_entry, dest_entry, compare_etags=compare_etags):
+                    self.log.debug("Skipping unchanged file %s", name)
+                    skipped += 1
+                else:
+                    copy_names.append(name)
+
+            self._copy_files(copy_names, src_hook, dest_hook, existing=dest_entries)
+
+            deleted = 0
+            if self._delete:
+                delete_paths = [
+                    posixpath.join(self._dest_path, name)
+                    for name in sorted(set(dest_entries) - set(src_entries))
+                ]
+                for dest_file_path in delete_paths:
+                    self.log.info("Deleting file %s", dest_file_path)
+
+                dest_hook.rm_many(
+                    delete_paths, recursive=False, **_rm_many_kwargs(self._max_workers)
+                )
+                deleted = len(delete_paths)
+
+        self.log.info(
+            "Copied %d file(s), skipped %d unchanged file(s), deleted %d file(s)",
+            len(copy_names), skipped, deleted,
+        )
+
+        return {"copied": len(copy_names), "skipped": skipped, "deleted": deleted}
+
+    def _copy_files(self, names, src_hook, dest_hook, existing):
+        copy_paths = [
+            (posixpath.join(self._src_path, name), posixpath.join(self._dest_path, name))
+            for name in names
+        ]
+
+        # Create (sub)directories that did not contain any files before copying.
+        existing_dirs = set(_parent_dirs(existing))
+        for dir_name in sorted(set(_parent_dirs(names)) - existing_dirs):
+            dest_hook.makedirs(
+                posixpath.join(self._dest_path, dir_name), exist_ok=True
+            )
+
+        if self._max_workers is None:
+            for src_path, dest_path in copy_paths:
+                self.log.info("Copying file %s to %s", src_path, dest_path)
+                dest_hook.copy(src_path, dest_path, src_hook=src_hook)
+        else:
+            _copy_parallel(
+                copy_paths,
+                src_hook=src_hook,
+                dest_hook=dest_hook,
+                max_workers=self._max_workers,
+                log=self.log,
+            )
+
+
+def _parent_dirs(names):
+    """Yields the (relative) parent directories of the given relative paths,
+    including the empty path for the root directory.
+    """
+    for name in names:
+        while name:
+            name = posixpath.dirname(name)
+            yield name
+
+
+def _is_unchanged(src_entry, dest_entry, compare_etags):
+    """Checks if the destination entry is an up-to-date copy of the source."""
+
+    if src_entry.size is not None and dest_entry.size is not None:
+        if src_entry.size != dest_entry.size:
+            return False
+
+    # Multipart ETags (containing a dash) depend on the part size used,
+    # so only compare ETags that are plain checksums.
+    if (compare_etags and src_entry.etag and dest_entry.etag
+            and "-" not in src_entry.etag + dest_entry.etag):
+        return src_entry.etag == dest_entry.etag
+
+    return (
+        src_entry.size is not None
+        and dest_entry.size is not None
+        and src_entry.mtime is not None
+        and dest_entry.mtime is not None
+        and src_entry.mtime <= dest_entry.mtime
+    )
+
+
+class ArchiveOperator(BaseOperator):
+    """Operator for packing files into a (tar or zip) archive on another
+    file system.
+
+    Matching files are streamed one at a time from the source into the
+    archive, which is written directly to the destination. Nothing is staged
+    on local disk and memory use does not depend on the number or size of
+    the files, which makes this suitable for moving many small files in a
+    single transfer. Writing zip archives requires Python 3.6 or newer.
+
+    :param str src_path: File path to the file(s) to archive. Can be any valid
+        file path or glob pattern. Directories matching the pattern are skipped.
+    :param str dest_path: Path of the archive to write.
+    :param FsHook src_hook: File system hook to read files from.
+    :param FsHook dest_hook: File system hook to write the archive with.
+    :param str archive_format: Format of the archive (tar, tar.gz, tar.bz2,
+        tar.xz or zip). Derived from the suffix of dest_path if not given.
+    :param str root: Directory to which the paths of the files in the archive
+        are relative. Defaults to the directory containing the first wildcard
+        of src_path (or the parent directory of src_path for single files).
+    """
+
+    template_fields = ("_src_path", "_dest_path")
+
+    @apply_defaults
+    def __init__(
+        self,
+        src_path,
+        dest_path,
+        src_hook=None,
+        dest_hook=None,
+        archive_format=None,
+        root=None,
+        **kwargs
+    ):
+        super(ArchiveOperator, self).__init__(**kwargs)
+
+        self._src_path = src_path
+        self._dest_path = dest_path
+
+        self._src_hook = src_hook or LocalHook()
+        self._dest_hook = dest_hook or LocalHook()
+
+        self._archive_format = archive_format
+        self._root = root
+
+    def execute(self, context):
+        archive_format = self._archive_format or archives.detect_format(self._dest_path)
+
+        with logging_stats(self.log, self._src_hook, self._dest_hook), \
+                self._src_hook as src_hook, self._dest_hook as dest_hook:
+            with dest_hook.open(self._dest_path, "wb") as dest_file:
+                count = archives.write_archive(
+                    dest_file, self._iter_members(src_hook), archive_format
+                )
+
+        self.log.info("Archived %d file(s) into %s", count, self._dest_path)
+
+    def _iter_members(self, src_hook):
+        root = self._root if self._root is not None else _glob_root(self._src_path)
+
+        if glob.has_magic(self._src_path):
+            entries = _glob_entries(self._src_path, hook=src_hook)
+        else:
+            entries = [(self._src_path, None)]
+
+        for path_, entry in entries:
+            if path_ == self._dest_path:
+                continue  # Don't include a (partial) archive in itself.
+
+            if entry is None:
+                if src_hook.isdir(path_):
+                    continue
+                size, mtime = src_hook.size(path_), None
+            elif entry.is_dir():
+                continue
+            else:
+                size, mtime = entry.size, entry.mtime
+
+            if size is None:
+                size = src_hook.size(path_)
+
+            self.log.debug("Archiving file %s", path_)
+            yield archives.ArchiveMember(
+                name=_relative_path(path_, root),
+                size=size,
+                mtime=mtime,
+                open=functools.partial(src_hook.open, path_, "rb"),
+            )
+
+
+class ExtractOperator(BaseOperator):
+    """Operator for extracting a (tar or zip) archive onto another file system.
+
+    Entries are streamed one at a time from the archive to the destination,
+    without staging the archive on local disk. Tar archives are read
+    sequentially. Zip archives store their index at the end of the file, so
+    they require a hook with seekable file objects (i.e. not the FtpHook).
+    Links and special files in the archive are skipped and entries that would
+    be extracted outside of dest_path (absolute paths or paths containing '..')
+    fail the task.
+
+    :param str src_path: Path of the archive to extract.
+    :param str dest_path: Directory to extract the archive into.
+    :param FsHook src_hook: File system hook to read the archive with.
+    :param FsHook dest_hook: File system hook to write the extracted files with.
+    :param str archive_format: Format of the archive (tar, tar.gz, tar.bz2,
+        tar.xz or zip). Derived from the suffix of src_path if not given.
+    """
+
+    template_fields = ("_src_path", "_dest_path")
+
+    @apply_defaults
+    def __init__(
+        self,
+        src_path,
+        dest_path,
+        src_hook=None,
+        dest_hook=None,
+        archive_format=None,
+        **kwargs
+    ):
+        super(ExtractOperator, self).__init__(**kwargs)
+
+        self._src_path = src_path
+        self._dest_path = dest_path
+
+        self._src_hook = src_hook or LocalHook()
+        self._dest_hook = dest_hook or LocalHook()
+
+        self._archive_format = archive_format
+
+    def execute(self, context):
+        archive_format = self._archive_format or archives.detect_format(self._src_path)
+
+        count = 0
+        with logging_stats(self.log, self._src_hook, self._dest_hook), \
+                self._src_hook as src_hook, self._dest_hook as dest_hook:
+            dest_hook.makedirs(self._dest_path, exist_ok=True)
+            created_dirs = {""}
+
+            with src_hook.open(self._src_path, "rb") as src_file:
+                for entry in archives.iter_archive(src_file, archive_format):
+                    dir_name = entry.name if entry.is_dir else posixpath.dirname(entry.name)
+
+                    if dir_name not in created_dirs:
+                        dest_hook.makedirs(
+                            posixpath.join(self._dest_path, dir_name), exist_ok=True
+                        )
+                        created_dirs.add(dir_name)
+
+                    if not entry.is_dir:
+                        dest_file_path = posixpath.join(self._dest_path, entry.name)
+                        self.log.debug("Extracting %s to %s", entry.name, dest_file_path)
+                        dest_hook.copy_fileobj(entry.file_obj, dest_file_path)
+                        count += 1
+
+        self.log.info("Extracted %d file(s) into %s", count, self._dest_path)
+
+
+def _glob_root(pattern):
+    """Returns the directory containing the first wildcard of a glob pattern,
+    or the parent directory of paths without wildcards.
+    """
+
+    parts = pattern.split("/")
+    for i, part in enumerate(parts):
+        if glob.has_magic(part):
+            return "/".join(parts[:i])
+    return posixpath.dirname(pattern)
+
+
+def _relative_path(path_, root):
+    if not root:
+        return path_.lstrip("/")
+    return posixpath.relpath(path_, root)
+
+
 class DeleteFileOperator(BaseOperator):
     """Deletes files at a given path.
 
     :param str path: File path to file(s) to delete. Can be any valid file path or
         glob pattern.
     :param FsHook hook: File system hook to use when deleting files.
+    :param int max_workers: Maximum number of files to delete concurrently
+        (see `FsHook.rm_many`). Defaults to the default of the hook.
     """
 
     template_fields = ("_path",)
 
     @apply_defaults
-    def __init__(self, path, hook=None, **kwargs):
+    def __init__(self, path, hook=None, max_workers=None, **kwargs):
         super(DeleteFileOperator, self).__init__(**kwargs)
         self._path = path
         self._hook = hook or LocalHook()
+        self._max_workers = max_workers
 
     def execute(self, context):
-        with self._hook as hook:
-            for path_ in hook.glob(self._path):
-                if not hook.isdir(path_):
-                    self.log.info("Deleting file %s", path_)
-                    hook.rm(path_)
+        with logging_stats(self.log, self._hook), self._hook as hook:
+            hook.rm_many(
+                _iter_delete_paths(self._path, hook, is_dir=False, log=self.log),
+                recursive=False,
+                **_rm_many_kwargs(self._max_workers)
+            )
 
 
 class DeleteTreeOperator(BaseOperator):
@@ -82,19 +560,74 @@ class DeleteTreeOperator(BaseOperator):
     :param str path: File path to directory to delete. Can be any valid file path or
         glob pattern.
     :param FsHook hook: File system hook to use when deleting directories.
+    :param int max_workers: Maximum number of directories to delete
+        concurrently (see `FsHook.rm_many`). Defaults to the default of the hook.
     """
 
     template_fields = ("_path",)
 
     @apply_defaults
-    def __init__(self, path, hook=None, **kwargs):
+    def __init__(self, path, hook=None, max_workers=None, **kwargs):
         super(DeleteTreeOperator, self).__init__(**kwargs)
         self._path = path
         self._hook = hook or LocalHook()
+        self._max_workers = max_workers
 
     def execute(self, context):
-        with self._hook as hook:
-            for path_ in hook.glob(self._path):
-                if hook.isdir(path_):
-                    self.log.info("Deleting directory %s", path_)
-                    hook.rmtree(path_)
+        with logging_stats(self.log, self._hook), self._hook as hook:
+            hook.rm_many(
+                _iter_delete_paths(self._path, hook, is_dir=True, log=self.log),
+                recursive=True,
+                **_rm_many_kwargs(self._max_workers)
+            )
+
+
+def _rm_many_kwargs(max_workers):
+    """Leaves the default number of workers of rm_many to the hook."""
+    return {} if max_workers is None else {"max_workers": max_workers}
+
+
+def _iter_delete_paths(pattern, hook, is_dir, log):
+    """Yields the files (or directories if is_dir is True) matching the given
+    pattern, logging each path as it is passed on for deletion.
+    """
+    for path_, path_is_dir in _glob_with_types(pattern, hook=hook):
+        if path_is_dir == is_dir:
+            log.info("Deleting %s %s", "directory" if is_dir else "file", path_)
+            yield path_
+
+
+def _glob_with_types(pattern, hook):
+    """Yields (path, is_dir) tuples for the paths matching the given pattern.
+
+    Types are taken from a single `scandir` listing per parent directory of
+    the matched paths, rather than calling `isdir` for every path.
+    """
+
+    if not glob.has_magic(pattern):
+        if hook.exists(pattern):
+            yield pattern, hook.isdir(pattern)
+        return
+
+    for path_, entry in _glob_entries(pattern, hook=hook):
+        if entry is not None:
+            yield path_, entry.is_dir()
+        else:
+            yield path_, hook.isdir(path_)
+
+
+def _glob_entries(pattern, hook):
+    """Yields (path, DirEntry) tuples for the paths matching the given glob
+    pattern, using a single `scandir` listing per parent directory. Entries
+    are None for paths missing from the listing of their parent.
+    """
+
+    paths_by_parent = OrderedDict()
+    for path_ in hook.glob(pattern):
+        paths_by_parent.setdefault(posixpath.dirname(path_), []).append(path_)
+
+    for parent, paths in paths_by_parent.items():
+        entries = {entry.name: entry for entry in hook.scandir(parent)}
+
+        for path_ in paths:
+            yield path_, entries.get(posixpath.basename(path_))
@@ -2,6 +2,7 @@
    support multiple file systems.
 """
 
+import functools
 import posixpath
 import re
 import fnmatch
@@ -34,6 +35,10 @@ def iglob(pathname, hook, recursive=False):
     If recursive is true, the pattern '**' will match any files and
     zero or more directories and subdirectories.
     """
+    if getattr(hook, "supports_prefix_listing", False):
+        it = _iglob_prefix(pathname, recursive, hook=hook)
+        if it is not None:
+            return it
     it = _iglob(pathname, recursive, False, hook=hook)
     if recursive and _isrecursive(pathname):
         s = next(it)  # skip empty string
@@ -83,10 +88,13 @@ def _iglob(pathname, recursive, dironly, hook):
 # takes a literal basename (so it only has to check for its existence).
 
 def _glob1(dirname, pattern, dironly, hook):
-    names = list(_iterdir(dirname, dironly, hook=hook))
+    # Matches names lazily (unlike the stdlib version), so that callers only
+    # interested in the first match (e.g. sensors) can stop early.
+    names = _iterdir(dirname, dironly, hook=hook)
     if not _ishidden(pattern):
         names = (x for x in names if not _ishidden(x))
-    return fnmatch.filter(names, pattern)
+    match = re.compile(fnmatch.translate(pattern)).match
+    return (x for x in names if match(x))
 
 # pylint: disable=unused-argument
 def _glob0(dirname, basename, dironly, hook):
@@ -106,7 +114,7 @@ def glob0(dirname, pattern, hook):
     return _glob0(dirname, pattern, False, hook=hook)
 
 def glob1(dirname, pattern, hook):
-    return _glob1(dirname, pattern, False, hook=hook)
+    return list(_glob1(dirname, pattern, False, hook=hook))
 
 # This helper function recursively yields relative pathnames inside a literal
 # directory.
@@ -126,8 +134,14 @@ def _iterdir(dirname, dironly, hook):
         else:
             dirname = posixpath.curdir
     try:
-        for entry in hook.listdir(dirname):
-            if not dironly or hook.isdir(posixpath.join(dirname, entry)):
+        if dironly:
+            # Fetch entry types with the listing, rather than calling
+            # isdir for each entry.
+            for entry in hook.scandir(dirname):
+                if entry.is_dir():
+                    yield entry.name
+        else:
+            for entry in hook.listdir(dirname):
                 yield entry
     except OSError:
         return
@@ -143,6 +157,97 @@ def _rlistdir(dirname, dironly, hook):
                 yield posixpath.join(x, y)
 
 
+# Prefix pushdown for hooks supporting prefix listings (e.g. object stores).
+# Rather than listing one directory level at a time, the longest literal prefix
+# of the pattern is listed at once and the listed paths are matched against
+# the (compiled) pattern components.
+
+def _iglob_prefix(pathname, recursive, hook):
+    """Returns an iterator over paths matching the pattern using a prefix
+    listing, or None if the pattern is not suited for prefix pushdown.
+    """
+    plan = prefix_plan(pathname, recursive)
+    if plan is None:
+        return None
+    prefix, delimiter, match_listing = plan
+    return match_listing(hook.iter_prefix(prefix, delimiter=delimiter))
+
+def prefix_plan(pathname, recursive=False):
+    """Returns a (prefix, delimiter, match_listing) tuple describing how to
+    match the pattern against a prefix listing, or None if the pattern is not
+    suited for prefix pushdown. `match_listing` takes an iterable of listed
+    paths and yields the (unique) matching paths.
+    """
+    if not has_magic(pathname) or pathname.endswith('/'):
+        return None
+
+    components = pathname.split('/')
+    magic_index = next(i for i, comp in enumerate(components) if has_magic(comp))
+
+    if (magic_index == 0 or not all(components[1:])
+            or any(comp in ('.', '..') for comp in components)
+            or (recursive and _isrecursive(components[-1]))):
+        return None
+
+    matchers = [_compile_component(comp, recursive) for comp in components]
+    is_recursive = any(matcher is _RECURSIVE for matcher in matchers)
+
+    prefix = pathname[:magic_check.search(pathname).start()]
+    if magic_index == len(components) - 1 and not is_recursive:
+        # Only entries directly below the literal directory can match.
+        delimiter = '/'
+    else:
+        delimiter = None
+
+    match_listing = functools.partial(
+        _match_listing, matchers=matchers, magic_index=magic_index,
+        is_recursive=is_recursive)
+
+    return prefix, delimiter, match_listing
+
+def _match_listing(listing, matchers, magic_index, is_recursive):
+    seen = set()
+    for path in listing:
+        parts = path.rstrip('/').split('/')
+        if is_recursive:
+            depths = range(magic_index + 1, len(parts) + 1)
+        else:
+            depths = [len(matchers)] if len(parts) >= len(matchers) else []
+        # Paths are files or (implicit) directories, depending on whether
+        # they are truncated versions of the listed path.
+        for depth in depths:
+            candidate = '/'.join(parts[:depth])
+            if candidate not in seen and _match_components(parts[:depth], matchers):
+                seen.add(candidate)
+                yield candidate
+
+_RECURSIVE = object()
+
+def _compile_component(component, recursive):
+    if recursive and _isrecursive(component):
+        return _RECURSIVE
+    if not has_magic(component):
+        return lambda name: name == component
+    regex = re.compile(fnmatch.translate(component))
+    match_hidden = _ishidden(component)
+    return lambda name: ((match_hidden or not _ishidden(name))
+                         and regex.match(name) is not None)
+
+def _match_components(names, matchers):
+    if not matchers:
+        return not names
+    if matchers[0] is _RECURSIVE:
+        # Matches zero or more non-hidden components.
+        for i in range(len(names) + 1):
+            if i > 0 and _ishidden(names[i - 1]):
+                break
+            if _match_components(names[i:], matchers[1:]):
+                return True
+        return False
+    return (bool(names) and matchers[0](names[0])
+            and _match_components(names[1:], matchers[1:]))
+
+
 magic_check = re.compile('([*?[])')
 magic_check_bytes = re.compile(b'([*?[])')
 
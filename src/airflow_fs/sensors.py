@@ -1,14 +1,23 @@
 """Module containing file system sensors."""
 
+import datetime
+
+from airflow.exceptions import AirflowException
 from airflow.sensors.base_sensor_operator import BaseSensorOperator
 from airflow.utils.decorators import apply_defaults
 
 from airflow_fs.hooks import LocalHook
+from airflow_fs.hooks.stats import logging_stats
+from airflow_fs.ports import glob
 
 
 class FileSensor(BaseSensorOperator):
     """Sensor that waits for files matching a given file pattern.
 
+    Pokes stop at the first matching file and paths without any wildcards
+    are checked using a single `exists` call. In poke mode, the hook stays
+    connected between pokes and is disconnected once the sensor finishes.
+
     :param str path: File path to match files to. Can be any valid
         glob pattern.
     :param FsHook hook: File system hook to use when looking for files.
@@ -23,9 +32,79 @@ class FileSensor(BaseSensorOperator):
         self._path = path
         self._hook = hook or LocalHook()
 
+    def execute(self, context):
+        try:
+            return super(FileSensor, self).execute(context)
+        finally:
+            self._hook.disconnect()
+
     # pylint: disable=unused-argument,missing-docstring
     def poke(self, context):
-        with self._hook as hook:
-            if hook.glob(self._path):
-                return True
-            return False
+        try:
+            # Stats are reset after each poke, logging the calls of that poke.
+            with logging_stats(self.log, self._hook, reset=True):
+                found = find_first(self._hook, self._path) is not None
+        except Exception:
+            # Reconnect on the next poke, in case the connection broke.
+            self._hook.disconnect()
+            raise
+
+        if getattr(self, "mode", "poke") == "reschedule":
+            # Tasks are rescheduled between pokes, so don't keep
+            # connections open in between.
+            self._hook.disconnect()
+
+        return found
+
+
+class DeferrableFileSensor(FileSensor):
+    """FileSensor that frees its worker slot while waiting, by deferring
+    itself to a `airflow_fs.triggers.FileTrigger` on the triggerer.
+
+    The sensor pokes once on the worker before deferring. Requires Airflow
+    2.2 or newer and a hook that can be serialized (see `FsHook.serialize`).
+
+    :param str path: File path to match files to. Can be any valid
+        glob pattern.
+    :param FsHook hook: File system hook to use when looking for files.
+    """
+
+    def execute(self, context):
+        if not hasattr(self, "defer"):
+            raise AirflowException(
+                "Deferrable sensors require Airflow 2.2 or newer"
+            )
+
+        try:
+            if self.poke(context):
+                return
+        finally:
+            self._hook.disconnect()
+
+        # Imported here as triggers use syntax that is only valid on Python 3.
+        from airflow_fs.triggers import FileTrigger
+
+        # Defer is only available in Airflow 2.2+ (checked above).
+        self.defer(  # pylint: disable=no-member
+            trigger=FileTrigger(
+                path=self._path,
+                hook=self._hook.serialize(),
+                poke_interval=self.poke_interval,
+            ),
+            method_name="execute_complete",
+            timeout=datetime.timedelta(seconds=self.timeout),
+        )
+
+    # pylint: disable=unused-argument
+    def execute_complete(self, context, event=None):
+        """Called when the trigger fires, with the matched path as event."""
+        self.log.info("Found file %s", event["path"])
+
+
+def find_first(hook, path):
+    """Returns the first file matching the given path (pattern), or None if
+    no files match. Paths without wildcards are checked using `hook.exists`.
+    """
+    if not glob.has_magic(path):
+        return path if hook.exists(path) else None
+    return next(hook.iglob(path), None)
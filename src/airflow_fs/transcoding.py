@@ -0,0 +1,215 @@
+"""Streaming (de)compression of file contents while they are copied."""
+
+import bz2
+import posixpath
+import zlib
+
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+#: File name suffixes of the supported compression codecs.
+CODEC_SUFFIXES = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz", "zstd": ".zst"}
+
+# Size (in bytes) of the chunks read from the source by the transcoding readers.
+_CHUNK_SIZE = 1024 * 1024
+
+
+class Transcoder(object):
+    """Transcoding stage for copies, which compresses, decompresses or
+    recompresses data while it is copied (see `FsHook.copy`).
+
+    Supported codecs are gzip, bz2, xz and zstd. On Python 2, xz requires the
+    backports.lzma package. zstd requires the zstandard package (both are
+    included in the compression extra).
+
+    :param str decompress: Codec the source data is compressed with, which is
+        decompressed before writing. Concatenated streams (e.g. multi-member
+        gzip files) are decompressed in full.
+    :param str compress: Codec to compress the data with before writing.
+    :param int level: Compression level (codec-specific). Uses the default
+        level of the codec if not given.
+    :param int threads: Number of threads used for zstd compression. Uses
+        all available cores by default. Ignored by the other codecs.
+    """
+
+    def __init__(self, decompress=None, compress=None, level=None, threads=-1):
+        for codec in (decompress, compress):
+            if codec is not None and codec not in CODEC_SUFFIXES:
+                raise ValueError(
+                    "Unknown codec {!r}, expected one of {}".format(
+                        codec, ", ".join(sorted(CODEC_SUFFIXES))))
+
+        if decompress is None and compress is None:
+            raise ValueError("At least one of decompress or compress is required")
+
+        self.decompress = decompress
+        self.compress = compress
+        self.level = level
+        self.threads = threads
+
+    def wrap(self, file_obj):
+        """Returns a readable file object producing the transcoded contents
+        of the given (readable) file object.
+        """
+
+        if self.decompress is not None:
+            file_obj = _DecompressingReader(file_obj, self.decompress)
+
+        if self.compress is not None:
+            compressor = _new_compressor(self.compress, self.level, self.threads)
+            file_obj = _CompressingReader(file_obj, compressor)
+
+        return file_obj
+
+    def rename(self, path):
+        """Returns the path with its suffix adjusted for the transcoding,
+        removing the suffix of the decompressed codec (if present) and adding
+        the suffix of the compressed codec.
+
+        For example, 'data.csv.gz' becomes 'data.csv.zst' when recompressing
+        from gzip to zstd.
+        """
+
+        if self.decompress is not None:
+            root, ext = posixpath.splitext(path)
+            if ext == CODEC_SUFFIXES[self.decompress]:
+                path = root
+
+        if self.compress is not None:
+            path += CODEC_SUFFIXES[self.compress]
+
+        return path
+
+
+class _TransformingReader(object):
+    """Readable file object transforming the data read from another file
+    object in chunks, buffering transformed data until it is read.
+    """
+
+    def __init__(self, file_obj):
+        self._file_obj = file_obj
+        self._buffer = bytearray()
+        self._done = False
+
+    def read(self, size=-1):
+        """Reads (at most) size bytes of transformed data."""
+
+        read_all = size is None or size < 0
+
+        while not self._done and (read_all or len(self._buffer) < size):
+            data = self._file_obj.read(_CHUNK_SIZE)
+            if data:
+                self._buffer += self._transform(data)
+            else:
+                self._buffer += self._finish()
+                self._done = True
+
+        if read_all:
+            size = len(self._buffer)
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _transform(self, data):
+        raise NotImplementedError()
+
+    def _finish(self):
+        raise NotImplementedError()
+
+
+class _CompressingReader(_TransformingReader):
+    """Reader compressing the data of a file object, using a compressor
+    with `compress` and `flush` methods."""
+
+    def __init__(self, file_obj, compressor):
+        super(_CompressingReader, self).__init__(file_obj)
+        self._compressor = compressor
+
+    def _transform(self, data):
+        return self._compressor.compress(data)
+
+    def _finish(self):
+        return self._compressor.flush()
+
+
+class _DecompressingReader(_TransformingReader):
+    """Reader decompressing the data of a file object, continuing with a new
+    decompressor for any data following the end of a compressed stream."""
+
+    def __init__(self, file_obj, codec):
+        super(_DecompressingReader, self).__init__(file_obj)
+        self._codec = codec
+        self._decompressor = _new_decompressor(codec)
+        self._at_stream_end = False
+
+    def _transform(self, data):
+        output = bytearray()
+
+        while data:
+            if self._at_stream_end:
+                self._decompressor = _new_decompressor(self._codec)
+
+            output += self._decompressor.decompress(data)
+            data = getattr(self._decompressor, "unused_data", b"")
+
+            # Decompressors without an eof attribute (e.g. zlib on Python 2)
+            # only show the end of a stream through the data following it.
+            self._at_stream_end = getattr(self._decompressor, "eof", bool(data))
+
+        return bytes(output)
+
+    def _finish(self):
+        if hasattr(self._decompressor, "eof") and not self._decompressor.eof:
+            raise IOError(
+                "Compressed ({}) data ended before the end of the stream".format(
+                    self._codec))
+        return b""
+
+
+def _new_compressor(codec, level, threads):
+    if codec == "gzip":
+        level = zlib.Z_DEFAULT_COMPRESSION if level is None else level
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    if codec == "bz2":
+        return bz2.BZ2Compressor(9 if level is None else level)
+
+    if codec == "xz":
+        return _require(lzma, "lzma", codec).LZMACompressor(preset=level)
+
+    zstd = _require(zstandard, "zstandard", codec)
+    kwargs = {"threads": threads}
+    if level is not None:
+        kwargs["level"] = level
+    return zstd.ZstdCompressor(**kwargs).compressobj()
+
+
+def _new_decompressor(codec):
+    if codec == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    if codec == "bz2":
+        return bz2.BZ2Decompressor()
+
+    if codec == "xz":
+        return _require(lzma, "lzma", codec).LZMADecompressor()
+
+    return _require(zstandard, "zstandard", codec).ZstdDecompressor().decompressobj()
+
+
+def _require(module, module_name, codec):
+    if module is None:
+        raise ImportError(
+            "{} must be installed to use {} compression".format(module_name, codec))
+    return module
@@ -0,0 +1,424 @@
+"""Engines for transferring file contents between file system hooks."""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import hashlib
+import logging
+import queue
+import shutil
+import threading
+
+try:
+    import crc32c
+except ImportError:
+    crc32c = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Default size (in bytes) of the byte ranges read by `ranged_copy`.
+DEFAULT_RANGE_SIZE = 64 * 1024 * 1024
+
+# Number of bytes before the resume offset compared by `resume_copy`.
+RESUME_CHECK_SIZE = 64 * 1024
+
+# Default size (in bytes) of the buffers used by `pipelined_copy`.
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+_LOG = logging.getLogger(__name__)
+
+
+def ranged_copy(
+    src_hook, src_path, dest_hook, dest_path, range_size=None, max_workers=4
+):
+    """Copies a file by reading byte ranges of the source file concurrently.
+
+    The source file is split into ranges of `range_size` bytes, which are read
+    by a pool of worker threads. Each worker uses its own clone of `src_hook`
+    (and its own file handle, opened using `open_at`), so this works for any
+    hook whose `open_at` returns seekable file objects. If the destination
+    file is seekable, ranges are written in place as soon as they have been
+    read. Otherwise, ranges are written in order. In both cases, at most
+    `2 * max_workers` ranges are held in memory at any time.
+
+    :param FsHook src_hook: Hook to read the source file with.
+    :param str src_path: Path of the source file.
+    :param FsHook dest_hook: Hook to write the destination file with.
+    :param str dest_path: Path of the destination file.
+    :param int range_size: Size of the ranges to read (in bytes).
+    :param int max_workers: Number of ranges to read concurrently.
+    """
+
+    range_size = range_size or DEFAULT_RANGE_SIZE
+    window = 2 * max_workers
+
+    size = src_hook.size(src_path)
+    ranges = [
+        (offset, min(range_size, size - offset))
+        for offset in range(0, size, range_size)
+    ]
+
+    thread_state = threading.local()
+    thread_resources = []
+    lock = threading.Lock()
+
+    def _read_range(offset, length):
+        if not hasattr(thread_state, "file"):
+            hook = src_hook.clone()
+            with lock:
+                thread_resources.append(hook)
+            # Uses open_at, as some hooks only return seekable files from open_at
+            # (e.g. the ArrowFsHook, which opens streams in open).
+            thread_state.file = hook.open_at(src_path, offset)
+            with lock:
+                thread_resources.append(thread_state.file)
+
+        thread_state.file.seek(offset)
+        return read_exactly(thread_state.file, length)
+
+    futures = {}
+
+    try:
+        with dest_hook.open(dest_path, "wb") as dest_file, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_place = is_seekable(dest_file)
+            next_submit = next_write = 0
+
+            while next_write < len(ranges):
+                # Only read ahead as far as the window allows, to bound memory.
+                while next_submit < len(ranges) and (
+                    len(futures) if in_place else next_submit - next_write
+                ) < window:
+                    futures[next_submit] = executor.submit(
+                        _read_range, *ranges[next_submit]
+                    )
+                    next_submit += 1
+
+                if in_place:
+                    done, _ = wait(futures.values(), return_when=FIRST_COMPLETED)
+                    for index in [i for i, fut in futures.items() if fut in done]:
+                        dest_file.seek(ranges[index][0])
+                        dest_file.write(futures.pop(index).result())
+                        next_write += 1
+                else:
+                    dest_file.write(futures.pop(next_write).result())
+                    next_write += 1
+    finally:
+        for future in futures.values():
+            future.cancel()
+
+        # Close files before disconnecting the hooks they were opened with.
+        for resource in reversed(thread_resources):
+            if hasattr(resource, "disconnect"):
+                resource.disconnect()
+            else:
+                resource.close()
+
+
+def copy_stream(src_file, dest_file, buffer_size=None, pipeline_depth=None):
+    """Copies the contents of one file object to another.
+
+    If the source provides a `read_view` method (e.g. memory-mapped files, see
+    `LocalHook.open_mmap`), the views it returns are written directly, without
+    copying them into intermediate buffers. Otherwise, if `pipeline_depth` is
+    given, the data is copied using `pipelined_copy`. Otherwise, reads and
+    writes alternate (as in `shutil.copyfileobj`).
+
+    :param src_file: File object to read from.
+    :param dest_file: File object to write to.
+    :param int buffer_size: Size (in bytes) of the chunks that are copied.
+    :param int pipeline_depth: Number of buffers for pipelined copies.
+    """
+
+    read_view = getattr(src_file, "read_view", None)
+
+    if read_view is not None:
+        # Reading views of a memory map is only a page fault away, so there
+        # is nothing to gain from reading in a separate thread.
+        buffer_size = buffer_size or DEFAULT_BUFFER_SIZE
+        while True:
+            view = read_view(buffer_size)
+            if not view:
+                break
+            dest_file.write(view)
+    elif pipeline_depth:
+        pipelined_copy(
+            src_file, dest_file, buffer_size=buffer_size, depth=pipeline_depth
+        )
+    elif buffer_size:
+        shutil.copyfileobj(src_file, dest_file, buffer_size)
+    else:
+        shutil.copyfileobj(src_file, dest_file)
+
+
+def pipelined_copy(src_file, dest_file, buffer_size=None, depth=4):
+    """Copies the contents of one file object to another, overlapping reads
+    from the source with writes to the destination.
+
+    A reader thread reads the source into a fixed set of `depth` buffers,
+    which are written to the destination by the calling thread and then
+    handed back to the reader for re-use. While a buffer is being written,
+    the reader fills the next buffer(s), so that copies between two remote
+    file systems run at the speed of the slower side rather than at the
+    combined latency of both sides. At most `depth * buffer_size` bytes are
+    held in memory.
+
+    Sources supporting `readinto` are read directly into the buffers, which
+    are passed to `dest_file.write` as memoryviews. As usual for file objects,
+    the destination should therefore not keep references to written data.
+
+    :param src_file: File object to read from.
+    :param dest_file: File object to write to.
+    :param int buffer_size: Size of the buffers (in bytes).
+    :param int depth: Number of buffers.
+
+    :returns: The number of bytes copied.
+    """
+
+    buffer_size = buffer_size or DEFAULT_BUFFER_SIZE
+
+    free = queue.Queue()
+    for _ in range(depth):
+        free.put(bytearray(buffer_size))
+
+    filled = queue.Queue()
+    stopped = threading.Event()
+    errors = []
+
+    readinto = getattr(src_file, "readinto", None)
+
+    def _read():
+        try:
+            while True:
+                buffer_ = free.get()
+                if buffer_ is None or stopped.is_set():
+                    return
+
+                if readinto is not None:
+                    data = memoryview(buffer_)[:readinto(buffer_) or 0]
+                else:
+                    data = src_file.read(buffer_size)
+
+                filled.put((buffer_, data))
+
+                if not data:
+                    return
+        except Exception as err:  # pylint: disable=broad-except
+            errors.append(err)
+            filled.put(None)
+
+    reader = threading.Thread(target=_read, name="pipelined-copy-reader")
+    reader.daemon = True
+    reader.start()
+
+    copied = 0
+
+    try:
+        while True:
+            item = filled.get()
+            if item is None:
+                raise errors[0]
+
+            buffer_, data = item
+            if not data:
+                break
+
+            dest_file.write(data)
+            copied += len(data)
+
+            free.put(buffer_)
+    finally:
+        # Wakes up the reader if it is waiting for a free buffer.
+        stopped.set()
+        free.put(None)
+        reader.join()
+
+    return copied
+
+
+def resume_copy(src_hook, src_path, dest_hook, dest_path, checksum=None,
+                buffer_size=None, pipeline_depth=None):
+    """Copies a file, continuing from a partial copy of the file (if any).
+
+    The destination hook determines how much of the file was already copied
+    (see `FsHook.resume_offset`), after which the data before this offset is
+    checked against the source file (see `FsHook.verify_resume`). If the data
+    matches, the remainder of the source file is read from the offset (see
+    `FsHook.open_at`) and written after the existing data. Otherwise the file
+    is copied from the start. Finally, the size of the copy is compared to
+    the size of the source file.
+
+    :param FsHook src_hook: Hook to read the source file with.
+    :param str src_path: Path of the source file.
+    :param FsHook dest_hook: Hook to write the destination file with.
+    :param str dest_path: Path of the destination file.
+    :param str checksum: Checksum algorithm to compute a checksum of the
+        copied file with (see `CHECKSUM_ALGORITHMS`). Note that this requires
+        reading the source data before the resume offset.
+    :param int buffer_size: Size of the chunks to copy (see `copy_stream`).
+    :param int pipeline_depth: Number of buffers for pipelined copies (see
+        `copy_stream`).
+
+    :returns: The checksum (as hex digest) if `checksum` is given.
+
+    :raises NotSupportedError: If the destination hook does not support
+        resuming writes.
+    :raises IOError: If the size of the copy does not match the source.
+    """
+
+    src_size = src_hook.size(src_path)
+    offset = dest_hook.resume_offset(dest_path)
+
+    if offset > 0:
+        def _read_src(start, length):
+            with src_hook.open_at(src_path, start) as src_file:
+                return read_exactly(src_file, length)
+
+        if offset > src_size or not dest_hook.verify_resume(
+                dest_path, offset, _read_src):
+            _LOG.warning(
+                "Partial copy %s does not match %s, copying from the start",
+                dest_path, src_path)
+            offset = 0
+        else:
+            _LOG.info("Resuming copy of %s at byte %d", src_path, offset)
+
+    with src_hook.open_at(src_path, offset) as src_file, \
+            dest_hook.open_resume(dest_path, offset) as dest_file:
+        if checksum is not None:
+            src_file = HashingReader(src_file, checksum)
+            if offset > 0:
+                _hash_prefix(src_file, src_hook, src_path, offset)
+
+        copy_stream(
+            src_file,
+            dest_file,
+            buffer_size=buffer_size,
+            pipeline_depth=pipeline_depth,
+        )
+
+    dest_size = dest_hook.size(dest_path)
+    if dest_size != src_size:
+        raise IOError(
+            "Size of {} ({} bytes) does not match size of {} ({} bytes)".format(
+                dest_path, dest_size, src_path, src_size))
+
+    return src_file.hexdigest() if checksum is not None else None
+
+
+def _hash_prefix(reader, src_hook, src_path, length, block_size=1024 * 1024):
+    """Updates the checksum of the reader with the first bytes of the source."""
+
+    with src_hook.open(src_path, "rb") as src_file:
+        while length > 0:
+            data = src_file.read(min(block_size, length))
+            if not data:
+                break
+            reader.update(data)
+            length -= len(data)
+
+
+#: Checksum algorithms supported by `HashingReader`.
+CHECKSUM_ALGORITHMS = ("md5", "sha256", "crc32c", "xxhash")
+
+
+def new_hasher(algorithm):
+    """Returns a new hash object (with `update` and `hexdigest` methods) for
+    the given checksum algorithm (see `CHECKSUM_ALGORITHMS`).
+
+    CRC32C and xxhash (XXH64) require the crc32c and xxhash packages.
+    """
+
+    if algorithm in ("md5", "sha256"):
+        return hashlib.new(algorithm)
+
+    if algorithm == "crc32c":
+        if crc32c is None:
+            raise ImportError("crc32c must be installed to compute CRC32C checksums")
+        return _Crc32cHasher()
+
+    if algorithm == "xxhash":
+        if xxhash is None:
+            raise ImportError("xxhash must be installed to compute xxhash checksums")
+        return xxhash.xxh64()
+
+    raise ValueError(
+        "Unknown checksum algorithm {!r}, expected one of {}".format(
+            algorithm, ", ".join(CHECKSUM_ALGORITHMS)))
+
+
+class _Crc32cHasher(object):
+    """Hash object computing a CRC32C checksum."""
+
+    def __init__(self):
+        self._value = 0
+
+    def update(self, data):
+        """Updates the checksum with the given data."""
+        self._value = crc32c.crc32c(data, self._value)
+
+    def hexdigest(self):
+        """Returns the checksum as a (zero-padded) hex string."""
+        return "{:08x}".format(self._value)
+
+
+class HashingReader(object):
+    """Wraps a readable file object, computing a checksum of the data read.
+
+    The reader intentionally does not support seeking, so that consumers
+    (e.g. managed uploads) read the data exactly once and in order.
+
+    :param file_obj: File object to read from.
+    :param str algorithm: Checksum algorithm (see `CHECKSUM_ALGORITHMS`).
+    """
+
+    def __init__(self, file_obj, algorithm):
+        self._file_obj = file_obj
+        self._hasher = new_hasher(algorithm)
+
+    def read(self, size=-1):
+        """Reads (at most) size bytes, updating the checksum."""
+        data = self._file_obj.read(size)
+        self._hasher.update(data)
+        return data
+
+    def __getattr__(self, name):
+        # Passes memory-mapped reads through (see `copy_stream`), while still
+        # hiding seek and tell of the wrapped file object.
+        if name == "read_view" and hasattr(self._file_obj, "read_view"):
+            return self._read_view
+        raise AttributeError(name)
+
+    def _read_view(self, size=-1):
+        view = self._file_obj.read_view(size)
+        self._hasher.update(view)
+        return view
+
+    def update(self, data):
+        """Updates the checksum with data that was read outside the reader."""
+        self._hasher.update(data)
+
+    def hexdigest(self):
+        """Returns the checksum of the data read so far."""
+        return self._hasher.hexdigest()
+
+
+def read_exactly(file_obj, length):
+    """Reads exactly `length` bytes from the file object (unless EOF is reached)."""
+
+    chunks, remaining = [], length
+    while remaining > 0:
+        chunk = file_obj.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+
+    return b"".join(chunks)
+
+
+def is_seekable(file_obj):
+    """Checks if the given file object supports random access."""
+    seekable = getattr(file_obj, "seekable", None)
+    return bool(seekable is not None and seekable())
@@ -0,0 +1,192 @@
+"""Module containing triggers for deferrable file system sensors.
+
+Triggers run in the (asyncio based) triggerer process, which requires
+Airflow 2.2 or newer and therefore Python 3.
+"""
+
+import asyncio
+import importlib
+
+from airflow.triggers.base import BaseTrigger, TriggerEvent
+
+from airflow_fs.hooks import S3Hook
+from airflow_fs.hooks.s3_hook import _split_path
+from airflow_fs.ports import glob
+from airflow_fs.sensors import find_first
+
+try:
+    import s3fs
+except ImportError:
+    s3fs = None
+
+
+class FileTrigger(BaseTrigger):
+    """Trigger that fires once a file matching the given pattern exists.
+
+    S3 paths are checked using the asynchronous API of s3fs, so that many
+    triggers can poll concurrently from a single event loop. Other hooks
+    are blocking and are polled in the default executor of the event loop.
+    Hooks created with `pool=True` share their connections between triggers.
+
+    :param str path: File path to match files to. Can be any valid
+        glob pattern.
+    :param tuple hook: Serialized hook (see `FsHook.serialize`) to use when
+        looking for files.
+    :param float poke_interval: Time (in seconds) to wait between checks.
+    """
+
+    def __init__(self, path, hook, poke_interval=60.0):
+        super().__init__()
+        self.path = path
+        self.hook = hook
+        self.poke_interval = poke_interval
+
+    def serialize(self):
+        return (
+            "airflow_fs.triggers.FileTrigger",
+            {"path": self.path, "hook": self.hook, "poke_interval": self.poke_interval},
+        )
+
+    async def run(self):
+        finder = _get_finder(_deserialize_hook(self.hook))
+
+        while True:
+            path = await finder.find(self.path)
+
+            if path is not None:
+                yield TriggerEvent({"path": path})
+                return
+
+            await asyncio.sleep(self.poke_interval)
+
+
+def _deserialize_hook(data):
+    """Re-creates a hook from the output of `FsHook.serialize`."""
+
+    classpath, kwargs = data
+    module_name, class_name = classpath.rsplit(".", 1)
+    hook_class = getattr(importlib.import_module(module_name), class_name)
+    return hook_class(**kwargs)
+
+
+def _get_finder(hook):
+    if isinstance(hook, S3Hook) and _S3Finder.is_supported():
+        return _S3Finder(hook)
+    return _ExecutorFinder(hook)
+
+
+class _ExecutorFinder(object):
+    """Finds files using a blocking hook, in the default executor."""
+
+    def __init__(self, hook):
+        self._hook = hook
+
+    async def find(self, path):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._find, path)
+
+    def _find(self, path):
+        # Disconnect after each check to avoid keeping a connection open per
+        # trigger (pooled hooks return their connection to the pool instead).
+        with self._hook:
+            return find_first(self._hook, path)
+
+
+class _S3Finder(object):
+    """Finds files in S3 using the asynchronous s3fs API."""
+
+    # Asynchronous file systems are shared between the triggers running in
+    # the same event loop, keyed on (event loop, connection ID). File systems
+    # are created under a lock per event loop, so that concurrent triggers
+    # don't create (and leak) their own sessions.
+    _filesystems = {}
+    _locks = {}
+
+    def __init__(self, hook):
+        self._hook = hook
+
+    @staticmethod
+    def is_supported():
+        """Checks if the installed s3fs version has an asynchronous API."""
+        return s3fs is not None and hasattr(s3fs.S3FileSystem, "_call_s3")
+
+    async def find(self, path):
+        if not glob.has_magic(path):
+            s3 = await self._get_filesystem()
+            # pylint: disable=protected-access
+            return path if await s3._exists(path) else None
+
+        plan = glob.prefix_plan(path)
+        if plan is None:
+            # Pattern can't be matched against a prefix listing.
+            return await _ExecutorFinder(self._hook).find(path)
+
+        prefix, delimiter, match_listing = plan
+        async for page in self._list_pages(prefix, delimiter):
+            for match in match_listing(page):
+                return match
+
+        return None
+
+    async def _list_pages(self, prefix, delimiter):
+        """Yields pages of paths starting with prefix (see `S3Hook.iter_prefix`)."""
+
+        s3 = await self._get_filesystem()
+
+        bucket, key_prefix = _split_path(prefix)
+        kwargs = {"Bucket": bucket, "Prefix": key_prefix}
+        if delimiter is not None:
+            kwargs["Delimiter"] = delimiter
+
+        while True:
+            # pylint: disable=protected-access
+            response = await s3._call_s3("list_objects_v2", **kwargs)
+
+            keys = [obj["Key"] for obj in response.get("Contents", [])]
+            keys += [prefix_["Prefix"] for prefix_ in response.get("CommonPrefixes", [])]
+            yield [bucket + "/" + key for key in keys]
+
+            if not response.get("IsTruncated"):
+                break
+            kwargs["ContinuationToken"] = response["NextContinuationToken"]
+
+    async def _get_filesystem(self):
+        loop = asyncio.get_event_loop()
+        key = (loop, self._hook._conn_id)  # pylint: disable=protected-access
+
+        s3 = self._filesystems.get(key)
+        if s3 is not None:
+            return s3
+
+        self._remove_closed_loops()
+
+        async with self._locks.setdefault(loop, asyncio.Lock()):
+            if key not in self._filesystems:
+                # Fetching the connection queries the database, which blocks.
+                config = await loop.run_in_executor(
+                    None, self._hook._get_config  # pylint: disable=protected-access
+                )
+
+                s3 = s3fs.S3FileSystem(
+                    key=config["key"],
+                    secret=config["secret"],
+                    s3_additional_kwargs=config["extra_kwargs"],
+                    asynchronous=True,
+                    loop=loop,
+                )
+                await s3.set_session()
+
+                self._filesystems[key] = s3
+
+        return self._filesystems[key]
+
+    @classmethod
+    def _remove_closed_loops(cls):
+        """Drops the file systems (and locks) of event loops that were closed,
+        whose sessions can no longer be used (or closed)."""
+
+        for key in [key for key in cls._filesystems if key[0].is_closed()]:
+            del cls._filesystems[key]
+
+        for loop in [loop for loop in cls._locks if loop.is_closed()]:
+            del cls._locks[loop]
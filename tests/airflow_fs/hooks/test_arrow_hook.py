@@ -0,0 +1,186 @@
+import os
+import posixpath
+
+import pytest
+
+from airflow_fs.hooks import ArrowFsHook, LocalHook
+
+pafs = pytest.importorskip("pyarrow.fs")
+
+
+@pytest.fixture
+def hook():
+    """ArrowFsHook wrapping the local file system of PyArrow."""
+    return ArrowFsHook(pafs.LocalFileSystem())
+
+
+class TestArrowFsHook:
+    """Tests for the ArrowFsHook class, using the local file system."""
+
+    def test_open_read(self, hook, local_mock_dir):
+        """Tests reading of a file using the `open` method."""
+
+        file_path = posixpath.join(local_mock_dir, "test.txt")
+
+        with hook, hook.open(file_path) as file_:
+            assert file_.read() == b"Test file\n"
+
+    def test_open_write(self, tmpdir):
+        """Tests writing of a (buffered) file using the `open` method."""
+
+        file_path = posixpath.join(str(tmpdir), "test2.txt.gz")
+
+        with ArrowFsHook(pafs.LocalFileSystem(), buffer_size=4) as hook:
+            with hook.open(file_path, "wb") as file_:
+                file_.write(b"Test file\n")
+
+        # Files are written as-is, regardless of their extension.
+        with open(file_path, "rb") as file_:
+            assert file_.read() == b"Test file\n"
+
+    def test_exists(self, hook, local_mock_dir):
+        """Tests the `exists` method."""
+
+        with hook:
+            assert hook.exists(posixpath.join(local_mock_dir, "subdir"))
+            assert hook.exists(posixpath.join(local_mock_dir, "test.txt"))
+            assert not hook.exists(posixpath.join(local_mock_dir, "non-existing.txt"))
+
+    def test_isdir(self, hook, local_mock_dir):
+        """Tests the `isdir` method."""
+
+        with hook:
+            assert hook.isdir(posixpath.join(local_mock_dir, "subdir"))
+            assert not hook.isdir(posixpath.join(local_mock_dir, "test.txt"))
+
+    def test_listdir(self, hook, local_mock_dir, mock_data_dir):
+        """Tests the `listdir` method."""
+
+        with hook:
+            assert set(hook.listdir(local_mock_dir)) == set(os.listdir(mock_data_dir))
+
+    def test_scandir(self, hook, local_mock_dir, mock_data_dir):
+        """Tests the `scandir` method."""
+
+        with hook:
+            entries = {entry.name: entry for entry in hook.scandir(local_mock_dir)}
+
+        assert set(entries) == set(os.listdir(mock_data_dir))
+        assert entries["subdir"].is_dir()
+        assert entries["test.txt"].size == 10
+        assert entries["test.txt"].mtime == pytest.approx(
+            os.path.getmtime(posixpath.join(local_mock_dir, "test.txt"))
+        )
+
+    def test_mkdir_exists(self, hook, tmpdir):
+        """Tests the `mkdir` method with the exists_ok parameter."""
+
+        dir_path = posixpath.join(str(tmpdir), "subdir")
+
+        with hook:
+            hook.mkdir(dir_path, exist_ok=False)
+
+            with pytest.raises(IOError):
+                hook.mkdir(dir_path, exist_ok=False)
+
+            hook.mkdir(dir_path, exist_ok=True)
+
+        assert posixpath.isdir(dir_path)
+
+    def test_makedirs(self, hook, tmpdir):
+        """Tests the `makedirs` method."""
+
+        dir_path = posixpath.join(str(tmpdir), "some", "nested", "dir")
+
+        with hook:
+            hook.makedirs(dir_path, exist_ok=False)
+
+            with pytest.raises(IOError):
+                hook.makedirs(dir_path, exist_ok=False)
+
+        assert posixpath.isdir(dir_path)
+
+    def test_rm(self, hook, local_mock_dir):
+        """Tests the `rm` and `rmtree` methods."""
+
+        file_path = posixpath.join(local_mock_dir, "test.txt")
+        dir_path = posixpath.join(local_mock_dir, "subdir")
+
+        with hook:
+            hook.rm(file_path)
+            hook.rmtree(dir_path)
+
+        assert not posixpath.exists(file_path)
+        assert not posixpath.exists(dir_path)
+
+    def test_walk(self, hook, local_mock_dir, mock_data_dir):
+        """Tests the `walk` method."""
+
+        with hook:
+            entries = list(hook.walk(local_mock_dir))
+            assert not list(hook.walk(posixpath.join(local_mock_dir, "non-existing")))
+
+        pytest.helpers.assert_walk_equal(entries, os.walk(mock_data_dir))
+
+    def test_scantree(self, hook, local_mock_dir):
+        """Tests the `scantree` method."""
+
+        with hook:
+            entries = {entry.name: entry for entry in hook.scantree(local_mock_dir)}
+
+        assert set(entries) == {"test.txt", "test.csv", "other.txt", "subdir/nested.txt"}
+        assert entries["test.txt"].size == 10
+
+    def test_glob(self, hook, local_mock_dir):
+        """Tests the `glob` method, which matches against a single listing."""
+
+        def _glob(pattern, recursive=False):
+            paths = hook.glob(posixpath.join(local_mock_dir, pattern), recursive=recursive)
+            return {posixpath.relpath(path, local_mock_dir) for path in paths}
+
+        with hook:
+            assert _glob("*.txt") == {"test.txt", "other.txt"}
+            assert _glob("sub*") == {"subdir"}
+            assert _glob("*/*.txt") == {"subdir/nested.txt"}
+            assert _glob("**/*.txt", recursive=True) == {
+                "test.txt",
+                "other.txt",
+                "subdir/nested.txt",
+            }
+            assert not _glob("*.tsv")
+
+    def test_copy(self, hook, local_mock_dir, tmpdir):
+        """Tests copying files within the file system and from other hooks."""
+
+        src_path = posixpath.join(local_mock_dir, "test.txt")
+
+        with hook:
+            hook.copy(src_path, posixpath.join(str(tmpdir), "within.txt"))
+            hook.copy(
+                src_path, posixpath.join(str(tmpdir), "upload.txt"), src_hook=LocalHook()
+            )
+            LocalHook().copy(
+                src_path, posixpath.join(str(tmpdir), "download.txt"), src_hook=hook
+            )
+
+        for name in ("within.txt", "upload.txt", "download.txt"):
+            with open(posixpath.join(str(tmpdir), name), "rb") as file_:
+                assert file_.read() == b"Test file\n"
+
+    def test_copy_ranged(self, hook, tmpdir):
+        """Tests reading byte ranges concurrently (which requires seeking)."""
+
+        src_path = posixpath.join(str(tmpdir), "src.bin")
+        dest_path = posixpath.join(str(tmpdir), "dest.bin")
+
+        content = os.urandom(1000)
+        with open(src_path, "wb") as file_:
+            file_.write(content)
+
+        with hook:
+            LocalHook().copy(
+                src_path, dest_path, src_hook=hook, read_workers=3, range_size=64
+            )
+
+        with open(dest_path, "rb") as file_:
+            assert file_.read() == content
@@ -0,0 +1,97 @@
+import posixpath
+
+from airflow_fs.hooks import CachedHook, LocalHook
+
+
+class TestCachedHook:
+    """Tests for the CachedHook class."""
+
+    def test_cached(self, local_mock_dir):
+        """Tests if repeated calls are answered from the cache."""
+
+        with CachedHook(LocalHook()) as hook:
+            for _ in range(3):
+                hook.glob(posixpath.join(local_mock_dir, "*", "*.txt"))
+
+            assert hook.misses == 2
+            assert hook.hits == 4
+
+    def test_expired(self, local_mock_dir):
+        """Tests if expired results are not used."""
+
+        with CachedHook(LocalHook(), ttl=0) as hook:
+            hook.listdir(local_mock_dir)
+            hook.listdir(local_mock_dir)
+
+            assert hook.hits == 0
+            assert hook.misses == 2
+
+    def test_max_size(self, local_mock_dir):
+        """Tests if the least recently used results are evicted."""
+
+        with CachedHook(LocalHook(), max_size=1) as hook:
+            hook.exists(posixpath.join(local_mock_dir, "test.txt"))
+            hook.exists(posixpath.join(local_mock_dir, "other.txt"))
+            hook.exists(posixpath.join(local_mock_dir, "test.txt"))
+
+            assert hook.hits == 0
+
+    def test_invalidate_write(self, local_mock_dir):
+        """Tests if writing files invalidates cached results."""
+
+        dir_path = posixpath.join(local_mock_dir, "new")
+        file_path = posixpath.join(dir_path, "test.txt")
+
+        with CachedHook(LocalHook()) as hook:
+            assert not hook.exists(dir_path)
+            assert not hook.exists(file_path)
+            assert "new" not in hook.listdir(local_mock_dir)
+
+            hook.makedirs(dir_path)
+            with hook.open(file_path, "wb") as file_:
+                file_.write(b"Test file\n")
+
+            assert hook.exists(dir_path)
+            assert hook.exists(file_path)
+            assert "new" in hook.listdir(local_mock_dir)
+
+    def test_invalidate_close(self, local_mock_dir):
+        """Tests if results cached while writing a file are invalidated once
+        the file is closed."""
+
+        file_path = posixpath.join(local_mock_dir, "test2.txt")
+
+        with CachedHook(LocalHook()) as hook:
+            with hook.open(file_path, "wb") as file_:
+                file_.write(b"Test")
+                file_.flush()
+                assert hook.size(file_path) == 4
+                file_.write(b" file\n")
+
+            assert hook.size(file_path) == 10
+
+    def test_resume(self, local_mock_dir):
+        """Tests if resuming writes is delegated to the wrapped hook."""
+
+        file_path = posixpath.join(local_mock_dir, "test.txt")
+
+        with CachedHook(LocalHook()) as hook:
+            assert hook.size(file_path) == 10
+            assert hook.resume_offset(file_path) == 10
+
+            with hook.open_resume(file_path, 4) as file_:
+                file_.write(b"!\n")
+
+            assert hook.size(file_path) == 6
+
+    def test_invalidate_rmtree(self, local_mock_dir):
+        """Tests if deleting a tree invalidates results for nested paths."""
+
+        dir_path = posixpath.join(local_mock_dir, "subdir")
+        file_path = posixpath.join(dir_path, "nested.txt")
+
+        with CachedHook(LocalHook()) as hook:
+            assert hook.exists(file_path)
+            hook.rmtree(dir_path)
+            assert not hook.exists(file_path)
+            assert not hook.exists(dir_path)
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 import os
 import posixpath
 
@@ -172,3 +173,38 @@ class TestFtpHook:
             entries = list(hook.walk(ftp_mock_dir))
 
         pytest.helpers.assert_walk_equal(entries, os.walk(mock_data_dir))
+
+    def test_max_sessions(self, ftp_conn, ftp_mock_dir, mock_data_dir):
+        """Tests using the hook from multiple threads with separate sessions."""
+
+        file_path = posixpath.join(ftp_mock_dir, "test.txt")
+
+        def _read(hook):
+            with hook.open(file_path) as file_:
+                return file_.read(), set(hook.listdir(ftp_mock_dir))
+
+        with FtpHook("ftp_default", max_sessions=2) as hook:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(_read, [hook] * 8))
+
+        assert results == [(b"Test file\n", set(os.listdir(mock_data_dir)))] * 8
+
+    def test_max_sessions_disconnect(self, ftp_conn, ftp_mock_dir):
+        """Tests if sessions in use while disconnecting are closed once released."""
+
+        file_path = posixpath.join(ftp_mock_dir, "test.txt")
+
+        # pylint: disable=protected-access
+        with FtpHook("ftp_default", max_sessions=1) as hook:
+            sessions = hook._sessions
+            file_ = hook.open(file_path)
+
+            hook.disconnect()
+            assert hook._sessions is not sessions
+
+            file_.close()
+            assert not sessions._idle.get(hook._pool_key())
+            assert sessions.available(hook._pool_key()) == 1
+
+            # Clones use their own sessions.
+            assert hook.clone()._sessions is not hook._sessions
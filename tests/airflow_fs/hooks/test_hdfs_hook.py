@@ -2,7 +2,7 @@ import os
 import posixpath
 
 import pytest
-from pyarrow import hdfs
+from pyarrow import fs as pafs
 
 from airflow_fs.hooks import HdfsHook
 from airflow_fs.testing import copy_tree
@@ -11,7 +11,7 @@ from airflow_fs.testing import copy_tree
 @pytest.fixture(scope="session")
 def client():
     """Hdfs client to be used while testing."""
-    return hdfs.connect()
+    return pafs.HadoopFileSystem("default", port=0)
 
 
 @pytest.fixture
@@ -19,10 +19,12 @@ def remote_mock_dir(mock_data_dir, client, remote_temp_dir):
     """A mock remote directory containing standard test data."""
 
     def _upload(src_path, dest_path):
-        with open(src_path, "rb") as file_:
-            client.upload(dest_path, file_)
+        with open(src_path, "rb") as file_, client.open_output_stream(dest_path) as dest:
+            dest.write(file_.read())
 
-    copy_tree(mock_data_dir, remote_temp_dir, mkdir_func=client.mkdir, cp_func=_upload)
+    copy_tree(
+        mock_data_dir, remote_temp_dir, mkdir_func=client.create_dir, cp_func=_upload
+    )
 
     return str(remote_temp_dir)
 
@@ -33,6 +35,10 @@ def remote_temp_dir(tmpdir):
     return str(tmpdir)
 
 
+def _exists(client, path):
+    return client.get_file_info(path).type != pafs.FileType.NotFound
+
+
 class TestHdfsHook:
     """Tests for the HdfsHook class."""
 
@@ -49,13 +55,13 @@ class TestHdfsHook:
         """Tests writing of a file using the `open` method."""
 
         file_path = posixpath.join(remote_temp_dir, "test2.txt")
-        assert not client.exists(file_path)
+        assert not _exists(client, file_path)
 
         with HdfsHook() as hook:
             with hook.open(file_path, "wb") as file_:
                 file_.write(b"Test file\n")
 
-        assert client.exists(file_path)
+        assert _exists(client, file_path)
 
     def test_exists(self, remote_mock_dir):
         """Tests the `exists` method."""
@@ -79,22 +85,32 @@ class TestHdfsHook:
             assert set(hook.listdir(remote_mock_dir)) == set(os.listdir(mock_data_dir))
 
     def test_mkdir(self, client, remote_temp_dir):
-        """Tests the `mkdir` method with mode parameter."""
+        """Tests the `mkdir` method."""
+
+        dir_path = posixpath.join(remote_temp_dir, "subdir")
+        assert not _exists(client, dir_path)
+
+        with HdfsHook() as hook:
+            hook.mkdir(dir_path)
+
+        assert _exists(client, dir_path)
+
+    def test_mkdir_mode(self, client, remote_temp_dir, caplog):
+        """Tests if a warning is logged for modes that are not applied."""
 
         dir_path = posixpath.join(remote_temp_dir, "subdir")
-        assert not client.exists(dir_path)
 
         with HdfsHook() as hook:
             hook.mkdir(dir_path, mode=0o750)
 
-        assert client.exists(dir_path)
-        assert client.info(dir_path)["permissions"] == 0o750
+        assert _exists(client, dir_path)
+        assert "Ignoring mode" in caplog.text
 
     def test_mkdir_exists(self, client, remote_temp_dir):
         """Tests the `mkdir` method with the exists_ok parameter."""
 
         dir_path = posixpath.join(remote_temp_dir, "subdir")
-        assert not client.exists(dir_path)
+        assert not _exists(client, dir_path)
 
         with HdfsHook() as hook:
             hook.mkdir(dir_path, exist_ok=False)
@@ -108,34 +124,33 @@ class TestHdfsHook:
         """Tests the `rm` method."""
 
         file_path = posixpath.join(remote_mock_dir, "test.txt")
-        assert client.exists(file_path)
+        assert _exists(client, file_path)
 
         with HdfsHook() as hook:
             hook.rm(file_path)
 
-        assert not client.exists(file_path)
+        assert not _exists(client, file_path)
 
     def test_rmtree(self, client, remote_mock_dir):
         """Tests the `rmtree` method."""
 
         dir_path = posixpath.join(remote_mock_dir, "subdir")
-        assert client.exists(dir_path)
+        assert _exists(client, dir_path)
 
         with HdfsHook() as hook:
             hook.rmtree(dir_path)
 
-        assert not client.exists(dir_path)
+        assert not _exists(client, dir_path)
 
     def test_makedirs(self, client, remote_temp_dir):
-        """Tests the `mkdir` method with mode parameter."""
+        """Tests the `makedirs` method."""
 
         dir_path = posixpath.join(remote_temp_dir, "some", "nested", "dir")
 
         with HdfsHook() as hook:
-            hook.makedirs(dir_path, mode=0o750)
+            hook.makedirs(dir_path)
 
-        assert client.exists(dir_path)
-        assert client.info(dir_path)["permissions"] == 0o750
+        assert _exists(client, dir_path)
 
     def test_makedirs_exists(self, client, remote_temp_dir):
         """Tests the `mkdir` method with exists_ok parameter."""
@@ -1,11 +1,14 @@
 import glob
+import hashlib
 import os
 import posixpath
 import sys
+import threading
 
 import pytest
 
 from airflow_fs.hooks import LocalHook
+from airflow_fs.hooks.local_hook import MmapFile
 
 
 class TestLocalHook:
@@ -55,6 +58,33 @@ class TestLocalHook:
         with LocalHook() as hook:
             assert set(hook.listdir(local_mock_dir)) == set(os.listdir(mock_data_dir))
 
+    def test_scandir(self, local_mock_dir, mock_data_dir):
+        """Tests the `scandir` method."""
+
+        with LocalHook() as hook:
+            entries = {entry.name: entry for entry in hook.scandir(local_mock_dir)}
+
+        assert set(entries) == set(os.listdir(mock_data_dir))
+        assert entries["subdir"].is_dir()
+        assert not entries["test.txt"].is_dir()
+        assert entries["test.txt"].size == len(b"Test file\n")
+        assert entries["test.txt"].mtime is not None
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+    def test_scandir_broken_symlink(self, local_mock_dir):
+        """Tests if broken symlinks don't fail the listing."""
+
+        os.symlink(
+            posixpath.join(local_mock_dir, "missing.txt"),
+            posixpath.join(local_mock_dir, "broken.txt"),
+        )
+
+        with LocalHook() as hook:
+            entries = {entry.name: entry for entry in hook.scandir(local_mock_dir)}
+
+        assert not entries["broken.txt"].is_dir()
+        assert "test.txt" in entries
+
     def test_mkdir(self, tmpdir):
         """Tests the `mkdir` method with mode parameter."""
 
@@ -103,6 +133,22 @@ class TestLocalHook:
 
         assert not posixpath.exists(dir_path)
 
+    def test_rm_many(self, local_mock_dir):
+        """Tests the `rm_many` method, including reporting of failures."""
+
+        file_paths = [
+            posixpath.join(local_mock_dir, "test.txt"),
+            posixpath.join(local_mock_dir, "test.csv"),
+        ]
+
+        with LocalHook() as hook:
+            hook.rm_many(file_paths)
+
+            with pytest.raises(IOError):
+                hook.rm_many(file_paths)
+
+        assert not any(posixpath.exists(file_path) for file_path in file_paths)
+
     def test_makedirs(self, tmpdir):
         """Tests the `mkdir` method with mode parameter."""
 
@@ -179,6 +225,109 @@ class TestLocalHook:
                 file_paths, expected_paths, root_a=local_mock_dir, root_b=mock_data_dir
             )
 
+    def test_copy(self, local_mock_dir):
+        """Tests the `copy` method within the local file system."""
+
+        src_path = posixpath.join(local_mock_dir, "test.txt")
+        dest_path = posixpath.join(local_mock_dir, "test2.txt")
+
+        with LocalHook() as hook:
+            hook.copy(src_path, dest_path, src_hook=LocalHook())
+
+        with open(dest_path, "rb") as file_:
+            assert file_.read() == b"Test file\n"
+
+    def test_copy_checksum(self, local_mock_dir, tmpdir):
+        """Tests computing a checksum while copying."""
+
+        src_path = posixpath.join(local_mock_dir, "test.txt")
+        dest_path = posixpath.join(str(tmpdir), "test2.txt")
+
+        with LocalHook() as hook:
+            digest = hook.copy(src_path, dest_path, src_hook=LocalHook(), checksum="sha256")
+
+        assert digest == hashlib.sha256(b"Test file\n").hexdigest()
+
+    def test_copy_fileobj_pipelined(self, local_mock_dir, tmpdir):
+        """Tests copying a file object using a pipelined copy."""
+
+        src_path = posixpath.join(local_mock_dir, "test.txt")
+        dest_path = posixpath.join(str(tmpdir), "test2.txt")
+
+        with LocalHook() as hook, open(src_path, "rb") as src_file:
+            hook.copy_fileobj(src_file, dest_path, buffer_size=4, pipeline_depth=2)
+
+        with open(dest_path, "rb") as file_:
+            assert file_.read() == b"Test file\n"
+
+    def test_serialize(self):
+        """Tests if hook options (including the pool) are serialized."""
+
+        classpath, kwargs = LocalHook(mmap_reads=True, pool=True).serialize()
+
+        assert classpath == "airflow_fs.hooks.local_hook.LocalHook"
+        assert kwargs == {"mmap_reads": True, "pool": True}
+
+    @pytest.mark.skipif(
+        sys.version_info < (3,), reason="memory-mapped reads require Python 3"
+    )
+    def test_open_mmap(self, local_mock_dir):
+        """Tests reading a file using the `open_mmap` method."""
+
+        file_path = posixpath.join(local_mock_dir, "test.txt")
+
+        with LocalHook() as hook, hook.open_mmap(file_path) as file_:
+            assert bytes(file_.read_view(4)) == b"Test"
+            assert file_.read() == b" file\n"
+
+            file_.seek(-5, os.SEEK_END)
+            assert file_.read(4) == b"file"
+            assert file_.tell() == 9
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires FIFOs")
+    def test_open_mmap_fifo(self, tmpdir):
+        """Tests if `mmap_reads` falls back to regular reads for FIFOs."""
+
+        fifo_path = posixpath.join(str(tmpdir), "fifo")
+        os.mkfifo(fifo_path)
+
+        writer = threading.Thread(target=_write_file, args=(fifo_path, b"Test file\n"))
+        writer.start()
+
+        with LocalHook(mmap_reads=True) as hook, hook.open(fifo_path) as file_:
+            assert file_.read() == b"Test file\n"
+
+        writer.join()
+
+    @pytest.mark.skipif(
+        sys.version_info < (3,), reason="memory-mapped reads require Python 3"
+    )
+    @pytest.mark.parametrize("content", [b"Test file\n", b""], ids=["file", "empty"])
+    def test_copy_fileobj_mmap(self, tmpdir, content):
+        """Tests copying memory-mapped files, using `mmap_reads`."""
+
+        src_path = posixpath.join(str(tmpdir), "src.txt")
+        dest_path = posixpath.join(str(tmpdir), "dest.txt")
+
+        with open(src_path, "wb") as file_:
+            file_.write(content)
+
+        with LocalHook(mmap_reads=True) as hook, hook.open(src_path) as src_file:
+            # Empty files are read as regular files, as they can't be mapped.
+            assert isinstance(src_file, MmapFile) == bool(content)
+            digest = hook.copy_fileobj(
+                src_file, dest_path, checksum="md5", buffer_size=4
+            )
+
+        with open(dest_path, "rb") as file_:
+            assert file_.read() == content
+        assert digest == hashlib.md5(content).hexdigest()
+
+
+def _write_file(file_path, content):
+    with open(file_path, "wb") as file_:
+        file_.write(content)
+
 
 def assert_paths_equal(paths_a, paths_b, root_a, root_b):
     """Helper that asserts if two sets of paths are equal after
@@ -0,0 +1,152 @@
+import pytest
+
+from airflow_fs.hooks import FsHook
+from airflow_fs.hooks.pool import ConnectionPool, PoolTimeoutError
+
+
+class _Conn(object):
+    """Dummy connection recording whether it was closed."""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _close(conn):
+    conn.close()
+
+
+class _PooledHook(FsHook):
+    """Hook taking (dummy) connections from a pool, which deletes nothing."""
+
+    def __init__(self, pool):
+        super(_PooledHook, self).__init__(pool=pool)
+        self._conn = None
+
+    def get_conn(self):
+        if self._conn is None:
+            self._conn = self._checkout_conn(connect=_Conn)
+        return self._conn
+
+    def disconnect(self):
+        if self._conn is not None:
+            self._checkin_conn(self._conn)
+        self._conn = None
+
+    def rm(self, file_path):
+        self.get_conn()
+
+
+class TestConnectionPool:
+    """Tests for the ConnectionPool class."""
+
+    def test_reuse(self):
+        """Tests if checked in connections are reused."""
+
+        pool = ConnectionPool()
+
+        conn = pool.checkout("key", _Conn, close=_close)
+        pool.checkin("key", conn, close=_close)
+
+        assert pool.checkout("key", _Conn, close=_close) is conn
+        assert pool.checkout("other", _Conn, close=_close) is not conn
+
+    def test_max_size(self):
+        """Tests if checkouts time out once the pool is exhausted."""
+
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.checkout("key", _Conn)
+
+        with pytest.raises(PoolTimeoutError):
+            pool.checkout("key", _Conn)
+
+    def test_max_idle(self):
+        """Tests if idle connections are closed after max_idle seconds."""
+
+        pool = ConnectionPool(max_size=1, max_idle=-1)
+
+        conn = pool.checkout("key", _Conn, close=_close)
+        pool.checkin("key", conn, close=_close)
+
+        new_conn = pool.checkout("key", _Conn, close=_close)
+
+        assert conn.closed
+        assert new_conn is not conn
+
+    def test_max_idle_other_keys(self):
+        """Tests if idle connections of other keys are closed as well."""
+
+        pool = ConnectionPool(max_idle=-1)
+
+        conn = pool.checkout("key", _Conn, close=_close)
+        pool.checkin("key", conn, close=_close)
+
+        pool.checkout("other", _Conn, close=_close)
+
+        assert conn.closed
+
+    def test_is_alive(self):
+        """Tests if dead connections are replaced on checkout."""
+
+        pool = ConnectionPool(max_size=1)
+
+        conn = pool.checkout("key", _Conn, close=_close)
+        pool.checkin("key", conn, close=_close)
+
+        new_conn = pool.checkout(
+            "key", _Conn, close=_close, is_alive=lambda conn: False
+        )
+
+        assert conn.closed
+        assert new_conn is not conn
+
+    def test_discard(self):
+        """Tests if discarded connections are closed and free their slot."""
+
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+
+        conn = pool.checkout("key", _Conn, close=_close)
+        pool.checkin("key", conn, close=_close, discard=True)
+
+        assert conn.closed
+        assert pool.checkout("key", _Conn) is not conn
+
+    def test_clear(self):
+        """Tests if clear closes all idle connections."""
+
+        pool = ConnectionPool()
+
+        conn = pool.checkout("key", _Conn, close=_close)
+        pool.checkin("key", conn, close=_close)
+        pool.clear()
+
+        assert conn.closed
+
+    def test_close(self):
+        """Tests if connections checked in after closing the pool are closed."""
+
+        pool = ConnectionPool()
+
+        idle = pool.checkout("key", _Conn, close=_close)
+        in_use = pool.checkout("key", _Conn, close=_close)
+        pool.checkin("key", idle, close=_close)
+
+        pool.close()
+        assert idle.closed and not in_use.closed
+
+        pool.checkin("key", in_use, close=_close)
+        assert in_use.closed
+
+    def test_rm_many(self):
+        """Tests if concurrent deletes don't exhaust the pool of the hook."""
+
+        pool = ConnectionPool(max_size=2, timeout=1)
+
+        with _PooledHook(pool) as hook:
+            hook.get_conn()
+            hook.rm_many(["file{}".format(i) for i in range(10)], max_workers=4)
+
+        # pylint: disable=protected-access
+        assert pool.available(hook._pool_key()) == 2
@@ -1,3 +1,4 @@
+import io
 import os
 import posixpath
 
@@ -48,12 +49,34 @@ class TestS3Hook:
             assert hook.isdir(posixpath.join(s3_mock_dir, "subdir"))
             assert not hook.isdir(posixpath.join(s3_mock_dir, "test.txt"))
 
+    def test_isdir_nested(self, s3_client, s3_temp_dir):
+        """Tests the `isdir` method for prefixes without directory markers."""
+
+        s3_client.touch(posixpath.join(s3_temp_dir, "a", "b", "c.txt"))
+
+        with S3Hook() as hook:
+            assert hook.isdir(posixpath.join(s3_temp_dir, "a"))
+            assert hook.isdir(posixpath.join(s3_temp_dir, "a", "b"))
+            assert not hook.isdir(posixpath.join(s3_temp_dir, "a", "b", "c.txt"))
+            assert not hook.isdir(posixpath.join(s3_temp_dir, "a", "b", "c"))
+
     def test_listdir(self, s3_mock_dir, mock_data_dir):
         """Tests the `listdir` method."""
 
         with S3Hook() as hook:
             assert set(hook.listdir(s3_mock_dir)) == set(os.listdir(mock_data_dir))
 
+    def test_scandir(self, s3_mock_dir, mock_data_dir):
+        """Tests the `scandir` method."""
+
+        with S3Hook() as hook:
+            entries = {entry.name: entry for entry in hook.scandir(s3_mock_dir)}
+
+        assert set(entries) == set(os.listdir(mock_data_dir))
+        assert entries["subdir"].is_dir()
+        assert not entries["test.txt"].is_dir()
+        assert entries["test.txt"].size == len(b"Test file\n")
+
     def test_mkdir(self, s3_client, s3_temp_dir):
         """Tests the `mkdir` method with mode parameter."""
 
@@ -102,6 +125,20 @@ class TestS3Hook:
         s3_client.invalidate_cache(dir_path)
         assert not s3_client.exists(dir_path)
 
+    def test_rm_many(self, s3_client, s3_mock_dir):
+        """Tests the `rm_many` method, with and without recursion."""
+
+        file_path = posixpath.join(s3_mock_dir, "test.txt")
+        dir_path = posixpath.join(s3_mock_dir, "subdir")
+
+        with S3Hook() as hook:
+            hook.rm_many([file_path])
+            hook.rm_many([dir_path], recursive=True)
+
+        s3_client.invalidate_cache(s3_mock_dir)
+        assert not s3_client.exists(file_path)
+        assert not s3_client.exists(dir_path)
+
     def test_makedirs(self, s3_client, s3_temp_dir):
         """Tests the `mkdir` method with mode parameter."""
 
@@ -133,3 +170,53 @@ class TestS3Hook:
             entries = list(hook.walk(s3_mock_dir))
 
         pytest.helpers.assert_walk_equal(entries, os.walk(mock_data_dir))
+
+    def test_glob(self, s3_mock_dir):
+        """Tests the `glob` method (using prefix listings)."""
+
+        def _glob(pattern, recursive=False):
+            with S3Hook() as hook:
+                paths = hook.glob(posixpath.join(s3_mock_dir, pattern), recursive)
+            return {posixpath.relpath(path, s3_mock_dir) for path in paths}
+
+        assert _glob("*.txt") == {"test.txt", "other.txt"}
+        assert _glob("sub*") == {"subdir"}
+        assert _glob("*/*.txt") == {"subdir/nested.txt"}
+        assert _glob("**/*.txt", recursive=True) == {
+            "test.txt",
+            "other.txt",
+            "subdir/nested.txt",
+        }
+        assert not _glob("*.tsv")
+
+    def test_copy(self, s3_client, s3_mock_dir):
+        """Tests the `copy` method within the same file system."""
+
+        src_path = posixpath.join(s3_mock_dir, "test.txt")
+        dest_path = posixpath.join(s3_mock_dir, "test2.txt")
+
+        with S3Hook() as hook:
+            hook.copy(src_path, dest_path, src_hook=S3Hook())
+
+        assert s3_client.cat(dest_path) == b"Test file\n"
+
+    def test_copy_fileobj_multipart(self, s3_client, s3_temp_dir):
+        """Tests the `copy_fileobj` method using concurrent multipart uploads."""
+
+        dest_path = posixpath.join(s3_temp_dir, "large.bin")
+        content = os.urandom(12 * 1024 * 1024)
+
+        with S3Hook(part_size=5 * 1024 * 1024, max_concurrency=2) as hook:
+            hook.copy_fileobj(io.BytesIO(content), dest_path)
+
+        assert s3_client.cat(dest_path) == content
+
+    def test_transfer_config(self):
+        """Tests if the part size and concurrency are used for transfers."""
+
+        hook = S3Hook(part_size=5 * 1024 * 1024, max_concurrency=2)
+        config = hook._get_transfer_config()  # pylint: disable=protected-access
+
+        assert config.multipart_threshold == 5 * 1024 * 1024
+        assert config.multipart_chunksize == 5 * 1024 * 1024
+        assert config.max_concurrency == 2
@@ -162,3 +162,32 @@ class TestSftpHook:
             entries = list(hook.walk(sftp_mock_dir))
 
         pytest.helpers.assert_walk_equal(entries, os.walk(mock_data_dir))
+
+    def test_walk_exec(self, sftp_conn, sftp_mock_dir, mock_data_dir):
+        """Tests the `walk` method using a remote find command."""
+
+        with SftpHook("sftp_default", allow_exec=True) as hook:
+            entries = list(hook.walk(sftp_mock_dir))
+            assert not list(hook.walk(posixpath.join(sftp_mock_dir, "non-existing")))
+
+        pytest.helpers.assert_walk_equal(entries, os.walk(mock_data_dir))
+
+    @pytest.mark.parametrize("allow_exec", [False, True], ids=["scandir", "exec"])
+    def test_walk_symlink(self, sftp_conn, sftp_mock_dir, allow_exec):
+        """Tests if walk descends into symlinked directories."""
+
+        # The SFTP server runs on localhost, so links can be created locally.
+        os.symlink(
+            posixpath.join(sftp_mock_dir, "subdir"),
+            posixpath.join(sftp_mock_dir, "link"),
+        )
+
+        with SftpHook("sftp_default", allow_exec=allow_exec) as hook:
+            entries = {
+                root: (dirs, files) for root, dirs, files in hook.walk(sftp_mock_dir)
+            }
+
+        assert "link" in entries[sftp_mock_dir][0]
+        assert entries[posixpath.join(sftp_mock_dir, "link")] == (
+            entries[posixpath.join(sftp_mock_dir, "subdir")]
+        )
@@ -0,0 +1,112 @@
+import io
+import posixpath
+
+from airflow_fs.hooks import LocalHook
+from airflow_fs.hooks.stats import LATENCY_BUCKETS, HookStats, MethodStats, _CountingFile
+
+
+class TestHookStats:
+    """Tests for the stats recorded by hooks (see FsHook.enable_stats)."""
+
+    def test_disabled(self):
+        """Tests if hooks are not instrumented unless stats are enabled."""
+
+        hook = LocalHook()
+
+        assert hook.stats is None
+        assert "listdir" not in vars(hook)
+
+    def test_calls(self, local_mock_dir):
+        """Tests if calls are counted per method."""
+
+        hook = LocalHook()
+        stats = hook.enable_stats()
+
+        hook.listdir(local_mock_dir)
+        hook.listdir(local_mock_dir)
+        hook.exists(posixpath.join(local_mock_dir, "test.txt"))
+
+        methods = stats.methods
+        assert methods["listdir"].count == 2
+        assert methods["exists"].count == 1
+        assert sum(methods["listdir"].histogram) == 2
+
+    def test_bytes(self, tmpdir):
+        """Tests if bytes read from/written to opened files are counted."""
+
+        file_path = posixpath.join(str(tmpdir), "test.txt")
+
+        hook = LocalHook()
+        stats = hook.enable_stats()
+
+        with hook.open(file_path, "wb") as file_:
+            file_.write(b"Test file\n")
+
+        with hook.open(file_path, "rb") as file_:
+            assert file_.read() == b"Test file\n"
+
+        assert stats.bytes_written == 10
+        assert stats.bytes_read == 10
+
+    def test_readinto(self):
+        """Tests if readinto is only available if the wrapped file has it."""
+
+        stats = HookStats("test")
+
+        file_ = _CountingFile(io.BytesIO(b"Test file\n"), stats)
+        assert file_.readinto(bytearray(4)) == 4
+        assert stats.bytes_read == 4
+
+        assert not hasattr(_CountingFile(_ReadOnlyFile(), stats), "readinto")
+
+    def test_walk(self, local_mock_dir):
+        """Tests if iterators are recorded once iteration finishes."""
+
+        hook = LocalHook()
+        stats = hook.enable_stats()
+
+        walk = hook.walk(local_mock_dir)
+        assert "walk" not in stats.methods
+
+        list(walk)
+        assert stats.methods["walk"].count == 1
+
+    def test_clone(self, local_mock_dir):
+        """Tests if clones share the stats of their hook."""
+
+        hook = LocalHook()
+        stats = hook.enable_stats()
+
+        clone = hook.clone()
+        clone.listdir(local_mock_dir)
+
+        assert clone.stats is stats
+        assert stats.methods["listdir"].count == 1
+
+        hook.disable_stats()
+        assert hook.stats is None
+        assert "listdir" not in vars(hook)
+
+
+class _ReadOnlyFile(object):
+    """File object only supporting read (as some hooks return)."""
+
+    def read(self, size=-1):
+        # pylint: disable=unused-argument
+        return b""
+
+
+class TestMethodStats:
+    """Tests for the MethodStats class."""
+
+    def test_percentile(self):
+        """Tests percentiles are derived from the histogram buckets."""
+
+        stats = MethodStats()
+        for _ in range(19):
+            stats.add(0.0001)
+        stats.add(LATENCY_BUCKETS[-1] + 1)
+
+        assert stats.percentile(0.5) == LATENCY_BUCKETS[0]
+        assert stats.percentile(0.99) is None
+        assert stats.count == 20
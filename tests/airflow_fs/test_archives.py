@@ -0,0 +1,63 @@
+import io
+import sys
+import tarfile
+
+import pytest
+
+from airflow_fs import archives
+
+
+def _member(name, content):
+    return archives.ArchiveMember(
+        name=name, size=len(content), mtime=None, open=lambda: io.BytesIO(content)
+    )
+
+
+class TestArchives:
+    """Tests for writing and reading archives."""
+
+    @pytest.mark.parametrize("archive_format", ["tar", "tar.bz2", "zip"])
+    def test_round_trip(self, archive_format):
+        """Tests reading back the members of a written archive."""
+
+        if archive_format == "zip" and sys.version_info < (3, 6):
+            pytest.skip("Writing zip archives requires Python 3.6")
+
+        buffer_ = io.BytesIO()
+        count = archives.write_archive(
+            buffer_,
+            [_member("test.txt", b"Test file\n"), _member("dir/other.txt", b"Other\n")],
+            archive_format,
+        )
+        assert count == 2
+
+        buffer_.seek(0)
+        entries = [
+            (entry.name, entry.file_obj.read())
+            for entry in archives.iter_archive(buffer_, archive_format)
+        ]
+
+        assert entries == [("test.txt", b"Test file\n"), ("dir/other.txt", b"Other\n")]
+
+    def test_unsafe_path(self):
+        """Tests if entries outside of the target directory are rejected."""
+
+        buffer_ = io.BytesIO()
+        with tarfile.open(fileobj=buffer_, mode="w") as archive:
+            info = tarfile.TarInfo("../evil.txt")
+            info.size = 1
+            archive.addfile(info, io.BytesIO(b"x"))
+
+        buffer_.seek(0)
+        with pytest.raises(ValueError):
+            list(archives.iter_archive(buffer_, "tar"))
+
+    def test_detect_format(self):
+        """Tests deriving archive formats from file names."""
+
+        assert archives.detect_format("data.tgz") == "tar.gz"
+        assert archives.detect_format("data.tar.xz") == "tar.xz"
+        assert archives.detect_format("data.ZIP") == "zip"
+
+        with pytest.raises(ValueError):
+            archives.detect_format("data.csv")
@@ -1,8 +1,17 @@
 import datetime
+import gzip
+import logging
+import os
 import posixpath
+import sys
+import time
 
-from airflow_fs.hooks import S3Hook
+from airflow.exceptions import AirflowException
+import pytest
+
+from airflow_fs.hooks import LocalHook, S3Hook
 from airflow_fs import operators
+from airflow_fs.transcoding import Transcoder
 
 
 def _run_task(task, dag):
@@ -13,6 +22,18 @@ def _run_task(task, dag):
     )
 
 
+class _SlowHook(LocalHook):
+    """LocalHook that copies test.txt slowly, to keep the copy in flight."""
+
+    def copy(self, src_path, dest_path, src_hook=None, **kwargs):
+        # pylint: disable=arguments-differ
+        if posixpath.basename(src_path) == "test.txt":
+            time.sleep(0.2)
+        return super(_SlowHook, self).copy(
+            src_path, dest_path, src_hook=src_hook, **kwargs
+        )
+
+
 class TestCopyFileOperator:
     """Tests for the CopyFileOperator."""
 
@@ -51,6 +72,170 @@ class TestCopyFileOperator:
 
         assert dest_hook.exists(posixpath.join(s3_temp_dir, "test.csv"))
 
+    def test_glob_parallel(self, s3_client, local_mock_dir, s3_temp_dir, test_dag):
+        """Tests copying of files using glob pattern with multiple workers."""
+
+        dest_hook = S3Hook()
+
+        task = operators.CopyFileOperator(
+            src_path=posixpath.join(local_mock_dir, "*.txt"),
+            dest_path=s3_temp_dir,
+            dest_hook=dest_hook,
+            max_workers=2,
+            task_id="copy_task",
+            dag=test_dag
+        )
+        _run_task(task, test_dag)
+
+        assert dest_hook.exists(posixpath.join(s3_temp_dir, "test.txt"))
+        assert dest_hook.exists(posixpath.join(s3_temp_dir, "other.txt"))
+
+    def test_parallel_failure(self, local_mock_dir, tmpdir_factory, caplog):
+        """Tests if a failed copy stops new copies and is reported."""
+
+        def _paths(*names):
+            dest_dir = str(tmpdir_factory.mktemp("dest"))
+            return [
+                (posixpath.join(local_mock_dir, name), posixpath.join(dest_dir, name))
+                for name in names
+            ]
+
+        log = logging.getLogger(__name__)
+
+        # The failed copy is collected before starting the next copy.
+        paths = _paths("missing.txt", "test.txt")
+        with pytest.raises(AirflowException, match="missing.txt"):
+            operators._copy_parallel(  # pylint: disable=protected-access
+                paths,
+                src_hook=LocalHook(),
+                dest_hook=LocalHook(),
+                max_workers=1,
+                log=log,
+            )
+
+        assert not os.path.exists(paths[1][1])
+        assert any(
+            record.exc_info is not None and "missing.txt" in record.getMessage()
+            for record in caplog.records
+        )
+
+        # Copies that were in flight are finished.
+        paths = _paths("test.txt", "missing.txt", "other.txt")
+        with pytest.raises(AirflowException, match="missing.txt"):
+            operators._copy_parallel(  # pylint: disable=protected-access
+                paths,
+                src_hook=LocalHook(),
+                dest_hook=_SlowHook(),
+                max_workers=2,
+                log=log,
+            )
+
+        assert os.path.exists(paths[0][1])
+        assert not os.path.exists(paths[2][1])
+
+    def test_glob_transcoder(self, local_mock_dir, tmpdir, test_dag):
+        """Tests compressing files while copying them."""
+
+        task = operators.CopyFileOperator(
+            src_path=posixpath.join(local_mock_dir, "test.tx?"),
+            dest_path=str(tmpdir),
+            transcoder=Transcoder(compress="gzip"),
+            task_id="copy_task",
+            dag=test_dag
+        )
+        _run_task(task, test_dag)
+
+        with gzip.open(posixpath.join(str(tmpdir), "test.txt.gz"), "rb") as file_:
+            assert file_.read() == b"Test file\n"
+
+
+class TestSyncOperator:
+    """Tests for the SyncOperator."""
+
+    def test_sync(self, local_mock_dir, tmpdir_factory, test_dag):
+        """Tests if only new or changed files are copied."""
+
+        # Separate from local_mock_dir, which is the (per-test) tmpdir.
+        dest_dir = str(tmpdir_factory.mktemp("dest"))
+
+        task = operators.SyncOperator(
+            src_path=local_mock_dir,
+            dest_path=dest_dir,
+            task_id="sync_task",
+            dag=test_dag
+        )
+
+        num_files = sum(len(files) for _, _, files in os.walk(local_mock_dir))
+
+        result = task.execute({})
+        assert result == {"copied": num_files, "skipped": 0, "deleted": 0}
+        pytest.helpers.assert_walk_equal(
+            LocalHook().walk(dest_dir), os.walk(local_mock_dir)
+        )
+
+        with open(posixpath.join(local_mock_dir, "test.txt"), "ab") as file_:
+            file_.write(b"Changed\n")
+
+        result = task.execute({})
+        assert result == {"copied": 1, "skipped": num_files - 1, "deleted": 0}
+
+    def test_delete(self, local_mock_dir, tmpdir_factory, test_dag):
+        """Tests deleting files that don't exist in the source."""
+
+        dest_dir = str(tmpdir_factory.mktemp("dest"))
+        extra_path = posixpath.join(dest_dir, "extra.txt")
+
+        with open(extra_path, "wb") as file_:
+            file_.write(b"Extra\n")
+
+        task = operators.SyncOperator(
+            src_path=local_mock_dir,
+            dest_path=dest_dir,
+            delete=True,
+            task_id="sync_task",
+            dag=test_dag
+        )
+        result = task.execute({})
+
+        assert result["deleted"] == 1
+        assert not os.path.exists(extra_path)
+
+
+class TestArchiveOperator:
+    """Tests for the ArchiveOperator and ExtractOperator."""
+
+    @pytest.mark.parametrize("archive_format", ["tar.gz", "zip"])
+    def test_round_trip(self, s3_client, local_mock_dir, s3_temp_dir, tmpdir,
+                        test_dag, archive_format):
+        """Tests archiving files to S3 and extracting them again."""
+
+        if archive_format == "zip" and sys.version_info < (3, 6):
+            pytest.skip("Writing zip archives requires Python 3.6")
+
+        archive_path = posixpath.join(s3_temp_dir, "archive." + archive_format)
+        extract_dir = posixpath.join(str(tmpdir), "extracted")
+
+        task = operators.ArchiveOperator(
+            src_path=posixpath.join(local_mock_dir, "*", "*.txt"),
+            dest_path=archive_path,
+            dest_hook=S3Hook(),
+            task_id="archive_task",
+            dag=test_dag
+        )
+        _run_task(task, test_dag)
+
+        task = operators.ExtractOperator(
+            src_path=archive_path,
+            dest_path=extract_dir,
+            src_hook=S3Hook(),
+            task_id="extract_task",
+            dag=test_dag
+        )
+        _run_task(task, test_dag)
+
+        assert os.listdir(extract_dir) == ["subdir"]
+        assert os.path.exists(os.path.join(extract_dir, "subdir", "nested.txt"))
+
 
 class TestDeleteFileOperator:
     """Tests for the DeleteFileOperator."""
@@ -95,6 +280,26 @@ class TestDeleteFileOperator:
         # Check if other file was not deleted.
         assert hook.exists(posixpath.join(s3_mock_dir, "other.txt"))
 
+    def test_max_workers(self, local_mock_dir, test_dag, mocker):
+        """Tests if max_workers is passed on to `rm_many`."""
+
+        hook = LocalHook()
+        mocker.spy(hook, "rm_many")
+
+        task = operators.DeleteFileOperator(
+            path=posixpath.join(local_mock_dir, "*.txt"),
+            hook=hook,
+            max_workers=2,
+            task_id="delete_task",
+            dag=test_dag
+        )
+        task.execute({})
+
+        assert hook.rm_many.call_args[1]["max_workers"] == 2
+        assert not os.path.exists(posixpath.join(local_mock_dir, "test.txt"))
+        assert not os.path.exists(posixpath.join(local_mock_dir, "other.txt"))
+        assert os.path.exists(posixpath.join(local_mock_dir, "test.csv"))
+
 
 class TestDeleteTreeOperator:
     """Tests for the DeleteTreeOperator."""
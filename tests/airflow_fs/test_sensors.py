@@ -1,5 +1,7 @@
 import posixpath
 
+import pytest
+
 from airflow_fs import sensors
 from airflow_fs.hooks import LocalHook
 
@@ -39,3 +41,65 @@ class TestFileSensor:
             dag=test_dag
         )
         assert not task.poke({})
+
+    def test_literal_path(self, local_mock_dir, test_dag, mocker):
+        """Tests if paths without wildcards are checked using exists."""
+
+        hook = LocalHook()
+        mocker.spy(hook, "exists")
+        mocker.spy(hook, "listdir")
+
+        task = sensors.FileSensor(
+            path=posixpath.join(local_mock_dir, "test.txt"),
+            hook=hook,
+            task_id="file_sensor",
+            dag=test_dag
+        )
+        assert task.poke({})
+
+        assert hook.exists.call_count == 1
+        assert hook.listdir.call_count == 0
+
+    def test_keeps_connection(self, local_mock_dir, test_dag, mocker):
+        """Tests if the hook stays connected between pokes."""
+
+        hook = LocalHook()
+        mocker.spy(hook, "disconnect")
+
+        task = sensors.FileSensor(
+            path=posixpath.join(local_mock_dir, "*.xml"),
+            hook=hook,
+            task_id="file_sensor",
+            dag=test_dag
+        )
+        task.poke({})
+        task.poke({})
+
+        assert hook.disconnect.call_count == 0
+
+    @pytest.mark.parametrize(
+        "sensor_class", [sensors.FileSensor, sensors.DeferrableFileSensor]
+    )
+    def test_stats_per_poke(self, local_mock_dir, test_dag, mocker, sensor_class):
+        """Tests if stats are logged (and reset) after each poke."""
+
+        hook = LocalHook()
+        stats = hook.enable_stats()
+
+        counts = []
+        mocker.patch.object(
+            stats,
+            "summary",
+            side_effect=lambda: counts.append(stats.methods["exists"].count) or "",
+        )
+
+        task = sensor_class(
+            path=posixpath.join(local_mock_dir, "test.txt"),
+            hook=hook,
+            task_id="file_sensor",
+            dag=test_dag
+        )
+        task.poke({})
+        task.poke({})
+
+        assert counts == [1, 1]
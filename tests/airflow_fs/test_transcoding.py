@@ -0,0 +1,79 @@
+import bz2
+import gzip
+import io
+import os
+
+import pytest
+
+from airflow_fs.transcoding import Transcoder
+
+
+def _read_all(file_obj, size=1000):
+    return b"".join(iter(lambda: file_obj.read(size), b""))
+
+
+def _gzip(data):
+    buffer_ = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer_, mode="wb") as file_:
+        file_.write(data)
+    return buffer_.getvalue()
+
+
+class TestTranscoder:
+    """Tests for the Transcoder class."""
+
+    @pytest.mark.parametrize("codec", ["gzip", "bz2"])
+    def test_round_trip(self, codec):
+        """Tests if compressed data decompresses to the original data."""
+
+        content = os.urandom(5000) + b"Test file\n" * 1000
+
+        compressed = _read_all(Transcoder(compress=codec).wrap(io.BytesIO(content)))
+        decompressed = _read_all(
+            Transcoder(decompress=codec).wrap(io.BytesIO(compressed))
+        )
+
+        assert decompressed == content
+
+    def test_recompress(self):
+        """Tests recompressing gzip data to bz2."""
+
+        content = b"Test file\n" * 1000
+        reader = Transcoder(decompress="gzip", compress="bz2").wrap(
+            io.BytesIO(_gzip(content))
+        )
+
+        assert bz2.decompress(reader.read()) == content
+
+    def test_concatenated(self):
+        """Tests decompressing multiple concatenated (gzip) streams."""
+
+        data = _gzip(b"Test ") + _gzip(b"file\n")
+        reader = Transcoder(decompress="gzip").wrap(io.BytesIO(data))
+
+        assert reader.read() == b"Test file\n"
+
+    def test_truncated(self):
+        """Tests if truncated compressed data raises an error."""
+
+        data = _gzip(b"Test file\n" * 1000)
+        reader = Transcoder(decompress="gzip").wrap(io.BytesIO(data[:-10]))
+
+        with pytest.raises(IOError):
+            reader.read()
+
+    def test_rename(self):
+        """Tests adjusting path suffixes."""
+
+        assert Transcoder(compress="zstd").rename("data.csv") == "data.csv.zst"
+        assert Transcoder(decompress="gzip").rename("data.csv.gz") == "data.csv"
+        assert (
+            Transcoder(decompress="gzip", compress="xz").rename("data.csv.gz")
+            == "data.csv.xz"
+        )
+
+    def test_unknown_codec(self):
+        """Tests if unknown codecs are rejected."""
+
+        with pytest.raises(ValueError):
+            Transcoder(compress="lz4")
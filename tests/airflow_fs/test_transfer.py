@@ -0,0 +1,172 @@
+import hashlib
+import io
+import os
+import posixpath
+
+import pytest
+
+from airflow_fs import transfer
+from airflow_fs.hooks import LocalHook, S3Hook
+
+
+class TestRangedCopy:
+    """Tests for the ranged_copy function."""
+
+    def test_seekable(self, tmpdir):
+        """Tests copying to a seekable destination (ranges written in place)."""
+
+        src_path = posixpath.join(str(tmpdir), "src.bin")
+        dest_path = posixpath.join(str(tmpdir), "dest.bin")
+
+        content = os.urandom(1000)
+        with open(src_path, "wb") as file_:
+            file_.write(content)
+
+        transfer.ranged_copy(
+            LocalHook(), src_path, LocalHook(), dest_path, range_size=64, max_workers=3
+        )
+
+        with open(dest_path, "rb") as file_:
+            assert file_.read() == content
+
+    def test_streaming(self, s3_client, s3_temp_dir, tmpdir):
+        """Tests copying to a non-seekable destination (ranges written in order)."""
+
+        src_path = posixpath.join(str(tmpdir), "src.bin")
+        dest_path = posixpath.join(s3_temp_dir, "dest.bin")
+
+        content = os.urandom(1000)
+        with open(src_path, "wb") as file_:
+            file_.write(content)
+
+        with S3Hook() as dest_hook:
+            dest_hook.copy(
+                src_path,
+                dest_path,
+                src_hook=LocalHook(),
+                read_workers=3,
+                range_size=64,
+            )
+
+        assert s3_client.cat(dest_path) == content
+
+
+class TestResumeCopy:
+    """Tests for the resume_copy function."""
+
+    @staticmethod
+    def _write(path, content):
+        with open(path, "wb") as file_:
+            file_.write(content)
+
+    def test_resume(self, tmpdir, mocker):
+        """Tests resuming after a partial copy."""
+
+        src_path = posixpath.join(str(tmpdir), "src.bin")
+        dest_path = posixpath.join(str(tmpdir), "dest.bin")
+
+        content = os.urandom(1000)
+        self._write(src_path, content)
+        self._write(dest_path, content[:600])
+
+        src_hook = LocalHook()
+        mocker.spy(src_hook, "open_at")
+
+        transfer.resume_copy(src_hook, src_path, LocalHook(), dest_path)
+
+        with open(dest_path, "rb") as file_:
+            assert file_.read() == content
+
+        src_hook.open_at.assert_called_with(src_path, 600)
+
+    def test_mismatch(self, tmpdir):
+        """Tests if partial copies not matching the source are discarded."""
+
+        src_path = posixpath.join(str(tmpdir), "src.bin")
+        dest_path = posixpath.join(str(tmpdir), "dest.bin")
+
+        content = os.urandom(1000)
+        self._write(src_path, content)
+        self._write(dest_path, b"x" * 600)
+
+        transfer.resume_copy(LocalHook(), src_path, LocalHook(), dest_path)
+
+        with open(dest_path, "rb") as file_:
+            assert file_.read() == content
+
+
+class TestHashingReader:
+    """Tests for the HashingReader class."""
+
+    def test_md5(self):
+        """Tests if the checksum covers all data read."""
+
+        reader = transfer.HashingReader(io.BytesIO(b"Test file\n"), "md5")
+        assert reader.read(4) + reader.read() == b"Test file\n"
+        assert reader.hexdigest() == hashlib.md5(b"Test file\n").hexdigest()
+
+    def test_unknown_algorithm(self):
+        """Tests if unknown algorithms are rejected."""
+
+        with pytest.raises(ValueError):
+            transfer.HashingReader(io.BytesIO(), "md4")
+
+
+class _ReadOnlyFile(object):
+    """File object only supporting read (not readinto)."""
+
+    def __init__(self, data):
+        self._file = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+
+class _FailingFile(object):
+    """File object raising an error on read and write."""
+
+    def read(self, size=-1):
+        raise IOError("Read failed")
+
+    def write(self, data):
+        raise IOError("Write failed")
+
+
+class TestPipelinedCopy:
+    """Tests for the pipelined_copy function."""
+
+    def test_readinto(self):
+        """Tests copying a source that is read into the buffers."""
+
+        content = os.urandom(1000)
+        dest_file = io.BytesIO()
+
+        copied = transfer.pipelined_copy(
+            io.BytesIO(content), dest_file, buffer_size=64, depth=3
+        )
+
+        assert copied == 1000
+        assert dest_file.getvalue() == content
+
+    def test_read(self):
+        """Tests copying a source without readinto."""
+
+        content = os.urandom(1000)
+        dest_file = io.BytesIO()
+
+        transfer.pipelined_copy(
+            _ReadOnlyFile(content), dest_file, buffer_size=64, depth=3
+        )
+
+        assert dest_file.getvalue() == content
+
+    def test_errors(self):
+        """Tests if errors of the reader and writer are raised."""
+
+        with pytest.raises(IOError, match="Read failed"):
+            transfer.pipelined_copy(_FailingFile(), io.BytesIO(), buffer_size=64)
+
+        with pytest.raises(IOError, match="Write failed"):
+            transfer.pipelined_copy(
+                io.BytesIO(os.urandom(1000)), _FailingFile(), buffer_size=64, depth=2
+            )
@@ -0,0 +1,103 @@
+import asyncio
+import posixpath
+
+import pytest
+
+pytest.importorskip("airflow.triggers.base")
+
+# pylint: disable=wrong-import-position
+from airflow_fs import triggers
+from airflow_fs.hooks import LocalHook
+
+
+def _first_event(trigger):
+    """Runs the trigger until it fires its first event."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(trigger.run().__anext__())
+    finally:
+        loop.close()
+
+
+class TestFileTrigger:
+    """Tests for the FileTrigger class."""
+
+    def test_files_present(self, local_mock_dir):
+        """Tests if the trigger fires with the first matching file."""
+
+        trigger = triggers.FileTrigger(
+            path=posixpath.join(local_mock_dir, "te?t.txt"),
+            hook=LocalHook().serialize(),
+        )
+        event = _first_event(trigger)
+
+        assert event.payload == {"path": posixpath.join(local_mock_dir, "test.txt")}
+
+    def test_files_missing(self, local_mock_dir):
+        """Tests if the trigger keeps polling while files are missing."""
+
+        trigger = triggers.FileTrigger(
+            path=posixpath.join(local_mock_dir, "*.xml"),
+            hook=LocalHook().serialize(),
+            poke_interval=0.01,
+        )
+
+        loop = asyncio.new_event_loop()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                loop.run_until_complete(
+                    asyncio.wait_for(trigger.run().__anext__(), timeout=0.1)
+                )
+        finally:
+            loop.close()
+
+    def test_serialize(self):
+        """Tests if the trigger can be re-created from its serialized form."""
+
+        trigger = triggers.FileTrigger(
+            path="some/path", hook=LocalHook(pool=True).serialize()
+        )
+        classpath, kwargs = trigger.serialize()
+
+        assert classpath == "airflow_fs.triggers.FileTrigger"
+        assert kwargs["hook"] == ("airflow_fs.hooks.local_hook.LocalHook", {"pool": True})
+
+
+class TestS3Finder:
+    """Tests for sharing file systems between S3 triggers."""
+
+    def test_shared_filesystem(self, mocker):
+        """Tests if concurrent triggers create a single file system per event
+        loop and if file systems of closed loops are dropped."""
+
+        s3fs = pytest.importorskip("s3fs")
+
+        async def _set_session():
+            await asyncio.sleep(0.01)
+
+        filesystem = mocker.patch.object(s3fs, "S3FileSystem")
+        filesystem.return_value.set_session.side_effect = _set_session
+
+        finder = triggers._S3Finder(triggers.S3Hook())  # pylint: disable=protected-access
+
+        async def _get_filesystems():
+            # pylint: disable=protected-access
+            return await asyncio.gather(*[finder._get_filesystem() for _ in range(3)])
+
+        loop = asyncio.new_event_loop()
+        try:
+            filesystems = loop.run_until_complete(_get_filesystems())
+        finally:
+            loop.close()
+
+        assert filesystem.call_count == 1
+        assert len(set(map(id, filesystems))) == 1
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(_get_filesystems())
+        finally:
+            loop.close()
+
+        # pylint: disable=protected-access
+        assert all(key[0] is loop for key in triggers._S3Finder._filesystems)